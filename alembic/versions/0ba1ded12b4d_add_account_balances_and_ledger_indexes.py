@@ -0,0 +1,52 @@
+"""add account balances and ledger indexes
+
+Revision ID: 0ba1ded12b4d
+Revises: 3370617fbc16
+Create Date: 2026-10-19 09:12:41.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ba1ded12b4d'
+down_revision: Union[str, None] = '3370617fbc16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('account_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('account_type', sa.Enum('UNIT', 'OWNER', name='ledgeraccounttype'), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('balance', sa.Numeric(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_type', 'account_id', 'period_end', name='uq_account_balances_period')
+    )
+    op.create_index(op.f('ix_account_balances_is_deleted'), 'account_balances', ['is_deleted'], unique=False)
+
+    # Ledger and FIFO allocation walk an account's charges and payments by date
+    op.create_index('ix_charges_unit_id_due_date', 'charges', ['unit_id', 'due_date', 'id'], unique=False)
+    op.create_index('ix_charges_owner_id_due_date', 'charges', ['owner_id', 'due_date', 'id'], unique=False)
+    op.create_index('ix_payments_charge_id_payment_date', 'payments', ['charge_id', 'payment_date'], unique=False)
+    op.create_index('ix_units_owner_id', 'units', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_units_owner_id', table_name='units')
+    op.drop_index('ix_payments_charge_id_payment_date', table_name='payments')
+    op.drop_index('ix_charges_owner_id_due_date', table_name='charges')
+    op.drop_index('ix_charges_unit_id_due_date', table_name='charges')
+    op.drop_index(op.f('ix_account_balances_is_deleted'), table_name='account_balances')
+    op.drop_table('account_balances')
+    sa.Enum(name='ledgeraccounttype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""add parent_charge_id to charges
+
+Revision ID: 3fe51fd94dae
+Revises: 72dc6bc010f4
+Create Date: 2026-10-19 12:41:08.113507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3fe51fd94dae'
+down_revision: Union[str, None] = '72dc6bc010f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('charges', sa.Column('parent_charge_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_charges_parent_charge_id', 'charges', 'charges', ['parent_charge_id'], ['id']
+    )
+    op.create_unique_constraint('uq_charges_parent_due_date', 'charges', ['parent_charge_id', 'due_date'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_charges_parent_due_date', 'charges', type_='unique')
+    op.drop_constraint('fk_charges_parent_charge_id', 'charges', type_='foreignkey')
+    op.drop_column('charges', 'parent_charge_id')
@@ -0,0 +1,83 @@
+"""add reconciliation tables
+
+Revision ID: 5e7a93c1d8b4
+Revises: d41f08c9b2e6
+Create Date: 2026-10-19 16:48:12.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a93c1d8b4'
+down_revision: Union[str, None] = 'd41f08c9b2e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reconciliation_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('building_id', sa.Integer(), nullable=True),
+    sa.Column('statement_name', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=True),
+    sa.Column('date_from', sa.Date(), nullable=False),
+    sa.Column('date_to', sa.Date(), nullable=False),
+    sa.Column('date_tolerance_days', sa.Integer(), nullable=False),
+    sa.Column('total_lines', sa.Integer(), nullable=False),
+    sa.Column('matched_lines', sa.Integer(), nullable=False),
+    sa.Column('created_by', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reconciliation_runs_is_deleted'), 'reconciliation_runs', ['is_deleted'], unique=False)
+    op.create_table('transaction_reconciliations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('run_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=False),
+    sa.Column('statement_date', sa.DateTime(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('reference', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('memo', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('match_type', sa.Enum('REFERENCE', 'AMOUNT_DATE', 'MEMO', 'UNMATCHED', name='matchtype'), nullable=False),
+    sa.Column('source', sa.Enum('TRANSACTION', 'FUND_TRANSACTION', name='reconciliationsource'), nullable=True),
+    sa.Column('source_id', sa.Integer(), nullable=True),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('reviewed', sa.Boolean(), nullable=False),
+    sa.Column('confirmed', sa.Boolean(), nullable=True),
+    sa.Column('reviewed_by', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['reconciliation_runs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transaction_reconciliations_is_deleted'), 'transaction_reconciliations', ['is_deleted'], unique=False)
+    op.create_index(
+        'ix_transaction_reconciliations_run_review', 'transaction_reconciliations',
+        ['run_id', 'reviewed', 'line_number'], unique=False
+    )
+    op.create_index(
+        'ix_transaction_reconciliations_source', 'transaction_reconciliations',
+        ['source', 'source_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_reconciliations_source', table_name='transaction_reconciliations')
+    op.drop_index('ix_transaction_reconciliations_run_review', table_name='transaction_reconciliations')
+    op.drop_index(op.f('ix_transaction_reconciliations_is_deleted'), table_name='transaction_reconciliations')
+    op.drop_table('transaction_reconciliations')
+    op.drop_index(op.f('ix_reconciliation_runs_is_deleted'), table_name='reconciliation_runs')
+    op.drop_table('reconciliation_runs')
+    sa.Enum(name='reconciliationsource').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='matchtype').drop(op.get_bind(), checkfirst=True)
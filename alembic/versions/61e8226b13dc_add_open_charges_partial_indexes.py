@@ -0,0 +1,37 @@
+"""add open charges partial indexes
+
+Revision ID: 61e8226b13dc
+Revises: 0ba1ded12b4d
+Create Date: 2026-10-19 10:03:17.284411
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '61e8226b13dc'
+down_revision: Union[str, None] = '0ba1ded12b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_CHARGES_PREDICATE = "status IN ('PENDING', 'OVERDUE', 'PARTIALLY_PAID') AND deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_charges_open_status_due_date', 'charges', ['status', 'due_date'],
+        unique=False, postgresql_where=sa.text(OPEN_CHARGES_PREDICATE)
+    )
+    op.create_index(
+        'ix_charges_open_building_due_date', 'charges', ['building_id', 'due_date'],
+        unique=False, postgresql_where=sa.text(OPEN_CHARGES_PREDICATE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_charges_open_building_due_date', table_name='charges')
+    op.drop_index('ix_charges_open_status_due_date', table_name='charges')
@@ -0,0 +1,51 @@
+"""charge generated amount columns
+
+Revision ID: 72dc6bc010f4
+Revises: 61e8226b13dc
+Create Date: 2026-10-19 11:26:54.918032
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '72dc6bc010f4'
+down_revision: Union[str, None] = '61e8226b13dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres generated columns cannot reference each other, so the
+# expressions are spelled out in full (same as app.models.charge)
+TAX_AMOUNT_SQL = (
+    "CASE WHEN is_taxable AND COALESCE(tax_rate, 0) > 0 "
+    "THEN round((amount * tax_rate / 100)::numeric, 2) ELSE 0 END"
+)
+TOTAL_AMOUNT_SQL = f"round(amount::numeric, 2) + {TAX_AMOUNT_SQL}"
+BALANCE_DUE_SQL = f"{TOTAL_AMOUNT_SQL} - round(amount_paid::numeric, 2)"
+
+
+def upgrade() -> None:
+    op.add_column('charges', sa.Column(
+        'tax_amount', sa.Numeric(14, 2), sa.Computed(TAX_AMOUNT_SQL, persisted=True), nullable=True
+    ))
+    op.add_column('charges', sa.Column(
+        'total_amount', sa.Numeric(14, 2), sa.Computed(TOTAL_AMOUNT_SQL, persisted=True), nullable=True
+    ))
+    op.add_column('charges', sa.Column(
+        'balance_due', sa.Numeric(14, 2), sa.Computed(BALANCE_DUE_SQL, persisted=True), nullable=True
+    ))
+    op.create_index(
+        'ix_charges_building_balance_due', 'charges', ['building_id', sa.text('balance_due DESC')],
+        unique=False, postgresql_where=sa.text('balance_due > 0 AND deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_charges_building_balance_due', table_name='charges')
+    op.drop_column('charges', 'balance_due')
+    op.drop_column('charges', 'total_amount')
+    op.drop_column('charges', 'tax_amount')
@@ -0,0 +1,54 @@
+"""add fund interest accruals
+
+Revision ID: 8d3b5e1f6a42
+Revises: f3a9c6d27e15
+Create Date: 2026-10-20 09:14:52.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b5e1f6a42'
+down_revision: Union[str, None] = 'f3a9c6d27e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fund_interest_accruals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('fund_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['fund_id'], ['funds.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['fund_transactions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('fund_id', 'period_start', 'period_end', name='uq_fund_interest_accruals_period')
+    )
+    op.create_index(op.f('ix_fund_interest_accruals_is_deleted'), 'fund_interest_accruals', ['is_deleted'], unique=False)
+
+    # Interest posted so far only records its cutoff; it is taken to cover
+    # the month its period ended in, which is the default period
+    op.execute("""
+        INSERT INTO fund_interest_accruals (fund_id, transaction_id, period_start, period_end, is_deleted)
+        SELECT fund_id, id,
+               date_trunc('month', transaction_date - interval '1 day')::date,
+               (transaction_date - interval '1 day')::date,
+               false
+        FROM fund_transactions
+        WHERE transaction_type = 'INTEREST' AND deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fund_interest_accruals_is_deleted'), table_name='fund_interest_accruals')
+    op.drop_table('fund_interest_accruals')
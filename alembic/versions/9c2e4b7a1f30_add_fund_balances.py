@@ -0,0 +1,48 @@
+"""add fund balances
+
+Revision ID: 9c2e4b7a1f30
+Revises: 3fe51fd94dae
+Create Date: 2026-10-19 14:02:37.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2e4b7a1f30'
+down_revision: Union[str, None] = '3fe51fd94dae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fund_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('fund_id', sa.Integer(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('balance', sa.Numeric(), nullable=False),
+    sa.ForeignKeyConstraint(['fund_id'], ['funds.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('fund_id', 'period_end', name='uq_fund_balances_period')
+    )
+    op.create_index(op.f('ix_fund_balances_is_deleted'), 'fund_balances', ['is_deleted'], unique=False)
+
+    # Period deltas read a fund's transactions by date
+    op.create_index(
+        'ix_fund_transactions_fund_id_transaction_date', 'fund_transactions',
+        ['fund_id', 'transaction_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fund_transactions_fund_id_transaction_date', table_name='fund_transactions')
+    op.drop_index(op.f('ix_fund_balances_is_deleted'), table_name='fund_balances')
+    op.drop_table('fund_balances')
@@ -0,0 +1,38 @@
+"""add fund interest
+
+Revision ID: a7f3c9e25d14
+Revises: e2c5a8f41b93
+Create Date: 2026-10-19 20:02:13.418226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7f3c9e25d14'
+down_revision: Union[str, None] = 'e2c5a8f41b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('funds', sa.Column('interest_rate', sa.Numeric(), nullable=True))
+    op.create_index(
+        'uq_fund_transactions_interest_period',
+        'fund_transactions',
+        ['fund_id', 'transaction_date'],
+        unique=True,
+        postgresql_where=sa.text("transaction_type = 'INTEREST'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'uq_fund_transactions_interest_period',
+        table_name='fund_transactions',
+        postgresql_where=sa.text("transaction_type = 'INTEREST'")
+    )
+    op.drop_column('funds', 'interest_rate')
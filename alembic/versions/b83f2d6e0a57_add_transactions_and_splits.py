@@ -0,0 +1,120 @@
+"""add transactions and transaction splits
+
+Revision ID: b83f2d6e0a57
+Revises: 5e7a93c1d8b4
+Create Date: 2026-10-19 18:05:33.470926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f2d6e0a57'
+down_revision: Union[str, None] = '5e7a93c1d8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+transaction_type = postgresql.ENUM(
+    'RENT', 'DEPOSIT', 'MAINTENANCE', 'UTILITY', 'PARKING', 'FINE', 'REFUND', 'ADJUSTMENT', 'OTHER',
+    name='paymenttransactiontype', create_type=False
+)
+transaction_status = postgresql.ENUM(
+    'PENDING', 'COMPLETED', 'FAILED', 'CANCELLED', 'REFUNDED', 'PARTIAL', 'OVERDUE', 'DISPUTED',
+    name='paymenttransactionstatus', create_type=False
+)
+payment_method = postgresql.ENUM(
+    'CASH', 'BANK_TRANSFER', 'CHECK', 'CREDIT_CARD', 'DEBIT_CARD', 'MOBILE_PAYMENT', 'ONLINE_PAYMENT', 'OTHER',
+    name='paymenttransactionmethod', create_type=False
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    transaction_type.create(bind, checkfirst=True)
+    transaction_status.create(bind, checkfirst=True)
+    payment_method.create(bind, checkfirst=True)
+
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('transaction_type', transaction_type, nullable=True),
+    sa.Column('status', transaction_status, nullable=True),
+    sa.Column('payment_method', payment_method, nullable=True),
+    sa.Column('building_id', sa.Integer(), nullable=False),
+    sa.Column('unit_id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('fund_id', sa.Integer(), nullable=False),
+    sa.Column('type', transaction_type, nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('allocated_amount', sa.Numeric(), server_default=sa.text('0'), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('reference_number', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('payment_date', sa.DateTime(), nullable=True),
+    sa.Column('late_fee', sa.Numeric(), nullable=True),
+    sa.Column('discount', sa.Numeric(), nullable=True),
+    sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ),
+    sa.ForeignKeyConstraint(['fund_id'], ['funds.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transactions_is_deleted'), 'transactions', ['is_deleted'], unique=False)
+    op.create_table('transaction_splits',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('unit_id', sa.Integer(), nullable=True),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=True),
+    sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transaction_splits_is_deleted'), 'transaction_splits', ['is_deleted'], unique=False)
+    op.create_index(op.f('ix_transaction_splits_transaction_id'), 'transaction_splits', ['transaction_id'], unique=False)
+    op.create_table('transaction_attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('file_path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('mime_type', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transaction_attachments_is_deleted'), 'transaction_attachments', ['is_deleted'], unique=False)
+    op.create_index(op.f('ix_transaction_attachments_transaction_id'), 'transaction_attachments', ['transaction_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transaction_attachments_transaction_id'), table_name='transaction_attachments')
+    op.drop_index(op.f('ix_transaction_attachments_is_deleted'), table_name='transaction_attachments')
+    op.drop_table('transaction_attachments')
+    op.drop_index(op.f('ix_transaction_splits_transaction_id'), table_name='transaction_splits')
+    op.drop_index(op.f('ix_transaction_splits_is_deleted'), table_name='transaction_splits')
+    op.drop_table('transaction_splits')
+    op.drop_index(op.f('ix_transactions_is_deleted'), table_name='transactions')
+    op.drop_table('transactions')
+    bind = op.get_bind()
+    payment_method.drop(bind, checkfirst=True)
+    transaction_status.drop(bind, checkfirst=True)
+    transaction_type.drop(bind, checkfirst=True)
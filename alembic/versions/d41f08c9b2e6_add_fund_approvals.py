@@ -0,0 +1,54 @@
+"""add fund approvals
+
+Revision ID: d41f08c9b2e6
+Revises: 9c2e4b7a1f30
+Create Date: 2026-10-19 15:26:54.218390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f08c9b2e6'
+down_revision: Union[str, None] = '9c2e4b7a1f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fund_approvals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('fund_id', sa.Integer(), nullable=False),
+    sa.Column('decision', sa.Enum('APPROVED', 'REJECTED', name='approvaldecision'), nullable=False),
+    sa.Column('approver', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('comment', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('decided_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['fund_id'], ['funds.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['fund_transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fund_approvals_is_deleted'), 'fund_approvals', ['is_deleted'], unique=False)
+    op.create_index(op.f('ix_fund_approvals_transaction_id'), 'fund_approvals', ['transaction_id'], unique=False)
+
+    # Approval queue listing by fund and status
+    op.create_index(
+        'ix_fund_transactions_fund_id_status', 'fund_transactions',
+        ['fund_id', 'status', 'transaction_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fund_transactions_fund_id_status', table_name='fund_transactions')
+    op.drop_index(op.f('ix_fund_approvals_transaction_id'), table_name='fund_approvals')
+    op.drop_index(op.f('ix_fund_approvals_is_deleted'), table_name='fund_approvals')
+    op.drop_table('fund_approvals')
+    sa.Enum(name='approvaldecision').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""add document number sequence
+
+Revision ID: e2c5a8f41b93
+Revises: b83f2d6e0a57
+Create Date: 2026-10-19 19:21:47.663105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c5a8f41b93'
+down_revision: Union[str, None] = 'b83f2d6e0a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Numbers reserved by one nextval(), see app.utils.numbering.NumberAllocator
+BLOCK_SIZE = 100
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(
+        sa.Sequence('document_number_seq', start=1, increment=BLOCK_SIZE)
+    ))
+    op.add_column('buildings', sa.Column(
+        'transaction_number_format', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True
+    ))
+    op.add_column('transactions', sa.Column(
+        'transaction_number', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True
+    ))
+    op.create_unique_constraint('transactions_transaction_number_key', 'transactions', ['transaction_number'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('transactions_transaction_number_key', 'transactions', type_='unique')
+    op.drop_column('transactions', 'transaction_number')
+    op.drop_column('buildings', 'transaction_number_format')
+    op.execute(sa.schema.DropSequence(sa.Sequence('document_number_seq')))
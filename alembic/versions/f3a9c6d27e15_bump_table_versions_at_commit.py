@@ -0,0 +1,90 @@
+"""bump table versions at commit
+
+Revision ID: f3a9c6d27e15
+Revises: c5e8d2a91f07
+Create Date: 2026-10-19 23:12:40.318502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c6d27e15'
+down_revision: Union[str, None] = 'c5e8d2a91f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with app.models.table_version.VERSIONED_TABLES
+VERSIONED_TABLES = ('buildings', 'floors', 'units', 'owners', 'tenants')
+
+
+def upgrade() -> None:
+    # Statements only note the written table in a transaction-local setting,
+    # which takes no lock and is undone with a rolled back savepoint
+    op.execute("""
+        CREATE FUNCTION mark_table_changed() RETURNS trigger AS $$
+        DECLARE
+            changed text[] := string_to_array(nullif(current_setting('table_versions.changed', true), ''), ',');
+        BEGIN
+            IF changed IS NULL OR NOT TG_TABLE_NAME = ANY(changed) THEN
+                PERFORM set_config('table_versions.changed', array_to_string(array_append(changed, TG_TABLE_NAME::text), ','), true);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    # Runs at commit, once per transaction: the counters are locked in name
+    # order, so commits writing the same tables cannot deadlock, and only
+    # until the commit completes
+    op.execute("""
+        CREATE FUNCTION bump_changed_table_versions() RETURNS trigger AS $$
+        DECLARE
+            changed text[] := string_to_array(nullif(current_setting('table_versions.changed', true), ''), ',');
+        BEGIN
+            IF changed IS NULL THEN
+                RETURN NULL;
+            END IF;
+            PERFORM set_config('table_versions.changed', '', true);
+            PERFORM 1 FROM table_versions WHERE table_name = ANY(changed) ORDER BY table_name FOR UPDATE;
+            UPDATE table_versions SET version = version + 1 WHERE table_name = ANY(changed);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+        op.execute(f"""
+            CREATE TRIGGER {table}_mark_changed
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION mark_table_changed()
+        """)
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER {table}_bump_version
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_changed_table_versions()
+        """)
+        # TRUNCATE locks the whole table anyway and has no row triggers
+        op.execute(f"""
+            CREATE TRIGGER {table}_truncate_bump_version
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+        """)
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_truncate_bump_version ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_mark_changed ON {table}")
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+        """)
+    op.execute("DROP FUNCTION IF EXISTS bump_changed_table_versions()")
+    op.execute("DROP FUNCTION IF EXISTS mark_table_changed()")
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import DEFERRED_TAGS, response_cache
+from app.core.responses import FastJSONRoute
+from app.db.scope import shared_session
+from app.db.session import engine
+from app.schemas.batch import BatchOperation, BatchRequest, BatchResponse, BatchResult
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"], route_class=FastJSONRoute)
+
+READ_METHODS = {"GET", "HEAD"}
+
+# Request headers passed on to every sub-request
+FORWARDED_HEADERS = {b"authorization", b"cookie", b"accept-language", b"user-agent"}
+
+# Status reported for writes skipped because an earlier write of the batch failed
+NOT_EXECUTED = 424
+
+# Streamed exports are not buffered into a batch result
+STREAMING_SUFFIXES = ("/export",)
+
+# Largest response body kept for one operation
+MAX_RESULT_BODY = 4 * 1024 * 1024
+
+
+async def _dispatch(request: Request, operation: BatchOperation) -> BatchResult:
+    """Run one operation through the application, in process"""
+    url = urlsplit(operation.path)
+    body = b"" if operation.body is None else json.dumps(operation.body).encode()
+    headers: List[Tuple[bytes, bytes]] = [
+        (name, value) for name, value in request.scope["headers"] if name in FORWARDED_HEADERS
+    ]
+    headers += [(b"accept", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+
+    scope = {
+        **request.scope,
+        "method": operation.method,
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+    for key in ("route", "endpoint", "path_params", "state"):
+        scope.pop(key, None)
+
+    received = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status, content_type, chunks, size = 500, "", [], 0
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, content_type, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    content_type = value.decode()
+        elif message["type"] == "http.response.body" and size <= MAX_RESULT_BODY:
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_RESULT_BODY:
+                chunks.clear()
+            else:
+                chunks.append(chunk)
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception as e:
+        logger.exception(f"Batch operation {operation.method} {operation.path} failed")
+        return BatchResult(status=500, body={"detail": str(e)})
+
+    if size > MAX_RESULT_BODY:
+        return BatchResult(
+            status=413,
+            body={"detail": f"Response larger than {MAX_RESULT_BODY} bytes, call {operation.path} on its own"}
+        )
+    raw = b"".join(chunks)
+    if not raw:
+        return BatchResult(status=status)
+    if content_type.startswith("application/json"):
+        return BatchResult(status=status, body=json.loads(raw))
+    return BatchResult(status=status, body=raw.decode(errors="replace"))
+
+
+async def _run_writes(request: Request, writes: List[Tuple[int, BatchOperation]]) -> Tuple[bool, Dict[int, BatchResult]]:
+    """
+    Run writes in order on one session inside a single transaction.
+
+    The CRUD layer commits after each write; with create_savepoint those
+    commits only release savepoints, and the batch commits at the end. The
+    first failing write rolls everything back and the rest are skipped.
+    Cached responses the writes touch are invalidated once the batch has
+    committed.
+    """
+    results: Dict[int, BatchResult] = {}
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        session.info[DEFERRED_TAGS] = set()
+        token = shared_session.set(session)
+        failed = False
+        try:
+            for index, operation in writes:
+                if failed:
+                    results[index] = BatchResult(status=NOT_EXECUTED, body={"detail": "Not executed, the batch was rolled back"})
+                    continue
+                results[index] = await _dispatch(request, operation)
+                failed = results[index].status >= 400
+        finally:
+            shared_session.reset(token)
+            await session.close()
+            if failed or not transaction.is_active:
+                await transaction.rollback()
+            else:
+                await transaction.commit()
+                await response_cache.invalidate(*session.info[DEFERRED_TAGS])
+    return not failed, results
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, request: Request):
+    """
+    Execute many API calls in one round trip.
+
+    Reads run concurrently, each on its own session, and see the state from
+    before the batch's writes. Writes run in the given order in one database
+    transaction: if one fails none is committed. Every operation passes
+    admission control under its own route group, and one it refuses fails
+    with 503. Exports are refused, and a result whose body exceeds
+    MAX_RESULT_BODY is replaced by a 413. Results come back in request order.
+    """
+    batch_path = f"{settings.API_V1_STR}/batch"
+    for operation in batch.operations:
+        path = urlsplit(operation.path).path
+        if not path.startswith(f"{settings.API_V1_STR}/") or path.rstrip("/") == batch_path:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Batch operations must target {settings.API_V1_STR} endpoints other than batch: {operation.path}"
+            )
+        if path.rstrip("/").endswith(STREAMING_SUFFIXES):
+            raise HTTPException(
+                status_code=422,
+                detail=f"Streamed exports cannot be batched: {operation.path}"
+            )
+
+    reads = [(i, op) for i, op in enumerate(batch.operations) if op.method in READ_METHODS]
+    writes = [(i, op) for i, op in enumerate(batch.operations) if op.method not in READ_METHODS]
+
+    async def run_reads() -> Dict[int, BatchResult]:
+        results = await asyncio.gather(*(_dispatch(request, op) for _, op in reads))
+        return {index: result for (index, _), result in zip(reads, results)}
+
+    async def no_writes() -> Tuple[bool, Dict[int, BatchResult]]:
+        return True, {}
+
+    read_results, (committed, write_results) = await asyncio.gather(
+        run_reads(),
+        _run_writes(request, writes) if writes else no_writes()
+    )
+    results = {**read_results, **write_results}
+    return BatchResponse(
+        committed=committed and bool(writes),
+        results=[results[i] for i in range(len(batch.operations))]
+    )
@@ -1,25 +1,37 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.building import BuildingCreate, BuildingUpdate, BuildingResponse
 from app.models.building import Building
 from app.crud import crud_building
-from db.session import get_db
+from app.db.session import get_db
+from app.core.conditional import check_entity_etag, check_list_etag
+from app.core.responses import FastJSONRoute
+from app.utils.expand import EXPAND_DESCRIPTION, expand_limit, expand_options, expanded_models, expanded_response, parse_expand
 
-router = APIRouter(prefix="/buildings", tags=["buildings"])
+router = APIRouter(prefix="/buildings", tags=["buildings"], route_class=FastJSONRoute)
 
 @router.get("/", response_model=List[BuildingResponse], name="api_v1_read_buildings")
 async def read_buildings(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve buildings.
+    Retrieve buildings, optionally with related rows embedded.
     """
-    buildings = await crud_building.get_multi(db, skip=skip, limit=limit)
-    return buildings
+    tree = parse_expand(Building, expand)
+    await check_list_etag(request, db, Building, related=expanded_models(Building, tree))
+    buildings = await crud_building.get_multi(
+        db,
+        skip=skip,
+        limit=expand_limit(tree, limit),
+        options=expand_options(Building, tree)
+    )
+    return expanded_response(buildings, BuildingResponse, tree)
 
 @router.post("/", response_model=BuildingResponse, name="api_v1_create_building")
 async def create_building(
@@ -34,19 +46,23 @@ async def create_building(
 
 @router.get("/{building_id}", response_model=BuildingResponse, name="api_v1_read_building")
 async def read_building(
+        request: Request,
         building_id: int,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ) -> Building:
     """
-    Get building by ID.
+    Get building by ID, optionally with related rows embedded.
     """
-    building = await crud_building.get(db=db, id=building_id)
+    tree = parse_expand(Building, expand)
+    await check_entity_etag(request, db, Building, building_id, related=expanded_models(Building, tree))
+    building = await crud_building.get(db=db, id=building_id, options=expand_options(Building, tree))
     if not building:
         raise HTTPException(
             status_code=404,
             detail="Building not found"
         )
-    return building
+    return expanded_response(building, BuildingResponse, tree)
 
 @router.put("/{building_id}", response_model=BuildingResponse, name="api_v1_update_building")
 async def update_building(
@@ -1,70 +1,51 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
 from sqlmodel import Session
 from app.db.session import get_db
 from app.crud import charge as crud
-from app.schemas.charge import ChargeResponse, ChargeCreate, ChargeUpdate
-
-router = APIRouter()
-
-@router.get("/charges/", response_model=List[ChargeResponse])
-async def read_charges(
-    skip: int = 0,
-    limit: int = 100,
+from app.schemas.charge import (
+    AccountPaymentCreate,
+    AccountPaymentResponse,
+    ChargeOccurrence,
+    ChargeMaterializeResult,
+)
+from app.core.responses import FastJSONRoute
+
+# Charges are not listed, created or edited here yet: ChargeCreate, ChargeUpdate and
+# ChargeResponse describe fields the Charge model does not have
+router = APIRouter(route_class=FastJSONRoute)
+
+@router.post("/charges/pay-account", response_model=AccountPaymentResponse)
+async def pay_account(
+    payment: AccountPaymentCreate,
     db: Session = Depends(get_db)
 ):
-    charges = await crud.get_charges(db, skip=skip, limit=limit)
-    return charges
-
+    """Allocate a payment FIFO across an owner's or unit's open charges"""
+    return await crud.ChargeCRUD(db).pay_account(payment)
 
-@router.post("/charges/", response_model=ChargeResponse)
-async def create_charge(
-    charge: ChargeCreate,
-    db: Session = Depends(get_db)
-):
-    return await crud.create_charge(db, charge)
 
-
-@router.get("/charges/{charge_id}", response_model=ChargeResponse)
-async def read_charge(
+@router.get("/charges/{charge_id}/schedule", response_model=List[ChargeOccurrence])
+async def preview_charge_schedule(
     charge_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(default=12, ge=1, le=366),
     db: Session = Depends(get_db)
 ):
-    charge = await crud.get_charge(db, charge_id)
-    if charge is None:
-        raise HTTPException(status_code=404, detail="Charge not found")
-    return charge
-
-
-@router.put("/charges/{charge_id}", response_model=ChargeResponse)
-async def update_charge(
-    charge_id: int,
-    charge: ChargeUpdate,
-    db: Session = Depends(get_db)
-):
-    updated_charge = await crud.update_charge(
-        db, charge_id, charge
+    """Preview occurrences of a recurring charge without creating them"""
+    return await crud.ChargeCRUD(db).preview_schedule(
+        charge_id, start=start, end=end, limit=limit
     )
-    if updated_charge is None:
-        raise HTTPException(status_code=404, detail="Charge not found")
-    return updated_charge
-
-
-@router.post("/charges/calculate-monthly")
-async def calculate_monthly_charges(
-    db: Session = Depends(get_db)
-):
-    """Calculate monthly charges for all units"""
-    return await crud.calculate_monthly_charges(db)
 
 
-@router.post("/charges/{charge_id}/pay")
-async def pay_charge(
-    charge_id: int,
+@router.post("/charges/recurring/materialize", response_model=ChargeMaterializeResult)
+async def materialize_recurring_charges(
+    periods: int = Query(default=3, ge=1, le=36),
+    building_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Mark a charge as paid"""
-    updated_charge = await crud.pay_charge(db, charge_id)
-    if updated_charge is None:
-        raise HTTPException(status_code=404, detail="Charge not found")
-    return updated_charge
\ No newline at end of file
+    """Create the next N occurrences of every recurring charge"""
+    return await crud.ChargeCRUD(db).materialize_recurring(
+        periods=periods, building_id=building_id
+    )
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import Annotated, Any, Dict, Optional
+from fastapi import APIRouter, Query
+from sqlalchemy import and_, exists, not_, select
+
+from app.core.responses import FastJSONRoute
+from app.crud.charge import ChargeCRUD
+from app.crud.fund import FundCRUD
+from app.models.building import Building
+from app.models.charge import Payment
+from app.models.cost import Cost
+from app.models.floor import Floor
+from app.models.owner import Owner
+from app.models.tenant import Tenant
+from app.models.transaction import Transaction, TransactionStatus
+from app.models.unit import Unit, UnitStatus
+from app.schemas.charge import ChargeFilter
+from app.schemas.cost import CostFilter
+from app.schemas.floor import FloorFilter
+from app.schemas.fund import FundFilter, FundTransactionFilter
+from app.schemas.owner import OwnerFilter
+from app.schemas.tenant import TenantFilter
+from app.schemas.transaction import TransactionFilter
+from app.utils.export import ExportFormat, ExportOptions, column_query, export_response
+from app.utils.helpers import utc_now
+
+# Included before the entity routers, so /{entity}/export is not taken for an id
+router = APIRouter(tags=["exports"], route_class=FastJSONRoute)
+
+
+# A query model must be the endpoint's only query parameter, so the filters carry the format too
+class FloorExport(FloorFilter, ExportOptions):
+    """Filters and format of the floors export"""
+
+
+class OwnerExport(OwnerFilter, ExportOptions):
+    """Filters and format of the owners export"""
+
+
+class TenantExport(TenantFilter, ExportOptions):
+    """Filters and format of the tenants export"""
+
+
+class ChargeExport(ChargeFilter, ExportOptions):
+    """Filters and format of the charges export"""
+
+
+class CostExport(CostFilter, ExportOptions):
+    """Filters and format of the costs export"""
+
+
+class FundExport(FundFilter, ExportOptions):
+    """Filters and format of the funds export"""
+
+
+class FundTransactionExport(FundTransactionFilter, ExportOptions):
+    """Filters and format of the fund transactions export"""
+
+
+class TransactionExport(TransactionFilter, ExportOptions):
+    """Filters and format of the transactions export"""
+
+
+# Transactions still awaiting payment, which are overdue past their due date
+UNPAID_TRANSACTION_STATUSES = (TransactionStatus.PENDING, TransactionStatus.PARTIAL, TransactionStatus.OVERDUE)
+
+
+def _unit_filters(*link: Any) -> Dict[str, Any]:
+    """has_units/has_active_units conditions: whether a live unit, or an occupied one, is linked"""
+    def units(active: bool) -> Any:
+        clauses = [*link, Unit.deleted_at.is_(None)]
+        if active:
+            clauses.append(Unit.status == UnitStatus.OCCUPIED)
+        return exists(select(Unit.id).where(and_(*clauses)))
+
+    return {
+        "has_units": lambda value: units(False) if value else not_(units(False)),
+        "has_active_units": lambda value: units(True) if value else not_(units(True)),
+    }
+
+
+def _transaction_overdue(value: bool) -> Any:
+    overdue = and_(Transaction.status.in_(UNPAID_TRANSACTION_STATUSES), Transaction.due_date < utc_now())
+    return overdue if value else not_(overdue)
+
+
+@router.get("/buildings/export")
+async def export_buildings(format: ExportFormat = ExportFormat.NDJSON):
+    return export_response(column_query(Building), format, "buildings")
+
+
+@router.get("/floors/export")
+async def export_floors(
+        filters: Annotated[FloorExport, Query()]
+):
+    return export_response(column_query(Floor, filters), filters.format, "floors")
+
+
+@router.get("/units/export")
+async def export_units(
+        floor_id: Optional[int] = None,
+        owner_id: Optional[int] = None,
+        format: ExportFormat = ExportFormat.NDJSON
+):
+    query = column_query(Unit)
+    if floor_id is not None:
+        query = query.where(Unit.floor_id == floor_id)
+    if owner_id is not None:
+        query = query.where(Unit.owner_id == owner_id)
+    return export_response(query, format, "units")
+
+
+@router.get("/owners/export")
+async def export_owners(
+        filters: Annotated[OwnerExport, Query()]
+):
+    query = column_query(
+        Owner, filters,
+        search_columns=(Owner.name, Owner.email, Owner.phone),
+        conditions=_unit_filters(Unit.owner_id == Owner.id)
+    )
+    return export_response(query, filters.format, "owners")
+
+
+@router.get("/tenants/export")
+async def export_tenants(
+        filters: Annotated[TenantExport, Query()]
+):
+    query = column_query(
+        Tenant, filters,
+        search_columns=(Tenant.name, Tenant.email, Tenant.phone),
+        conditions=_unit_filters(Unit.id == Tenant.unit_id)
+    )
+    return export_response(query, filters.format, "tenants")
+
+
+@router.get("/charges/export")
+async def export_charges(
+        filters: Annotated[ChargeExport, Query()]
+):
+    return export_response(ChargeCRUD.export_query(filters), filters.format, "charges")
+
+
+@router.get("/payments/export")
+async def export_payments(
+        charge_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        format: ExportFormat = ExportFormat.NDJSON
+):
+    query = column_query(Payment)
+    if charge_id is not None:
+        query = query.where(Payment.charge_id == charge_id)
+    if date_from:
+        query = query.where(Payment.payment_date >= date_from)
+    if date_to:
+        query = query.where(Payment.payment_date <= date_to)
+    return export_response(query, format, "payments")
+
+
+@router.get("/costs/export")
+async def export_costs(
+        filters: Annotated[CostExport, Query()]
+):
+    query = column_query(
+        Cost, filters,
+        date_column=Cost.planned_date,
+        amount_column=Cost.amount,
+        aliases={"recurring": Cost.is_recurring}
+    )
+    return export_response(query, filters.format, "costs")
+
+
+@router.get("/funds/export")
+async def export_funds(
+        filters: Annotated[FundExport, Query()]
+):
+    return export_response(FundCRUD.export_query(filters), filters.format, "funds")
+
+
+@router.get("/fund-transactions/export")
+async def export_fund_transactions(
+        filters: Annotated[FundTransactionExport, Query()]
+):
+    return export_response(FundCRUD.transaction_export_query(filters), filters.format, "fund-transactions")
+
+
+@router.get("/transactions/export")
+async def export_transactions(
+        filters: Annotated[TransactionExport, Query()]
+):
+    query = column_query(
+        Transaction, filters,
+        date_column=Transaction.due_date,
+        amount_column=Transaction.amount,
+        conditions={"is_overdue": _transaction_overdue}
+    )
+    return export_response(query, filters.format, "transactions")
@@ -1,25 +1,37 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.floor import FloorCreate, FloorUpdate, FloorResponse
 from app.models.floor import Floor
 from app.crud import crud_floor
-from db.session import get_db
+from app.db.session import get_db
+from app.core.conditional import check_entity_etag, check_list_etag
+from app.core.responses import FastJSONRoute
+from app.utils.expand import EXPAND_DESCRIPTION, expand_limit, expand_options, expanded_models, expanded_response, parse_expand
 
-router = APIRouter(prefix="/floors", tags=["floors"])
+router = APIRouter(prefix="/floors", tags=["floors"], route_class=FastJSONRoute)
 
 @router.get("/", response_model=List[FloorResponse], name="api_v1_read_floors")
 async def read_floors(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve floors.
+    Retrieve floors, optionally with related rows embedded.
     """
-    floors = await crud_floor.get_multi(db, skip=skip, limit=limit)
-    return floors
+    tree = parse_expand(Floor, expand)
+    await check_list_etag(request, db, Floor, related=expanded_models(Floor, tree))
+    floors = await crud_floor.get_multi(
+        db,
+        skip=skip,
+        limit=expand_limit(tree, limit),
+        options=expand_options(Floor, tree)
+    )
+    return expanded_response(floors, FloorResponse, tree)
 
 @router.post("/", response_model=FloorResponse, name="api_v1_create_floor")
 async def create_floor(
@@ -34,19 +46,23 @@ async def create_floor(
 
 @router.get("/{floor_id}", response_model=FloorResponse, name="api_v1_read_floor")
 async def read_floor(
+        request: Request,
         floor_id: int,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ) -> Floor:
     """
-    Get floor by ID.
+    Get floor by ID, optionally with related rows embedded.
     """
-    floor = await crud_floor.get(db=db, id=floor_id)
+    tree = parse_expand(Floor, expand)
+    await check_entity_etag(request, db, Floor, floor_id, related=expanded_models(Floor, tree))
+    floor = await crud_floor.get(db=db, id=floor_id, options=expand_options(Floor, tree))
     if not floor:
         raise HTTPException(
             status_code=404,
             detail="Floor not found"
         )
-    return floor
+    return expanded_response(floor, FloorResponse, tree)
 
 @router.put("/{floor_id}", response_model=FloorResponse, name="api_v1_update_floor")
 async def update_floor(
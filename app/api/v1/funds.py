@@ -0,0 +1,134 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.fund import FundCRUD
+from app.db.session import get_db
+from app.schemas.fund import (
+    FundTransactionBulkCreate,
+    FundTransactionBulkResult,
+    FundTransferCreate,
+    FundTransferResponse,
+    FundTransferBatchCreate,
+    FundTransferBatchResult,
+    FundSweepRequest,
+    FundApprovalRequest,
+    FundApprovalResult,
+    FundQueueItem,
+    FundInterestResult,
+    FundForecastResponse,
+)
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(prefix="/funds", tags=["funds"], route_class=FastJSONRoute)
+
+
+@router.post("/transactions/bulk", response_model=FundTransactionBulkResult)
+async def create_fund_transactions_bulk(
+        bulk_data: FundTransactionBulkCreate,
+        db: AsyncSession = Depends(get_db)
+):
+    """Import many fund transactions across funds in one database transaction"""
+    return await FundCRUD(db).process_bulk(bulk_data)
+
+
+@router.post("/transfers", response_model=FundTransferResponse)
+async def transfer_between_funds(
+        transfer_data: FundTransferCreate,
+        db: AsyncSession = Depends(get_db)
+):
+    """Move money from one fund to another"""
+    return await FundCRUD(db).transfer(transfer_data)
+
+
+@router.post("/transfers/batch", response_model=FundTransferBatchResult)
+async def transfer_batch(
+        batch_data: FundTransferBatchCreate,
+        db: AsyncSession = Depends(get_db)
+):
+    """Apply many transfers atomically"""
+    return await FundCRUD(db).transfer_batch(batch_data.transfers)
+
+
+@router.post("/transfers/sweep", response_model=FundTransferBatchResult)
+async def sweep_funds(
+        sweep_data: FundSweepRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    """Sweep the available balance of matching funds into one fund"""
+    return await FundCRUD(db).sweep(sweep_data)
+
+
+@router.get("/approvals/pending", response_model=List[FundQueueItem])
+async def list_pending_approvals(
+        fund_id: Optional[int] = None,
+        building_id: Optional[int] = None,
+        skip: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=1000),
+        db: AsyncSession = Depends(get_db)
+):
+    """List fund transactions waiting for approval"""
+    return await FundCRUD(db).get_approval_queue(
+        fund_id=fund_id, building_id=building_id, skip=skip, limit=limit
+    )
+
+
+@router.post("/approvals/approve", response_model=FundApprovalResult)
+async def approve_fund_transactions(
+        approval_data: FundApprovalRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    """Approve pending transactions and apply them to their funds"""
+    return await FundCRUD(db).approve_transactions(approval_data)
+
+
+@router.post("/approvals/reject", response_model=FundApprovalResult)
+async def reject_fund_transactions(
+        approval_data: FundApprovalRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    """Reject pending transactions"""
+    return await FundCRUD(db).reject_transactions(approval_data)
+
+
+@router.post("/balances/snapshot")
+async def snapshot_fund_balances(
+        period_end: Optional[date] = None,
+        db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Store month-end balances of all funds, defaults to the last closed month"""
+    period_end, stored = await FundCRUD(db).snapshot_balances(period_end)
+    return {"period_end": period_end, "funds": stored}
+
+
+@router.post("/interest/accrue", response_model=FundInterestResult)
+async def accrue_fund_interest(
+        period_start: Optional[date] = None,
+        period_end: Optional[date] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """Post interest for a period to all interest-bearing funds, defaults to the last closed month"""
+    return await FundCRUD(db).accrue_interest(period_start, period_end)
+
+
+@router.get("/forecast", response_model=FundForecastResponse)
+async def forecast_fund_balances(
+        building_id: Optional[int] = None,
+        months: int = Query(default=12, ge=1, le=120),
+        lookback_months: int = Query(default=12, ge=1, le=60),
+        db: AsyncSession = Depends(get_db)
+):
+    """Project month-end balances of a building's funds, or all funds, and flag shortfalls"""
+    return await FundCRUD(db).forecast(building_id, months, lookback_months)
+
+
+@router.get("/{fund_id}/reports/{year}/{month}")
+async def get_fund_monthly_report(
+        fund_id: int,
+        year: int = Path(..., ge=2000, le=2100),
+        month: int = Path(..., ge=1, le=12),
+        db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Monthly fund report with historical opening and closing balances"""
+    return await FundCRUD(db).get_monthly_report(fund_id, year, month)
@@ -0,0 +1,79 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.ledger import LedgerCRUD
+from app.models.ledger import LedgerAccountType
+from app.schemas.ledger import LedgerPage
+from app.db.session import get_db
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(prefix="/ledger", tags=["ledger"], route_class=FastJSONRoute)
+
+
+async def _statement(
+        account_type: LedgerAccountType,
+        account_id: int,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        cursor: Optional[str],
+        limit: int,
+        format: str,
+        db: AsyncSession
+):
+    ledger = LedgerCRUD(db)
+    if format == "ndjson":
+        async def lines():
+            async for entry in ledger.stream_statement(
+                    account_type, account_id, start_date=start_date, end_date=end_date
+            ):
+                yield entry.model_dump_json() + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return await ledger.get_statement(
+        account_type,
+        account_id,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=cursor,
+        limit=limit
+    )
+
+
+@router.get("/units/{unit_id}", response_model=LedgerPage, name="api_v1_unit_ledger")
+async def read_unit_ledger(
+        unit_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=1000),
+        format: Literal["json", "ndjson"] = "json",
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Running statement of charges, payments and balance for a unit.
+    """
+    return await _statement(
+        LedgerAccountType.UNIT, unit_id, start_date, end_date, cursor, limit, format, db
+    )
+
+
+@router.get("/owners/{owner_id}", response_model=LedgerPage, name="api_v1_owner_ledger")
+async def read_owner_ledger(
+        owner_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=1000),
+        format: Literal["json", "ndjson"] = "json",
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Running statement of charges, payments and balance for an owner across their units.
+    """
+    return await _statement(
+        LedgerAccountType.OWNER, owner_id, start_date, end_date, cursor, limit, format, db
+    )
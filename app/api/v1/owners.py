@@ -1,25 +1,37 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.owner import OwnerCreate, OwnerUpdate, OwnerResponse
 from app.models.owner import Owner
 from app.crud import crud_owner
-from db.session import get_db
+from app.db.session import get_db
+from app.core.conditional import check_entity_etag, check_list_etag
+from app.core.responses import FastJSONRoute
+from app.utils.expand import EXPAND_DESCRIPTION, expand_limit, expand_options, expanded_models, expanded_response, parse_expand
 
-router = APIRouter(prefix="/owners", tags=["owners"])
+router = APIRouter(prefix="/owners", tags=["owners"], route_class=FastJSONRoute)
 
 @router.get("/", response_model=List[OwnerResponse], name="api_v1_read_owners")
 async def read_owners(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve owners.
+    Retrieve owners, optionally with related rows embedded.
     """
-    owners = await crud_owner.get_multi(db, skip=skip, limit=limit)
-    return owners
+    tree = parse_expand(Owner, expand)
+    await check_list_etag(request, db, Owner, related=expanded_models(Owner, tree))
+    owners = await crud_owner.get_multi(
+        db,
+        skip=skip,
+        limit=expand_limit(tree, limit),
+        options=expand_options(Owner, tree)
+    )
+    return expanded_response(owners, OwnerResponse, tree)
 
 @router.post("/", response_model=OwnerResponse, name="api_v1_create_owner")
 async def create_owner(
@@ -34,19 +46,23 @@ async def create_owner(
 
 @router.get("/{owner_id}", response_model=OwnerResponse, name="api_v1_read_owner")
 async def read_owner(
+        request: Request,
         owner_id: int,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ) -> Owner:
     """
-    Get owner by ID.
+    Get owner by ID, optionally with related rows embedded.
     """
-    owner = await crud_owner.get(db=db, id=owner_id)
+    tree = parse_expand(Owner, expand)
+    await check_entity_etag(request, db, Owner, owner_id, related=expanded_models(Owner, tree))
+    owner = await crud_owner.get(db=db, id=owner_id, options=expand_options(Owner, tree))
     if not owner:
         raise HTTPException(
             status_code=404,
             detail="Owner not found"
         )
-    return owner
+    return expanded_response(owner, OwnerResponse, tree)
 
 @router.put("/{owner_id}", response_model=OwnerResponse, name="api_v1_update_owner")
 async def update_owner(
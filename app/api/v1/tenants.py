@@ -1,25 +1,37 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse
 from app.models.tenant import Tenant
 from app.crud import crud_tenant, crud_unit
-from db.session import get_db
+from app.db.session import get_db
+from app.core.conditional import check_entity_etag, check_list_etag
+from app.core.responses import FastJSONRoute
+from app.utils.expand import EXPAND_DESCRIPTION, expand_limit, expand_options, expanded_models, expanded_response, parse_expand
 
-router = APIRouter(prefix="/tenants", tags=["tenants"])
+router = APIRouter(prefix="/tenants", tags=["tenants"], route_class=FastJSONRoute)
 
 @router.get("/", response_model=List[TenantResponse], name="api_v1_read_tenants")
 async def read_tenants(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve tenants.
+    Retrieve tenants, optionally with related rows embedded.
     """
-    tenants = await crud_tenant.get_multi(db, skip=skip, limit=limit)
-    return tenants
+    tree = parse_expand(Tenant, expand)
+    await check_list_etag(request, db, Tenant, related=expanded_models(Tenant, tree))
+    tenants = await crud_tenant.get_multi(
+        db,
+        skip=skip,
+        limit=expand_limit(tree, limit),
+        options=expand_options(Tenant, tree)
+    )
+    return expanded_response(tenants, TenantResponse, tree)
 
 @router.post("/", response_model=TenantResponse, name="api_v1_create_tenant")
 async def create_tenant(
@@ -49,19 +61,23 @@ async def create_tenant(
 
 @router.get("/{tenant_id}", response_model=TenantResponse, name="api_v1_read_tenant")
 async def read_tenant(
+        request: Request,
         tenant_id: int,
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
         db: AsyncSession = Depends(get_db)
 ) -> Tenant:
     """
-    Get tenant by ID.
+    Get tenant by ID, optionally with related rows embedded.
     """
-    tenant = await crud_tenant.get(db=db, id=tenant_id)
+    tree = parse_expand(Tenant, expand)
+    await check_entity_etag(request, db, Tenant, tenant_id, related=expanded_models(Tenant, tree))
+    tenant = await crud_tenant.get(db=db, id=tenant_id, options=expand_options(Tenant, tree))
     if not tenant:
         raise HTTPException(
             status_code=404,
             detail="Tenant not found"
         )
-    return tenant
+    return expanded_response(tenant, TenantResponse, tree)
 
 @router.put("/{tenant_id}", response_model=TenantResponse, name="api_v1_update_tenant")
 async def update_tenant(
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.transaction import TransactionCRUD
+from app.db.session import get_db
+from app.models.transaction import MatchType
+from app.schemas.transaction import (
+    BankStatementReconcile,
+    ReconciliationRunResponse,
+    ReconciliationPage,
+    ReconciliationReview,
+    TransactionSplitBatchCreate,
+    TransactionSplitResponse,
+)
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(prefix="/transactions", tags=["transactions"], route_class=FastJSONRoute)
+
+
+@router.post("/{transaction_id}/splits", response_model=List[TransactionSplitResponse])
+async def add_transaction_splits(
+        transaction_id: int,
+        split_data: TransactionSplitBatchCreate,
+        db: AsyncSession = Depends(get_db)
+):
+    """Allocate a transaction over units in one request"""
+    return await TransactionCRUD(db).add_splits(transaction_id, split_data.splits)
+
+
+@router.post("/reconciliations", response_model=ReconciliationRunResponse)
+async def reconcile_bank_statement(
+        statement: BankStatementReconcile,
+        db: AsyncSession = Depends(get_db)
+):
+    """Match a bank statement against transactions and fund transactions"""
+    return await TransactionCRUD(db).reconcile(statement)
+
+
+@router.get("/reconciliations/{run_id}", response_model=ReconciliationRunResponse)
+async def get_reconciliation_run(
+        run_id: int,
+        db: AsyncSession = Depends(get_db)
+):
+    return await TransactionCRUD(db).get_reconciliation_run(run_id)
+
+
+@router.get("/reconciliations/{run_id}/lines", response_model=ReconciliationPage)
+async def get_reconciliation_lines(
+        run_id: int,
+        reviewed: Optional[bool] = None,
+        match_type: Optional[MatchType] = None,
+        after_line: int = Query(default=0, ge=0),
+        limit: int = Query(default=500, ge=1, le=5000),
+        db: AsyncSession = Depends(get_db)
+):
+    """Page through a run's lines, e.g. only the unreviewed ones"""
+    return await TransactionCRUD(db).get_reconciliation_lines(
+        run_id, reviewed=reviewed, match_type=match_type, after_line=after_line, limit=limit
+    )
+
+
+@router.post("/reconciliations/{run_id}/review")
+async def review_reconciliation(
+        run_id: int,
+        review: ReconciliationReview,
+        db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Confirm or reject matches; confirmed entries are skipped by later runs"""
+    updated = await TransactionCRUD(db).review_reconciliation(run_id, review)
+    return {"updated": updated}
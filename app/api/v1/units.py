@@ -1,20 +1,34 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel import Session
 from app.db.session import get_db
 from app.crud import unit as crud
+from app.crud import crud_unit
+from app.models.unit import Unit
 from app.schemas.unit import UnitResponse, UnitCreate, UnitUpdate
+from app.core.conditional import check_entity_etag, check_list_etag
+from app.core.responses import FastJSONRoute
+from app.utils.expand import EXPAND_DESCRIPTION, expand_limit, expand_options, expanded_models, expanded_response, parse_expand
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.get("/units/", response_model=List[UnitResponse])
 async def read_units(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    units = await crud.get_units(db, skip=skip, limit=limit)
-    return units
+    tree = parse_expand(Unit, expand)
+    await check_list_etag(request, db, Unit, related=expanded_models(Unit, tree))
+    units = await crud_unit.get_multi(
+        db,
+        skip=skip,
+        limit=expand_limit(tree, limit),
+        options=expand_options(Unit, tree)
+    )
+    return expanded_response(units, UnitResponse, tree)
 
 
 @router.post("/units/", response_model=UnitResponse)
@@ -27,13 +41,17 @@ async def create_unit(
 
 @router.get("/units/{unit_id}", response_model=UnitResponse)
 async def read_unit(
+    request: Request,
     unit_id: int,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    unit = await crud.get_unit(db, unit_id)
+    tree = parse_expand(Unit, expand)
+    await check_entity_etag(request, db, Unit, unit_id, related=expanded_models(Unit, tree))
+    unit = await crud_unit.get(db, unit_id, options=expand_options(Unit, tree))
     if unit is None:
         raise HTTPException(status_code=404, detail="Unit not found")
-    return unit
+    return expanded_response(unit, UnitResponse, tree)
 
 
 @router.put("/units/{unit_id}", response_model=UnitResponse)
@@ -0,0 +1,276 @@
+import asyncio
+import heapq
+import itertools
+import json
+import re
+import time
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class Priority(IntEnum):
+    CRITICAL = 0  # Payments, money moving in
+    HIGH = 1  # Charges
+    NORMAL = 2  # Everything else
+    LOW = 3  # Reports, exports and dashboards
+
+
+# Share of the database slots each priority may occupy; the rest is kept free for higher ones
+PRIORITY_SHARES = {
+    Priority.CRITICAL: 1.0,
+    Priority.HIGH: 1.0,
+    Priority.NORMAL: 0.8,
+    Priority.LOW: 0.5,
+}
+
+# Paths that never touch the database and skip admission
+EXEMPT_PATHS = ("/static", "/health", "/metrics", "/docs", "/redoc")
+
+# Batches are not admitted as a whole; each of their operations is, under its own group
+BATCH_PATH = "/api/v1/batch"
+
+
+class RouteGroup(NamedTuple):
+    name: str
+    pattern: Pattern[str]
+    priority: Priority
+    max_concurrency: int  # Requests of the group running at once
+    max_queue: int  # Requests of the group waiting for a slot; more are refused at once
+    retry_after: int  # Seconds suggested to refused clients
+
+
+# Checked in order, the first group whose pattern matches the path wins
+ROUTE_GROUPS: Tuple[RouteGroup, ...] = (
+    RouteGroup("payments", re.compile(r"^/api/v1/charges/pay-account$"), Priority.CRITICAL, 32, 64, 1),
+    RouteGroup("charges", re.compile(r"^/api/v1/charges(/|$)"), Priority.HIGH, 16, 32, 1),
+    RouteGroup("reports", re.compile(r"^/api/v1/(reports/|funds/forecast)"), Priority.LOW, 2, 4, 10),
+    RouteGroup("exports", re.compile(r"^/api/v1/[\w-]+/export$"), Priority.LOW, 2, 2, 30),
+    # The server-rendered pages, each queries the database like a dashboard
+    RouteGroup(
+        "dashboards",
+        re.compile(r"^/(dashboard|buildings|floors|owners|tenants|units)(/|$)"),
+        Priority.LOW, 4, 8, 5
+    ),
+    RouteGroup("default", re.compile(r""), Priority.NORMAL, 32, 64, 2),
+)
+
+
+def route_group(path: str) -> Optional[RouteGroup]:
+    if path.startswith(EXEMPT_PATHS) or path.rstrip("/") == BATCH_PATH:
+        return None
+    for group in ROUTE_GROUPS:
+        if group.pattern.match(path):
+            return group
+    return None
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str):
+        self.reason = reason
+
+
+class GroupLimiter:
+    """Concurrency limit of one route group with a bounded wait queue"""
+
+    def __init__(self, group: RouteGroup):
+        self.group = group
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "timeout": 0}
+        self._semaphore = asyncio.Semaphore(group.max_concurrency)
+
+    async def acquire(self, timeout: float) -> None:
+        if self._semaphore.locked() and self.queued >= self.group.max_queue:
+            raise Rejected("queue_full")
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise Rejected("timeout")
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class PriorityGate:
+    """
+    Slots of the database pool shared by all groups, granted by priority.
+
+    A priority may only fill its share of the slots, so low-priority work
+    leaves room for payments however much of it arrives. Waiting requests
+    are served highest priority first, then in arrival order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self.waiting: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    def limit(self, priority: Priority) -> int:
+        return max(1, int(self.capacity * PRIORITY_SHARES[priority]))
+
+    def _may_enter(self, priority: Priority) -> bool:
+        ahead = sum(count for waiting, count in self.waiting.items() if waiting <= priority)
+        return not ahead and self.in_use < self.limit(priority)
+
+    async def acquire(self, priority: Priority, timeout: float) -> None:
+        if self._may_enter(priority):
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.waiting[priority] += 1
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise Rejected("timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the request went away
+                self.release()
+            raise
+        finally:
+            self.waiting[priority] -= 1
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_use >= self.limit(priority):
+                # Later waiters have no larger share
+                return
+            heapq.heappop(self._waiters)
+            self.in_use += 1
+            future.set_result(None)
+
+
+class AdmissionController:
+    def __init__(self, capacity: int, queue_timeout: float):
+        self.queue_timeout = queue_timeout
+        self.gate = PriorityGate(capacity)
+        self.limiters = {group.name: GroupLimiter(group) for group in ROUTE_GROUPS}
+
+    async def admit(self, group: RouteGroup) -> None:
+        """Take a group slot and a database slot, or raise Rejected"""
+        limiter = self.limiters[group.name]
+        deadline = time.monotonic() + self.queue_timeout
+        try:
+            await limiter.acquire(self.queue_timeout)
+        except Rejected as e:
+            limiter.rejected[e.reason] += 1
+            raise
+        try:
+            await self.gate.acquire(group.priority, max(0.0, deadline - time.monotonic()))
+        except BaseException as e:
+            limiter.release()
+            if isinstance(e, Rejected):
+                limiter.rejected[e.reason] += 1
+            raise
+        limiter.admitted += 1
+
+    def leave(self, group: RouteGroup) -> None:
+        self.gate.release()
+        self.limiters[group.name].release()
+
+    def render_metrics(self) -> str:
+        """Limits, in-flight requests and queue depths in the Prometheus text format"""
+        limiters = self.limiters.values()
+        priorities = [(priority, f'priority="{priority.name.lower()}"') for priority in Priority]
+        lines: List[str] = []
+        _metric(lines, "admission_group_limit", "gauge", "Requests of the route group allowed to run at once",
+                [(f'group="{l.group.name}"', l.group.max_concurrency) for l in limiters])
+        _metric(lines, "admission_group_in_flight", "gauge", "Requests of the route group running",
+                [(f'group="{l.group.name}"', l.in_flight) for l in limiters])
+        _metric(lines, "admission_group_queue_limit", "gauge", "Requests of the route group allowed to wait",
+                [(f'group="{l.group.name}"', l.group.max_queue) for l in limiters])
+        _metric(lines, "admission_group_queue_depth", "gauge", "Requests of the route group waiting for a slot",
+                [(f'group="{l.group.name}"', l.queued) for l in limiters])
+        _metric(lines, "admission_admitted_total", "counter", "Requests admitted",
+                [(f'group="{l.group.name}"', l.admitted) for l in limiters])
+        _metric(lines, "admission_rejected_total", "counter", "Requests refused with 503",
+                [(f'group="{l.group.name}",reason="{reason}"', count) for l in limiters for reason, count in l.rejected.items()])
+        _metric(lines, "admission_db_slots", "gauge", "Database slots shared by all route groups",
+                [("", self.gate.capacity)])
+        _metric(lines, "admission_db_slots_in_use", "gauge", "Database slots held by running requests",
+                [("", self.gate.in_use)])
+        _metric(lines, "admission_priority_limit", "gauge", "Database slots a priority class may hold",
+                [(labels, self.gate.limit(priority)) for priority, labels in priorities])
+        _metric(lines, "admission_priority_queue_depth", "gauge", "Requests waiting for a database slot",
+                [(labels, self.gate.waiting[priority]) for priority, labels in priorities])
+        return "\n".join(lines) + "\n"
+
+
+def _metric(lines: List[str], name: str, kind: str, help: str, samples: List[Tuple[str, int]]) -> None:
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.extend(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in samples)
+
+
+class AdmissionMiddleware:
+    """
+    Admission control in front of the routes.
+
+    Each request takes a slot of its route group and then one of the
+    database slots, waiting at most the queue timeout. A request whose
+    group queue is full, or that waits too long, gets an immediate 503
+    with Retry-After instead of piling onto the connection pool. Slots are
+    held until the response, streamed or not, has been sent. The operations
+    of a batch come through here one by one and are admitted like any
+    other request.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.admit(group)
+        except Rejected as e:
+            await self._reject(send, group, e.reason)
+            return
+
+        scope["admission_group"] = group.name
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.leave(group)
+
+    @staticmethod
+    async def _reject(send: Send, group: RouteGroup, reason: str) -> None:
+        body = json.dumps({"detail": f"Server busy ({group.name}: {reason.replace('_', ' ')}), retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(group.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
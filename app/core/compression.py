@@ -0,0 +1,215 @@
+import gzip
+import os
+import stat
+import zlib
+from mimetypes import guess_type
+from typing import Dict, List, Optional, Set
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Content types worth compressing, everything else (images, fonts, archives) is sent as is
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# Bodies up to this size are compressed on the event loop, larger ones in a worker thread
+INLINE_COMPRESSION_LIMIT = 16 * 1024
+
+# Static file types that get precompressed siblings
+PRECOMPRESSED_EXTENSIONS = (".js", ".css", ".map", ".svg", ".json", ".html", ".txt", ".ttf", ".eot")
+
+
+def parse_accept_encoding(accept_encoding: str) -> Set[str]:
+    """Content codings an Accept-Encoding header allows, ignoring those with q=0"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Encodings we can produce that the client accepts, preferred first"""
+    accepted = parse_accept_encoding(accept_encoding)
+    offered = (["br"] if brotli is not None else []) + ["gzip"]
+    return [coding for coding in offered if coding in accepted]
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=min(level, 9), mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for responses sent in several body messages"""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=min(level, 11))
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._add = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(min(level, 9), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._add = self._compressor.compress
+
+    def add(self, chunk: bytes, last: bool) -> bytes:
+        data = self._add(chunk)
+        # Flush every chunk so streamed rows reach the client without waiting for a full block
+        return data + (self._finish() if last else self._flush())
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression of dynamic responses.
+
+    Responses smaller than `minimum_size`, already encoded or of a type
+    that does not compress are passed through. Large bodies are compressed
+    in a worker thread so the event loop keeps serving other requests;
+    streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 5, exclude_paths=("/static",)):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if not encodings:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encodings[0], self.minimum_size, self.level)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, level: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or message["status"] in (204, 304)
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+
+        if self.stream is not None:
+            await self._send({**message, "body": self.stream.add(body, not more_body)})
+            return
+
+        if not more_body:
+            # Whole body in one message: compress at once if it is worth it
+            if len(body) < self.minimum_size:
+                await self._send(self.start)
+                await self._send(message)
+                return
+            if len(body) > INLINE_COMPRESSION_LIMIT:
+                compressed = await anyio.to_thread.run_sync(compress, body, self.encoding, self.level)
+            else:
+                compressed = compress(body, self.encoding, self.level)
+            await self._send(self._encoded_start(len(compressed)))
+            await self._send({**message, "body": compressed})
+            return
+
+        # First chunk of a streamed body
+        self.stream = _StreamCompressor(self.encoding, self.level)
+        await self._send(self._encoded_start(None))
+        await self._send({**message, "body": self.stream.add(body, False)})
+
+    def _encoded_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # A strong ETag identifies the uncompressed bytes
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return {**self.start, "headers": headers.raw}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Static files that serve a .br or .gz sibling when the client accepts it.
+
+    The siblings are generated at build time by app.utils.precompress; files
+    without them are served uncompressed as before.
+    """
+
+    SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            request_headers = Headers(scope=scope)
+            accepted = parse_accept_encoding(request_headers.get("accept-encoding", ""))
+            for encoding in ("br", "gzip"):
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + self.SUFFIXES[encoding]
+                )
+                if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                    continue
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=guess_type(os.path.basename(path))[0] or "text/plain",
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = await super().get_response(path, scope)
+        if path.endswith(PRECOMPRESSED_EXTENSIONS):
+            response.headers.add_vary_header("Accept-Encoding")
+        return response
@@ -0,0 +1,81 @@
+import hashlib
+from typing import Any, Iterable, Type
+
+from fastapi import HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import TableBase
+from app.models.table_version import TableVersion
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the parts that determine a representation"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def check_etag(request: Request, etag: str) -> None:
+    """
+    Answer 304 if the client already has this representation.
+
+    Otherwise the ETag is left on request.state, where FastJSONRoute adds it
+    to the response together with Cache-Control: no-cache.
+    """
+    request.state.etag = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+async def _table_versions(db: AsyncSession, models: Iterable[Type[TableBase]]) -> list:
+    names = sorted(model.__tablename__ for model in models)
+    if not names:
+        return []
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version)
+        .where(TableVersion.table_name.in_(names))
+        .order_by(TableVersion.table_name)
+    )
+    return [f"{name}:{version}" for name, version in result.all()]
+
+
+async def check_entity_etag(
+        request: Request,
+        db: AsyncSession,
+        model: Type[TableBase],
+        id: int,
+        related: Iterable[Type[TableBase]] = ()
+) -> None:
+    """
+    Conditional GET of one row, versioned by its updated_at; no-op if the row is missing.
+
+    Related models embedded in the response add their table's change counter.
+    """
+    result = await db.execute(select(model.updated_at).where(model.id == id))
+    updated_at = result.scalar_one_or_none()
+    if updated_at is not None:
+        versions = await _table_versions(db, related)
+        check_etag(request, make_etag(model.__tablename__, id, updated_at.isoformat(), *versions, request.url.query))
+
+
+async def check_list_etag(
+        request: Request,
+        db: AsyncSession,
+        model: Type[TableBase],
+        related: Iterable[Type[TableBase]] = ()
+) -> None:
+    """Conditional GET of a list, versioned by the change counters of its tables and the query string"""
+    versions = await _table_versions(db, {model, *related})
+    if any(version.startswith(f"{model.__tablename__}:") for version in versions):
+        check_etag(request, make_etag(model.__tablename__, *versions, request.url.query))
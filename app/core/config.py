@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
@@ -11,11 +11,60 @@ class Settings(BaseSettings):
 
     ALLOWED_ORIGINS: List[str] = ["*"]
 
+    # Production server, see app.server
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Worker processes, one per available core when unset
+    WEB_CONCURRENCY: Optional[int] = None
+    # Seconds an idle keep-alive connection stays open, longer than a load balancer's idle timeout
+    SERVER_KEEPALIVE: int = 75
+    # Pending connections the kernel queues while all workers are busy
+    SERVER_BACKLOG: int = 2048
+    # Seconds workers get to finish in-flight requests on shutdown
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    # Seconds a silent worker is given before it is restarted
+    SERVER_WORKER_TIMEOUT: int = 60
+    # Requests a worker serves before it is replaced, 0 to never replace it
+    SERVER_MAX_REQUESTS: int = 10000
+
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_SERVER: str
     POSTGRES_DB: str
 
+    # Connection pool of each worker
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+
+    # Per route group concurrency limits in front of the pool, see app.core.admission
+    ADMISSION_ENABLED: bool = True
+    # Longest a request waits for a slot before it is refused with 503
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+
+    DEBTORS_REPORT_CACHE_SECONDS: int = 300
+
+    # Identical concurrent GETs share one computation, see app.core.single_flight
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Cache of GET responses for buildings, floors, units, owners and tenants. Unset, it is on
+    # when RESPONSE_CACHE_REDIS_URL is set: without Redis every worker caches on its own and
+    # misses the writes of the others. True caches in process too, for a single worker.
+    RESPONSE_CACHE_ENABLED: Optional[bool] = None
+    # Entries kept in each worker's LRU tier
+    RESPONSE_CACHE_SIZE: int = 2048
+    # Upper bound on an entry's life, for changes made outside the CRUD layer
+    RESPONSE_CACHE_SECONDS: int = 300
+    # Redis shared by all workers, e.g. redis://cache:6379/0; in-process only when unset
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # brotli quality / gzip level of dynamic responses, static files are compressed at build time
+    COMPRESSION_LEVEL: int = 5
+
+    # Default format of transaction numbers, buildings can override it
+    TRANSACTION_NUMBER_FORMAT: str = "{prefix}-{year}-{number:08d}"
+
     @property
     def async_database_url(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
@@ -108,6 +108,20 @@ class MaintenanceException(BusinessLogicException):
             metadata=metadata
         )
 
+class InsufficientFundsException(BusinessLogicException):
+    """Exception raised when a fund cannot cover a debit"""
+    def __init__(
+        self,
+        required: float,
+        available: float,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            detail=f"Insufficient funds: required {required}, available {available}",
+            code="INSUFFICIENT_FUNDS",
+            metadata={"required": required, "available": available, **(metadata or {})}
+        )
+
 # Permission Exceptions
 class PermissionDeniedException(BuildingManagementException):
     """Exception raised when user doesn't have required permissions"""
@@ -0,0 +1,355 @@
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Type
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.conditional import etag_matches
+from app.models import Building, Floor, Owner, Tenant, Unit
+from app.models.base import TableBase
+from app.utils.expand import expanded_models, parse_expand
+from app.core.config import settings
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # in-process tier only
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Resources whose reads are cached; their writes all go through CRUDBase
+CACHED_RESOURCES: Dict[str, Type[TableBase]] = {
+    "buildings": Building,
+    "floors": Floor,
+    "units": Unit,
+    "owners": Owner,
+    "tenants": Tenant,
+}
+
+# Models whose rows belong to one building and bump its building tag
+BUILDING_SCOPED = {Building, Floor, Unit, Tenant}
+
+# Responses larger than this are not cached
+MAX_CACHED_BODY = 1024 * 1024
+
+# Session.info key under which a batch collects tags to invalidate once it commits
+DEFERRED_TAGS = "deferred_cache_tags"
+
+REDIS_PREFIX = "response-cache:"
+
+
+def table_tag(model: Type[TableBase]) -> str:
+    return model.__tablename__
+
+
+def entity_tag(model: Type[TableBase], id: Any) -> str:
+    return f"{model.__tablename__}:{id}"
+
+
+def building_tag(building_id: Any) -> str:
+    return f"building:{building_id}"
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    versions: Tuple[int, ...]
+    expires_at: float
+
+    def dumps(self) -> str:
+        return json.dumps({
+            "status": self.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+            "body": base64.b64encode(self.body).decode(),
+            "versions": self.versions,
+            "expires_at": self.expires_at,
+        })
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(
+            status=data["status"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in data["headers"]],
+            body=base64.b64decode(data["body"]),
+            versions=tuple(data["versions"]),
+            expires_at=data["expires_at"],
+        )
+
+
+class ResponseCache:
+    """
+    Two-tier cache of encoded responses, invalidated by tags.
+
+    Every tag has a version that invalidation increments. An entry records
+    the versions of its tags from before its response was produced and is
+    only served while they are unchanged, so a read racing a write can never
+    store a stale response for good. The versions live in Redis when a URL
+    is configured, which keeps every worker's LRU tier coherent at the cost
+    of one MGET per lookup; Redis also holds a shared copy of the entries.
+    Without Redis both live in the process, which is only coherent with a
+    single worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, redis_url: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._redis = None
+        if redis_url:
+            if aioredis is None:
+                logger.warning("RESPONSE_CACHE_REDIS_URL is set but redis is not installed, the cache is not shared")
+            else:
+                self._redis = aioredis.from_url(redis_url)
+
+    @property
+    def shared(self) -> bool:
+        """Whether all workers see the same entries and invalidations"""
+        return self._redis is not None
+
+    async def versions(self, tags: Tuple[str, ...]) -> Optional[Tuple[int, ...]]:
+        """Current versions of the tags, or None when they cannot be read"""
+        if self._redis is None:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+        try:
+            values = await self._redis.mget([f"{REDIS_PREFIX}tag:{tag}" for tag in tags])
+        except Exception as e:
+            logger.warning(f"Response cache tag lookup failed: {e}")
+            return None
+        return tuple(int(value or 0) for value in values)
+
+    async def get(self, key: str, versions: Tuple[int, ...]) -> Optional[CachedResponse]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.versions == versions and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(f"{REDIS_PREFIX}entry:{key}")
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+        if raw is None:
+            return None
+        entry = CachedResponse.loads(raw)
+        if entry.versions != versions or entry.expires_at <= now:
+            return None
+        self._store_local(key, entry)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        self._store_local(key, entry)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(f"{REDIS_PREFIX}entry:{key}", entry.dumps(), ex=max(1, int(self.ttl)))
+        except Exception as e:
+            logger.warning(f"Response cache store failed: {e}")
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, *tags: str) -> None:
+        """Bump the versions of the tags, which retires every entry depending on them"""
+        if not tags:
+            return
+        if self._redis is None:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(f"{REDIS_PREFIX}tag:{tag}")
+                await pipe.execute()
+        except Exception as e:
+            # Other workers serve these entries until they expire
+            logger.error(f"Response cache invalidation of {', '.join(tags)} failed: {e}")
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_SECONDS,
+    redis_url=settings.RESPONSE_CACHE_REDIS_URL
+)
+
+
+async def mutation_tags(db: AsyncSession, obj: Any) -> Set[str]:
+    """
+    Tags a change to this row invalidates: its table's lists, the row
+    itself and, for rows inside a building, the building's expanded tree.
+    """
+    model = type(obj)
+    if getattr(obj, "id", None) is None:
+        return {table_tag(model)}
+    tags = {table_tag(model), entity_tag(model, obj.id)}
+    if model not in BUILDING_SCOPED:
+        return tags
+
+    if model is Building:
+        building_id = obj.id
+    elif model is Floor:
+        building_id = obj.building_id
+    elif model is Unit:
+        result = await db.execute(select(Floor.building_id).where(Floor.id == obj.floor_id))
+        building_id = result.scalar_one_or_none()
+    else:
+        result = await db.execute(
+            select(Floor.building_id).join(Unit, Unit.floor_id == Floor.id).where(Unit.id == obj.unit_id)
+        )
+        building_id = result.scalar_one_or_none()
+    if building_id is not None:
+        tags.add(building_tag(building_id))
+    return tags
+
+
+async def invalidate(db: AsyncSession, tags: Iterable[str]) -> None:
+    """Invalidate now, or when the batch owning the session commits"""
+    deferred = db.info.get(DEFERRED_TAGS)
+    if deferred is not None:
+        deferred.update(tags)
+        return
+    await response_cache.invalidate(*tags)
+
+
+def request_tags(path: str, query: str) -> Optional[Tuple[str, ...]]:
+    """
+    Tags a cached GET depends on, or None if it is not cached.
+
+    Lists depend on their table, a row on itself. Expanded relationships add
+    their tables, except under a single building, whose tree its building
+    tag covers.
+    """
+    if not path.startswith(f"{settings.API_V1_STR}/"):
+        return None
+    segments = path[len(settings.API_V1_STR):].strip("/").split("/")
+    model = CACHED_RESOURCES.get(segments[0])
+    if model is None or len(segments) > 2:
+        return None
+
+    try:
+        tree = parse_expand(model, dict(parse_qsl(query)).get("expand"))
+    except HTTPException:
+        return None
+    related = expanded_models(model, tree)
+
+    if len(segments) == 1 or segments[1] == "deleted":
+        tags = {table_tag(model)}
+    elif segments[1].isdigit():
+        tags = {entity_tag(model, segments[1])}
+        if model is Building and related:
+            tags.add(building_tag(segments[1]))
+            related -= BUILDING_SCOPED
+    else:
+        return None
+    tags |= {table_tag(other) for other in related}
+    return tuple(sorted(tags))
+
+
+def cache_key(path: str, query: str) -> str:
+    return f"{path}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves repeated GETs of cached resources from the response cache.
+
+    Only complete 200 JSON responses are stored. A cached response whose
+    ETag matches If-None-Match is answered with 304.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        tags = request_tags(scope["path"], query)
+        versions = await self.cache.versions(tags) if tags else None
+        if versions is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope["path"], query)
+        entry = await self.cache.get(key, versions)
+        if entry is not None:
+            await self._send_cached(scope, send, entry)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        cacheable = True
+
+        async def capture(message: Message) -> None:
+            nonlocal start, cacheable
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message["headers"])
+                cacheable = (
+                    message["status"] == 200
+                    and headers.get("content-type", "").startswith("application/json")
+                    and "no-store" not in headers.get("cache-control", "")
+                )
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers["X-Cache"] = "MISS"
+                message = {**message, "headers": headers.raw}
+            elif message["type"] == "http.response.body" and cacheable:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False) or sum(map(len, chunks)) > MAX_CACHED_BODY:
+                    cacheable = False
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+        if start is not None and cacheable:
+            headers = [(name, value) for name, value in start["headers"] if name.lower() != b"x-cache"]
+            await self.cache.set(key, CachedResponse(
+                status=start["status"],
+                headers=headers,
+                body=b"".join(chunks),
+                versions=versions,
+                expires_at=time.time() + self.cache.ttl,
+            ))
+
+    @staticmethod
+    async def _send_cached(scope: Scope, send: Send, entry: CachedResponse) -> None:
+        headers = MutableHeaders(raw=list(entry.headers))
+        headers["X-Cache"] = "HIT"
+        etag = headers.get("etag")
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if etag and if_none_match and etag_matches(if_none_match, etag):
+            not_modified = MutableHeaders(raw=[])
+            for name in ("etag", "cache-control", "x-cache"):
+                if name in headers:
+                    not_modified[name] = headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": entry.body})
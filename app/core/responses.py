@@ -0,0 +1,209 @@
+import collections.abc
+import functools
+import inspect
+import typing
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple, Type
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined, to_json
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded by pydantic-core instead of json.dumps.
+
+    Content that is already encoded (bytes) is sent as is, which is how
+    ORMSerializer output reaches the client without a second pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def _is_subclass(value: Any, kind: Any) -> bool:
+    """issubclass that is False for anything but a class, such as List[int]"""
+    return isinstance(value, type) and issubclass(value, kind)
+
+
+def _is_flat(annotation: Any) -> bool:
+    """Whether a field type holds no nested models, so attribute values can be encoded directly"""
+    if _is_subclass(annotation, BaseModel):
+        return False
+    return all(_is_flat(arg) for arg in typing.get_args(annotation))
+
+
+def _mentions(annotation: Any, kind: type) -> bool:
+    if _is_subclass(annotation, kind):
+        return True
+    return any(_mentions(arg, kind) for arg in typing.get_args(annotation))
+
+
+def _is_orm_row(value: Any) -> bool:
+    return hasattr(value, "_sa_instance_state")
+
+
+class ORMSerializer:
+    """
+    Precompiled encoder of trusted ORM rows into a response schema's JSON.
+
+    Rows loaded from the database already satisfy the schema, so instead of
+    validating each one into a schema instance the fields are read with one
+    attrgetter per ORM class and the dicts encoded by pydantic-core. Fields
+    the ORM class lacks get the schema default, as from_attributes would.
+    Datetimes use isoformat(), like the json_encoders of our schemas.
+    Schemas with validators, which may rewrite or reject values, are not
+    supported.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self._fields = [
+            (name, field.serialization_alias or field.alias or name, field)
+            for name, field in schema.model_fields.items()
+        ]
+        self._datetimes = {
+            key for name, key, field in self._fields if _mentions(field.annotation, datetime)
+        }
+        self._compiled: Dict[type, Tuple[Callable[[Any], Any], Tuple[str, ...], Tuple]] = {}
+
+    @classmethod
+    def supports(cls, schema: Any) -> bool:
+        if not _is_subclass(schema, BaseModel):
+            return False
+        decorators = schema.__pydantic_decorators__
+        return (
+            not schema.model_computed_fields
+            and not decorators.validators
+            and not decorators.field_validators
+            and not decorators.root_validators
+            and not decorators.model_validators
+            and not decorators.field_serializers
+            and not decorators.model_serializers
+            and all(_is_flat(field.annotation) for field in schema.model_fields.values())
+        )
+
+    def _compile(self, orm_class: type):
+        present = [(name, key) for name, key, _ in self._fields if hasattr(orm_class, name)]
+        missing = [(key, field) for name, key, field in self._fields if not hasattr(orm_class, name)]
+        names = [name for name, _ in present]
+        if len(names) == 1:
+            getter = attrgetter(names[0])
+            read = lambda row: (getter(row),)  # noqa: E731
+        else:
+            read = attrgetter(*names) if names else (lambda row: ())
+        compiled = (read, tuple(key for _, key in present), tuple(missing))
+        self._compiled[orm_class] = compiled
+        return compiled
+
+    def row(self, obj: Any) -> Dict[str, Any]:
+        compiled = self._compiled.get(type(obj)) or self._compile(type(obj))
+        read, keys, missing = compiled
+        data = dict(zip(keys, read(obj)))
+        for key, field in missing:
+            default = field.get_default(call_default_factory=True)
+            data[key] = None if default is PydanticUndefined else default
+        for key in self._datetimes:
+            value = data.get(key)
+            if isinstance(value, datetime):
+                data[key] = value.isoformat()
+        return data
+
+    def encode(self, content: Any) -> bytes:
+        if isinstance(content, (list, tuple)):
+            return to_json([self.row(obj) for obj in content])
+        return to_json(self.row(content))
+
+
+@functools.lru_cache(maxsize=None)
+def serializer_for(response_model: Any) -> Optional[Tuple[ORMSerializer, bool]]:
+    """Serializer and whether it encodes a list, or None if the model needs validation"""
+    many = typing.get_origin(response_model) in (list, tuple, collections.abc.Sequence)
+    if typing.get_origin(response_model) is not None:
+        args = typing.get_args(response_model)
+        if not many or len(args) != 1:
+            return None
+        response_model = args[0]
+    if not ORMSerializer.supports(response_model):
+        return None
+    return ORMSerializer(response_model), many
+
+
+def _accepts(content: Any, many: bool) -> bool:
+    if many:
+        return isinstance(content, (list, tuple)) and all(_is_orm_row(obj) for obj in content)
+    return _is_orm_row(content)
+
+
+# Route options that change how the response model is dumped
+_DUMP_OPTIONS = (
+    "response_model_include",
+    "response_model_exclude",
+    "response_model_exclude_unset",
+    "response_model_exclude_defaults",
+    "response_model_exclude_none",
+)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that encodes ORM results with a precompiled ORMSerializer.
+
+    Applies to async endpoints whose response model is a flat schema or a
+    list of one. Anything else the endpoint returns, such as dicts or schema
+    instances, goes through FastAPI's usual validation. ETags checked by the
+    endpoint are added to its response.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get("response_model", Default(None))
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = inspect.signature(endpoint).return_annotation
+            if response_model is inspect.Signature.empty or _is_subclass(response_model, Response):
+                response_model = None
+
+        serializer = serializer_for(response_model) if response_model is not None else None
+        if (
+                serializer is not None
+                and inspect.iscoroutinefunction(endpoint)
+                and not any(kwargs.get(option) for option in _DUMP_OPTIONS)
+        ):
+            wrapped = self._trusted(endpoint, *serializer, kwargs.get("status_code"))
+            super().__init__(path, wrapped, **kwargs)
+            # include_router rebuilds routes from .endpoint, which must not be wrapped twice
+            self.endpoint = endpoint
+        else:
+            super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            # Set by app.core.conditional when the endpoint checked an ETag
+            etag = getattr(request.state, "etag", None)
+            if etag and response.status_code == 200 and "etag" not in response.headers:
+                response.headers["ETag"] = etag
+                response.headers.setdefault("Cache-Control", "no-cache")
+            return response
+
+        return route_handler
+
+    @staticmethod
+    def _trusted(endpoint: Callable[..., Any], serializer: ORMSerializer, many: bool, status_code: Optional[int]):
+        @functools.wraps(endpoint)
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            content = await endpoint(*args, **kwargs)
+            if _accepts(content, many):
+                return FastJSONResponse(serializer.encode(content), status_code=status_code or 200)
+            return content
+
+        return run
@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Request headers that change the response or whose user it is for
+KEY_HEADERS = ("authorization", "cookie", "accept", "if-none-match", "range")
+
+# Largest response shared with waiting requests; they run on their own past it
+MAX_SHARED_BODY = 4 * 1024 * 1024
+
+# Methods that do not write
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Paths never coalesced: static files, probes and long streamed exports
+EXCLUDED_PREFIXES = ("/static", "/health", "/metrics")
+EXCLUDED_SUFFIXES = ("/export",)
+
+
+def flight_key(scope: Scope) -> str:
+    """Route, normalized query and the hashed headers scoping the response to a user"""
+    query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+    headers = Headers(scope=scope)
+    scope_digest = hashlib.sha1(
+        "\n".join(headers.get(name, "") for name in KEY_HEADERS).encode("latin-1", "replace")
+    ).hexdigest()
+    return f"{scope['path']}?{query}#{scope_digest}"
+
+
+class _Flight:
+    def __init__(self, writes: int):
+        self.done = asyncio.Event()
+        # Write events seen when the leader started
+        self.writes = writes
+        self.followers = 0
+        # Start message and body of the leader's response, None if it cannot be shared
+        self.response: Optional[Tuple[Message, List[bytes]]] = None
+
+
+class SingleFlightMiddleware:
+    """
+    Coalesces identical concurrent GETs into one computation.
+
+    The first request for a key runs the application; requests for the same
+    key arriving while it runs wait for it and are sent a copy of its
+    response. A burst of dashboard loads thus runs its queries once. The
+    result is never kept after the leader finishes, but a follower may get
+    a response whose reads began before it arrived. It therefore only joins
+    a leader if no write has run through this worker since the leader
+    started, and otherwise leads a new flight, so writes made through this
+    worker are never missed. One made through another worker can be, by at
+    most one leader's duration. When the leader fails, is cancelled or
+    streams more than MAX_SHARED_BODY, the waiting requests run on their
+    own.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._flights: Dict[str, _Flight] = {}
+        # Starts and ends of writes, counted so followers can tell whether one overlapped a flight
+        self._writes = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] not in SAFE_METHODS:
+            self._writes += 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self._writes += 1
+            return
+
+        path = scope.get("path", "")
+        if (
+                scope["type"] != "http"
+                or scope["method"] != "GET"
+                or path.startswith(EXCLUDED_PREFIXES)
+                or path.endswith(EXCLUDED_SUFFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = flight_key(scope)
+        flight = self._flights.get(key)
+        if flight is not None and flight.writes == self._writes:
+            flight.followers += 1
+            await flight.done.wait()
+            if flight.response is None:
+                await self.app(scope, receive, send)
+                return
+            start, chunks = flight.response
+            await send(start)
+            await send({"type": "http.response.body", "body": b"".join(chunks)})
+            return
+
+        flight = self._flights[key] = _Flight(self._writes)
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+        shareable = True
+
+        async def capture(message: Message) -> None:
+            nonlocal start, size, shareable
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body" and shareable:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > MAX_SHARED_BODY:
+                    shareable = False
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+            if shareable and start is not None and flight.followers:
+                flight.response = (start, chunks)
+        finally:
+            # A later leader may have taken over the key after a write
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.done.set()
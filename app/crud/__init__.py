@@ -1,9 +1,9 @@
-from crud.building import CRUDBuilding
-from crud.floor import CRUDFloor
-from crud.owner import CRUDOwner
-from crud.tenant import CRUDTenant
-from crud.unit import CRUDUnit
-from models import Building, Floor, Owner, Tenant, Unit
+from app.crud.building import CRUDBuilding
+from app.crud.floor import CRUDFloor
+from app.crud.owner import CRUDOwner
+from app.crud.tenant import CRUDTenant
+from app.crud.unit import CRUDUnit
+from app.models import Building, Floor, Owner, Tenant, Unit
 
 crud_building = CRUDBuilding(Building)
 crud_floor = CRUDFloor(Floor)
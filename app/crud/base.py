@@ -1,9 +1,10 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.response_cache import invalidate, mutation_tags
 from app.models.base import TableBase
 
 ModelType = TypeVar("ModelType", bound=TableBase)
@@ -23,12 +24,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def get(
             self,
             db: AsyncSession,
-            id: Any
+            id: Any,
+            *,
+            options: Sequence[Any] = ()
     ) -> Optional[ModelType]:
         """
-        Get a record by ID.
+        Get a record by ID, with optional loader options.
         """
-        query = select(self.model).filter(self.model.id == id)
+        query = select(self.model).options(*options).filter(self.model.id == id)
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
@@ -37,12 +40,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db: AsyncSession,
             *,
             skip: int = 0,
-            limit: int = 100
+            limit: int = 100,
+            options: Sequence[Any] = ()
     ) -> List[ModelType]:
         """
-        Get multiple records.
+        Get multiple records, with optional loader options.
         """
-        query = select(self.model).offset(skip).limit(limit)
+        query = select(self.model).options(*options).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -69,6 +73,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, await mutation_tags(db, db_obj))
         return db_obj
 
     async def update(
@@ -82,6 +87,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Update existing record.
         """
         obj_data = db_obj.__dict__
+        # The row may move to another building, whose cached trees change too
+        tags = await mutation_tags(db, db_obj)
 
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -99,6 +106,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, tags | await mutation_tags(db, db_obj))
         return db_obj
 
     async def delete(
@@ -118,6 +126,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, await mutation_tags(db, db_obj))
         return db_obj
 
     async def restore(
@@ -138,6 +147,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, await mutation_tags(db, db_obj))
         return db_obj
 
     async def hard_delete(
@@ -149,8 +159,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Hard delete record.
         """
+        tags = await mutation_tags(db, db_obj)
         await db.delete(db_obj)
         await db.commit()
+        await invalidate(db, tags)
 
     async def count(
             self,
@@ -1,9 +1,10 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from datetime import datetime, timezone
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.response_cache import invalidate, mutation_tags
 from app.crud.base import CRUDBase
 from app.models.building import Building
 from app.schemas.building import BuildingCreate, BuildingUpdate
@@ -33,6 +34,7 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
             name=obj_in.name,
             total_floors=obj_in.total_floors,
             description=obj_in.description,
+            transaction_number_format=obj_in.transaction_number_format,
             created_at=current_time,
             created_by=created_by,
             updated_at=current_time,
@@ -73,7 +75,8 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
             *,
             skip: int = 0,
             limit: int = 100,
-            status: Optional[str] = None
+            status: Optional[str] = None,
+            options: Sequence[Any] = ()
     ) -> List[Building]:
         """
         Get multiple buildings with optional filtering.
@@ -83,11 +86,12 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
             skip: Number of records to skip
             limit: Maximum number of records to return
             status: Optional status filter
+            options: Loader options, e.g. relationships to eager load
 
         Returns:
             List of building instances
         """
-        query = select(Building)
+        query = select(Building).options(*options)
         if status:
             query = query.filter(Building.status == status)
         query = query.offset(skip).limit(limit)
@@ -166,6 +170,7 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
 
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, await mutation_tags(db, db_obj))
         return db_obj
 
     async def restore(
@@ -198,6 +203,7 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
 
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate(db, await mutation_tags(db, db_obj))
         return db_obj
 
     from sqlalchemy import and_
@@ -246,5 +252,7 @@ class CRUDBuilding(CRUDBase[Building, BuildingCreate, BuildingUpdate]):
             db: Database session
             db_obj: Building instance to permanently delete
         """
+        tags = await mutation_tags(db, db_obj)
         await db.delete(db_obj)
-        await db.commit()
\ No newline at end of file
+        await db.commit()
+        await invalidate(db, tags)
\ No newline at end of file
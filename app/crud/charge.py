@@ -1,21 +1,33 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc, Date
+from sqlalchemy import select, and_, or_, func, desc, bindparam, Date
 from sqlalchemy.orm import joinedload
-from datetime import datetime, UTC, date
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from itertools import islice
 import logging
 
-from app.models.charge import Charge
+from app.models.charge import Charge, Payment, ChargeFrequency
 from app.models.transaction import Transaction
 from app.models.fund import Fund
+from app.models.ledger import LedgerAccountType
 from app.schemas.charge import (
     ChargeCreate,
     ChargeUpdate,
     ChargeFilter,
     ChargeStatus,
-    ChargeStatistics
+    ChargeStatistics,
+    AccountPaymentCreate,
+    AccountPaymentResponse,
+    PaymentAllocation,
+    ChargeOccurrence,
+    ChargeMaterializeResult
 )
-from core.exceptions import (
+from app.crud.ledger import account_clause, invalidate_balances
+from app.utils.helpers import to_naive_utc, utc_now
+from app.utils.schedule import iter_occurrences
+from app.core.exceptions import (
     ResourceNotFoundException,
     BusinessLogicException,
     DatabaseOperationException,
@@ -24,6 +36,36 @@ from core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+CENT = Decimal("0.01")
+
+# Rows per multi-row INSERT when materializing recurring charges
+MATERIALIZE_BATCH_SIZE = 1000
+
+# Charge columns that change its ledger entry
+LEDGER_FIELDS = {"amount", "tax_rate", "is_taxable", "due_date", "status", "unit_id", "owner_id"}
+
+# Charges that can still receive payments
+OPEN_CHARGE_STATUSES = (
+    ChargeStatus.PENDING,
+    ChargeStatus.OVERDUE,
+    ChargeStatus.PARTIALLY_PAID,
+)
+
+
+def open_charges_clause():
+    """
+    Filter for charges that still have a balance due.
+
+    Statuses are rendered as literals so the planner can match the
+    open-charge partial indexes even for prepared statements.
+    """
+    return and_(
+        Charge.deleted_at.is_(None),
+        Charge.status.in_(
+            bindparam("open_statuses", list(OPEN_CHARGE_STATUSES), expanding=True, literal_execute=True)
+        )
+    )
+
 
 class ChargeCRUD:
     def __init__(self, db_session: AsyncSession):
@@ -44,12 +86,18 @@ class ChargeCRUD:
 
         charge = Charge(
             **charge_data.dict(),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+            created_at=utc_now(),
+            updated_at=utc_now()
         )
 
         try:
             self.db.add(charge)
+            await invalidate_balances(
+                self.db,
+                since=charge.due_date,
+                unit_ids=[charge.unit_id],
+                owner_ids=[charge.owner_id]
+            )
             await self.db.commit()
             await self.db.refresh(charge)
 
@@ -89,7 +137,6 @@ class ChargeCRUD:
         query = (
             select(Charge)
             .options(
-                joinedload(Charge.transactions),
                 joinedload(Charge.unit),
                 joinedload(Charge.owner),
                 joinedload(Charge.tenant)
@@ -129,16 +176,19 @@ class ChargeCRUD:
         result = await self.db.execute(query)
         return result.scalars().all()
 
-    def _apply_filters(self, query, filters: ChargeFilter):
+    @staticmethod
+    def _apply_filters(query, filters: ChargeFilter):
         """Apply filters to the query"""
         if filters.status:
             query = query.where(Charge.status.in_(filters.status))
-        if filters.type:
-            query = query.where(Charge.type.in_(filters.type))
-        if filters.due_date_from:
-            query = query.where(Charge.due_date >= filters.due_date_from)
-        if filters.due_date_to:
-            query = query.where(Charge.due_date <= filters.due_date_to)
+        if filters.charge_type:
+            query = query.where(Charge.type.in_(filters.charge_type))
+        if filters.frequency:
+            query = query.where(Charge.frequency.in_(filters.frequency))
+        if filters.start_date_from:
+            query = query.where(Charge.due_date >= filters.start_date_from)
+        if filters.start_date_to:
+            query = query.where(Charge.due_date < filters.start_date_to + timedelta(days=1))
         if filters.min_amount:
             query = query.where(Charge.amount >= filters.min_amount)
         if filters.max_amount:
@@ -147,17 +197,37 @@ class ChargeCRUD:
             query = query.where(
                 and_(
                     Charge.due_date < date.today(),
-                    Charge.status != ChargeStatus.PAID
+                    Charge.status != ChargeStatus.PAID,
+                    Charge.balance_due > 0
                 )
             )
+        if filters.building_id:
+            query = query.where(Charge.building_id == filters.building_id)
+        if filters.min_balance_due is not None:
+            query = query.where(Charge.balance_due >= filters.min_balance_due)
+        if filters.max_balance_due is not None:
+            query = query.where(Charge.balance_due <= filters.max_balance_due)
+        if filters.has_balance_due is not None:
+            query = query.where(
+                Charge.balance_due > 0 if filters.has_balance_due else Charge.balance_due <= 0
+            )
         if filters.unit_id:
             query = query.where(Charge.unit_id == filters.unit_id)
         if filters.owner_id:
             query = query.where(Charge.owner_id == filters.owner_id)
         if filters.tenant_id:
             query = query.where(Charge.tenant_id == filters.tenant_id)
+        if filters.search:
+            pattern = f"%{filters.search}%"
+            query = query.where(or_(Charge.title.ilike(pattern), Charge.description.ilike(pattern)))
         return query
 
+    @classmethod
+    def export_query(cls, filters: ChargeFilter):
+        """All columns of the filtered charges in id order, for streaming exports"""
+        query = select(*Charge.__table__.columns).where(Charge.deleted_at.is_(None))
+        return cls._apply_filters(query, filters).order_by(Charge.id)
+
     @handle_exceptions
     async def update(
             self,
@@ -173,12 +243,21 @@ class ChargeCRUD:
             )
 
         update_data = charge_data.dict(exclude_unset=True)
+        due_date, unit_id, owner_id = charge.due_date, charge.unit_id, charge.owner_id
         for field, value in update_data.items():
             setattr(charge, field, value)
 
-        charge.updated_at = datetime.now(UTC)
+        charge.updated_at = utc_now()
 
         try:
+            if LEDGER_FIELDS.intersection(update_data):
+                # The entry may have moved to another date or account
+                await invalidate_balances(
+                    self.db,
+                    since=min(to_naive_utc(due_date), to_naive_utc(charge.due_date)),
+                    unit_ids=[unit_id, charge.unit_id],
+                    owner_ids=[owner_id, charge.owner_id]
+                )
             await self.db.commit()
             await self.db.refresh(charge)
             return charge
@@ -199,10 +278,16 @@ class ChargeCRUD:
                 detail="Cannot delete a paid charge"
             )
 
-        charge.deleted_at = datetime.now(UTC)
+        charge.deleted_at = utc_now()
         charge.status = ChargeStatus.CANCELLED
 
         try:
+            await invalidate_balances(
+                self.db,
+                since=charge.due_date,
+                unit_ids=[charge.unit_id],
+                owner_ids=[charge.owner_id]
+            )
             await self.db.commit()
             return True
         except Exception as e:
@@ -228,7 +313,7 @@ class ChargeCRUD:
                 detail="Charge is already paid"
             )
 
-        payment_date = payment_date or datetime.now(UTC)
+        payment_date = payment_date or utc_now()
 
         # Update charge
         charge.amount_paid += payment_amount
@@ -242,6 +327,12 @@ class ChargeCRUD:
             charge.status = ChargeStatus.PARTIALLY_PAID
 
         try:
+            await invalidate_balances(
+                self.db,
+                since=payment_date,
+                unit_ids=[charge.unit_id],
+                owner_ids=[charge.owner_id]
+            )
             await self.db.commit()
             await self.db.refresh(charge)
             return charge
@@ -252,6 +343,273 @@ class ChargeCRUD:
                 detail=str(e)
             )
 
+    @handle_exceptions
+    async def pay_account(
+            self,
+            payment_data: AccountPaymentCreate
+    ) -> AccountPaymentResponse:
+        """
+        Allocate a payment FIFO across the payer's open charges.
+
+        Open charges are locked oldest due date first with FOR UPDATE. A
+        concurrent payment for the same payer waits for the locks and then
+        sees the balances left by the first one, so charges are still paid
+        strictly oldest first and never allocated twice. All payment rows and
+        charge updates are committed together.
+        """
+        payment_date = to_naive_utc(payment_data.payment_date) if payment_data.payment_date else utc_now()
+        remaining = Decimal(str(payment_data.amount)).quantize(CENT)
+        if payment_data.unit_id is not None:
+            payer = account_clause(LedgerAccountType.UNIT, payment_data.unit_id)
+        else:
+            payer = account_clause(LedgerAccountType.OWNER, payment_data.owner_id)
+
+        query = (
+            select(Charge)
+            .where(
+                and_(
+                    open_charges_clause(),
+                    payer
+                )
+            )
+            .order_by(Charge.due_date, Charge.id)
+            .with_for_update(of=Charge)
+        )
+
+        try:
+            result = await self.db.execute(query)
+            charges = result.scalars().all()
+
+            allocations = []
+            for charge in charges:
+                if remaining <= 0:
+                    break
+
+                balance_due = Decimal(str(charge.balance_due)).quantize(CENT)
+                if balance_due <= 0:
+                    continue
+                applied = min(remaining, balance_due)
+
+                payment = Payment(
+                    charge_id=charge.id,
+                    amount=float(applied),
+                    payment_date=payment_date,
+                    payment_method=payment_data.payment_method,
+                    transaction_id=payment_data.payment_reference,
+                    notes=payment_data.notes,
+                )
+                self.db.add(payment)
+
+                charge.amount_paid = float(Decimal(str(charge.amount_paid)) + applied)
+                charge.last_payment_date = payment_date
+                charge.payment_reference = payment_data.payment_reference
+                charge.status = (
+                    ChargeStatus.PAID if applied == balance_due
+                    else ChargeStatus.PARTIALLY_PAID
+                )
+                remaining -= applied
+                allocations.append((charge, payment, applied))
+
+            await invalidate_balances(
+                self.db,
+                since=payment_date,
+                unit_ids=[charge.unit_id for charge, _, _ in allocations],
+                owner_ids=[charge.owner_id for charge, _, _ in allocations]
+            )
+
+            # Assign payment ids before the transaction is committed
+            await self.db.flush()
+
+            response = AccountPaymentResponse(
+                amount=payment_data.amount,
+                allocated_amount=Decimal(str(payment_data.amount)) - remaining,
+                unallocated_amount=remaining,
+                allocations=[
+                    PaymentAllocation(
+                        charge_id=charge.id,
+                        payment_id=payment.id,
+                        amount=applied,
+                        balance_due=Decimal(str(charge.balance_due)),
+                        status=charge.status
+                    )
+                    for charge, payment, applied in allocations
+                ]
+            )
+            await self.db.commit()
+
+            logger.info(
+                f"Allocated {response.allocated_amount} of account payment "
+                f"{payment_data.payment_reference} across {len(allocations)} charges"
+            )
+            return response
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="payment",
+                detail=str(e)
+            )
+
+    @handle_exceptions
+    async def get_top_debtors(
+            self,
+            building_id: int,
+            limit: int = 20
+    ) -> List[Charge]:
+        """Get the charges with the largest outstanding balance in a building"""
+        query = (
+            select(Charge)
+            .where(
+                and_(
+                    Charge.building_id == building_id,
+                    Charge.balance_due > 0,
+                    Charge.deleted_at.is_(None)
+                )
+            )
+            .order_by(desc(Charge.balance_due))
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    @handle_exceptions
+    async def preview_schedule(
+            self,
+            charge_id: int,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            limit: int = 12
+    ) -> List[ChargeOccurrence]:
+        """Preview occurrences of a recurring charge without writing rows"""
+        query = select(Charge).where(
+            and_(
+                Charge.id == charge_id,
+                Charge.deleted_at.is_(None)
+            )
+        )
+        result = await self.db.execute(query)
+        charge = result.scalar_one_or_none()
+
+        if not charge:
+            raise ResourceNotFoundException(
+                resource_type="Charge",
+                resource_id=charge_id
+            )
+        if not charge.recurring:
+            raise BusinessLogicException(
+                detail="Charge is not recurring",
+                code="CHARGE_NOT_RECURRING"
+            )
+
+        # due_date is stored as naive UTC, the bounds may come with an offset
+        occurrences = iter_occurrences(
+            charge.due_date,
+            charge.frequency,
+            to_naive_utc(start) if start else None,
+            to_naive_utc(end) if end else None
+        )
+        return [
+            ChargeOccurrence(
+                charge_id=charge.id,
+                sequence=sequence,
+                due_date=due_date,
+                amount=Decimal(str(charge.amount)),
+                total_amount=charge.total_amount
+            )
+            for sequence, due_date in islice(occurrences, limit)
+        ]
+
+    @handle_exceptions
+    async def materialize_recurring(
+            self,
+            periods: int = 3,
+            building_id: Optional[int] = None
+    ) -> ChargeMaterializeResult:
+        """
+        Materialize the next `periods` occurrences of every recurring charge.
+
+        Occurrences are written with multi-row INSERT ... ON CONFLICT DO NOTHING
+        on (parent_charge_id, due_date), so re-running the job only fills gaps.
+        """
+        now = utc_now()
+        query = select(Charge).where(
+            and_(
+                Charge.recurring.is_(True),
+                Charge.parent_charge_id.is_(None),
+                Charge.frequency != ChargeFrequency.ONCE,
+                Charge.status != ChargeStatus.CANCELLED,
+                Charge.deleted_at.is_(None)
+            )
+        )
+        if building_id:
+            query = query.where(Charge.building_id == building_id)
+
+        rows = []
+        recurring_charges = 0
+        result = await self.db.stream_scalars(query.execution_options(yield_per=MATERIALIZE_BATCH_SIZE))
+        async for charge in result:
+            recurring_charges += 1
+            upcoming = (
+                due_date
+                for sequence, due_date in iter_occurrences(charge.due_date, charge.frequency, start=now)
+                if sequence > 0
+            )
+            rows.extend(self._occurrence_row(charge, due_date, now) for due_date in islice(upcoming, periods))
+
+        created = []
+        try:
+            for offset in range(0, len(rows), MATERIALIZE_BATCH_SIZE):
+                statement = insert(Charge).values(
+                    rows[offset:offset + MATERIALIZE_BATCH_SIZE]
+                ).on_conflict_do_nothing(
+                    constraint="uq_charges_parent_due_date"
+                ).returning(Charge.due_date, Charge.unit_id, Charge.owner_id)
+                inserted = await self.db.execute(statement)
+                created.extend(inserted.all())
+            if created:
+                await invalidate_balances(
+                    self.db,
+                    since=min(row.due_date for row in created),
+                    unit_ids=[row.unit_id for row in created],
+                    owner_ids=[row.owner_id for row in created]
+                )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="materialize_recurring",
+                detail=str(e)
+            )
+
+        logger.info(f"Materialized {len(created)} occurrences of {recurring_charges} recurring charges")
+        return ChargeMaterializeResult(recurring_charges=recurring_charges, created=len(created))
+
+    @staticmethod
+    def _occurrence_row(charge: Charge, due_date: datetime, now: datetime) -> Dict[str, Any]:
+        """Column values of a materialized occurrence of a recurring charge"""
+        return {
+            "title": charge.title,
+            "description": charge.description,
+            "amount": charge.amount,
+            "type": charge.type,
+            "status": ChargeStatus.PENDING,
+            "due_date": due_date,
+            "frequency": ChargeFrequency.ONCE,
+            "recurring": False,
+            "parent_charge_id": charge.id,
+            "amount_paid": 0.0,
+            "unit_id": charge.unit_id,
+            "owner_id": charge.owner_id,
+            "tenant_id": charge.tenant_id,
+            "building_id": charge.building_id,
+            "generated_by": "recurring_schedule",
+            "notes": charge.notes,
+            "tax_rate": charge.tax_rate,
+            "is_taxable": charge.is_taxable,
+            "created_at": now,
+            "updated_at": now,
+            "is_deleted": False,
+        }
+
     @handle_exceptions
     async def get_statistics(
             self,
@@ -262,8 +620,11 @@ class ChargeCRUD:
         """Get charge statistics"""
         query = select(
             func.count(Charge.id).label('total_charges'),
-            func.sum(Charge.amount).label('total_amount'),
+            func.sum(Charge.total_amount).label('total_amount'),
             func.sum(Charge.amount_paid).label('total_paid'),
+            func.sum(Charge.balance_due).filter(
+                Charge.status != ChargeStatus.CANCELLED
+            ).label('total_pending'),
             func.count(Charge.id).filter(
                 Charge.status == ChargeStatus.OVERDUE
             ).label('overdue_charges')
@@ -286,9 +647,9 @@ class ChargeCRUD:
             total_charges=stats.total_charges,
             total_amount=stats.total_amount or 0,
             total_paid=stats.total_paid or 0,
-            total_pending=stats.total_amount - (stats.total_paid or 0),
+            total_pending=stats.total_pending or 0,
             overdue_charges=stats.overdue_charges,
-            collection_rate=(stats.total_paid or 0) / stats.total_amount * 100 if stats.total_amount else 0,
+            collection_rate=float(stats.total_paid or 0) / float(stats.total_amount) * 100 if stats.total_amount else 0,
             by_type=await self._get_charges_by_type(building_id),
             by_status=await self._get_charges_by_status(building_id),
             monthly_totals=await self._get_monthly_totals(building_id)
@@ -6,7 +6,7 @@ import logging
 
 from app.models.cost import Cost, CostDocument
 from app.schemas.cost import CostCreate, CostUpdate, CostFilter
-from core.exceptions import (
+from app.core.exceptions import (
     ResourceNotFoundException,
     DatabaseOperationException,
     BusinessLogicException,
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -64,7 +64,8 @@ class CRUDFloor(CRUDBase[Floor, FloorCreate, FloorUpdate]):
             *,
             skip: int = 0,
             limit: int = 100,
-            building_id: Optional[int] = None
+            building_id: Optional[int] = None,
+            options: Sequence[Any] = ()
     ) -> List[Floor]:
         """
         Get multiple floors with optional filtering.
@@ -74,11 +75,12 @@ class CRUDFloor(CRUDBase[Floor, FloorCreate, FloorUpdate]):
             skip: Number of records to skip
             limit: Maximum number of records to return
             building_id: Optional building ID filter
+            options: Loader options, e.g. relationships to eager load
 
         Returns:
             List of floor instances
         """
-        query = select(Floor)
+        query = select(Floor).options(*options)
         if building_id:
             query = query.filter(Floor.building_id == building_id)
         query = query.offset(skip).limit(limit)
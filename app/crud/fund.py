@@ -1,28 +1,118 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, func, text
-from datetime import datetime, UTC, timedelta
+from sqlalchemy import (
+    select, update, delete, and_, or_, desc, func, case, literal, false, Date, DateTime
+)
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
+from collections import defaultdict
 import logging
 
-from app.models.fund import Fund, FundTransaction, FundApproval
+import numpy as np
+
+from app.models.charge import Charge, ChargeFrequency, ChargeStatus
+from app.models.cost import Cost, CostStatus
+from app.models.fund import (
+    Fund,
+    FundTransaction,
+    FundApproval,
+    FundBalance,
+    FundInterestAccrual,
+    FundStatus,
+    TransactionType,
+    TransactionStatus,
+    PaymentMethod,
+    ApprovalDecision
+)
 from app.schemas.fund import (
     FundCreate,
     FundUpdate,
-    FundTransaction as TransactionSchema,
+    FundTransactionCreate,
+    FundTransactionBulkCreate,
+    FundTransactionBulkResult,
+    FundBulkBalance,
+    FundTransferCreate,
+    FundTransferResponse,
+    FundTransferBatchResult,
+    FundSweepRequest,
     FundApprovalRequest,
-    FundFilter
+    FundApprovalResult,
+    FundApprovalSkipped,
+    FundInterestResult,
+    FundForecast,
+    FundForecastResponse,
+    FundFilter,
+    FundTransactionFilter
 )
-from core.exceptions import (
+from app.crud.ledger import is_closed_period, period_cutoff
+from app.utils.forecast import (
+    group_shares,
+    month_index,
+    month_start,
+    monthly_totals,
+    occurrence_counts,
+    project_balances,
+    to_days
+)
+from app.utils.helpers import utc_now, utc_today
+from app.utils.numbering import next_number, next_numbers
+from app.utils.schedule import DAY_STEPS, MONTH_STEPS
+from app.core.exceptions import (
+    BuildingManagementException,
     ResourceNotFoundException,
     DatabaseOperationException,
     InsufficientFundsException,
     BusinessLogicException,
+    ValidationException,
     handle_exceptions
 )
 
 logger = logging.getLogger(__name__)
 
+# Transaction types that take money out of a fund, everything else adds to it
+DEBIT_TYPES = {
+    TransactionType.WITHDRAWAL,
+    TransactionType.TRANSFER_OUT,
+    TransactionType.FEE,
+}
+
+# Rows per multi-row INSERT of a bulk import
+BULK_INSERT_SIZE = 1000
+
+
+def needs_approval(fund: Fund, transaction_type: TransactionType, amount: Decimal) -> bool:
+    """Whether a transaction must wait in the approval queue before it is applied"""
+    return (
+        fund.requires_approval
+        and transaction_type in DEBIT_TYPES
+        and (fund.approval_threshold is None or amount > fund.approval_threshold)
+    )
+
+
+def signed_amount():
+    """Transaction amount signed by its effect on the fund balance"""
+    return case(
+        (FundTransaction.transaction_type.in_(DEBIT_TYPES), -FundTransaction.amount),
+        else_=FundTransaction.amount
+    )
+
+
+async def invalidate_fund_balances(db: AsyncSession, fund_id: int, since: datetime) -> None:
+    """Drop snapshots made stale by a transaction dated `since`. The caller commits."""
+    # Snapshots only exist for closed months
+    if since.date() >= utc_today().replace(day=1):
+        return
+
+    await db.execute(
+        delete(FundBalance).where(
+            and_(
+                FundBalance.fund_id == fund_id,
+                FundBalance.period_end >= since.date()
+            )
+        )
+    )
+
 
 class FundCRUD:
     def __init__(self, db_session: AsyncSession):
@@ -35,8 +125,8 @@ class FundCRUD:
 
         fund = Fund(
             **fund_data.dict(),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+            created_at=utc_now(),
+            updated_at=utc_now()
         )
 
         try:
@@ -54,12 +144,14 @@ class FundCRUD:
     @handle_exceptions
     async def get(self, fund_id: int) -> Fund:
         """Get fund by ID"""
+        # Balances are changed by UPDATE statements, so a fund already in the
+        # session is reloaded rather than returned with its old balance
         query = select(Fund).where(
             and_(
                 Fund.id == fund_id,
                 Fund.deleted_at.is_(None)
             )
-        )
+        ).execution_options(populate_existing=True)
         result = await self.db.execute(query)
         fund = result.scalar_one_or_none()
 
@@ -83,7 +175,7 @@ class FundCRUD:
         for field, value in update_data.items():
             setattr(fund, field, value)
 
-        fund.updated_at = datetime.now(UTC)
+        fund.updated_at = utc_now()
 
         try:
             await self.db.commit()
@@ -100,51 +192,77 @@ class FundCRUD:
     async def process_transaction(
             self,
             fund_id: int,
-            transaction_data: TransactionSchema
+            transaction_data: FundTransactionCreate
     ) -> FundTransaction:
-        """Process a fund transaction"""
-        fund = await self.get(fund_id)
-        amount = Decimal(str(transaction_data.amount))
+        """
+        Process a fund transaction.
 
-        # Validate transaction
-        if transaction_data.transaction_type in ["withdrawal", "transfer"]:
-            available_balance = fund.current_balance - fund.minimum_balance
-            if amount > available_balance:
-                raise InsufficientFundsException(
-                    required=float(amount),
-                    available=float(available_balance)
-                )
+        The balance is changed with a single conditional UPDATE ... RETURNING,
+        so concurrent debits can neither lose updates nor overdraw the fund.
+        Debits above the fund's approval threshold are parked as PENDING.
+        """
+        amount = Decimal(str(transaction_data.amount))
+        debit = transaction_data.transaction_type in DEBIT_TYPES
+        now = utc_now()
 
-            if fund.withdrawal_limit and amount > fund.withdrawal_limit:
-                raise BusinessLogicException(
-                    detail=f"Amount exceeds withdrawal limit of {fund.withdrawal_limit}",
-                    code="WITHDRAWAL_LIMIT_EXCEEDED"
-                )
+        if debit:
+            fund = await self.get(fund_id)
+            if needs_approval(fund, transaction_data.transaction_type, amount):
+                return await self._park(fund, transaction_data)
 
-        # Create transaction record
-        transaction = FundTransaction(
-            fund_id=fund_id,
-            **transaction_data.dict(),
-            balance_after=(
-                fund.current_balance + amount
-                if transaction_data.transaction_type in ["deposit", "interest"]
-                else fund.current_balance - amount
-            ),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+        statement = update(Fund).where(
+            and_(
+                Fund.id == fund_id,
+                Fund.deleted_at.is_(None)
+            )
         )
+        if debit:
+            statement = statement.where(
+                and_(
+                    Fund.current_balance - amount >= Fund.minimum_balance,
+                    or_(
+                        Fund.withdrawal_limit.is_(None),
+                        Fund.withdrawal_limit >= amount
+                    )
+                )
+            )
+        statement = statement.values(
+            current_balance=Fund.current_balance + (-amount if debit else amount),
+            updated_at=now
+        ).returning(Fund.current_balance, Fund.building_id).execution_options(synchronize_session=False)
 
         try:
-            # Update fund balance
-            if transaction_data.transaction_type in ["deposit", "interest"]:
-                fund.current_balance += amount
-            else:
-                fund.current_balance -= amount
+            result = await self.db.execute(statement)
+            updated = result.one_or_none()
+            if updated is None:
+                await self.db.rollback()
+                await self._raise_rejected(fund_id, amount)
+            balance_after, building_id = updated
 
+            transaction = FundTransaction(
+                fund_id=fund_id,
+                status=TransactionStatus.COMPLETED,
+                payment_method=transaction_data.payment_method,
+                transaction_type=transaction_data.transaction_type,
+                amount=amount,
+                balance_after=balance_after,
+                reference_number=(
+                    transaction_data.reference_number
+                    or await next_number(self.db, building_id, prefix="FTX")
+                ),
+                description=transaction_data.description or transaction_data.transaction_type.value,
+                transaction_date=transaction_data.transaction_date,
+                notes=transaction_data.notes,
+                created_at=now,
+                updated_at=now
+            )
             self.db.add(transaction)
+            await invalidate_fund_balances(self.db, fund_id, transaction.transaction_date)
             await self.db.commit()
             await self.db.refresh(transaction)
             return transaction
+        except BuildingManagementException:
+            raise
         except Exception as e:
             await self.db.rollback()
             raise DatabaseOperationException(
@@ -152,13 +270,335 @@ class FundCRUD:
                 detail=str(e)
             )
 
+    async def _raise_rejected(self, fund_id: int, amount: Decimal) -> None:
+        """Explain why a conditional balance update matched no row"""
+        fund = await self.get(fund_id)
+
+        if fund.withdrawal_limit is not None and amount > fund.withdrawal_limit:
+            raise BusinessLogicException(
+                detail=f"Amount exceeds withdrawal limit of {fund.withdrawal_limit}",
+                code="WITHDRAWAL_LIMIT_EXCEEDED"
+            )
+        raise InsufficientFundsException(
+            required=float(amount),
+            available=float(fund.current_balance - fund.minimum_balance)
+        )
+
+    @handle_exceptions
+    async def process_bulk(
+            self,
+            bulk_data: FundTransactionBulkCreate
+    ) -> FundTransactionBulkResult:
+        """
+        Apply many fund transactions in one database transaction.
+
+        Involved funds are locked in ascending id order. Each fund's transactions
+        are applied in (transaction_date, reference_number) order in memory, and
+        every limit is checked before anything is written. The rows are then
+        written with multi-row inserts and one balance update per fund. A single
+        invalid transaction rejects the whole import. Debits needing approval
+        are imported as PENDING without touching the balance.
+        """
+        by_fund: Dict[int, List[FundTransactionCreate]] = defaultdict(list)
+        for transaction_data in bulk_data.transactions:
+            by_fund[transaction_data.fund_id].append(transaction_data)
+
+        funds = await self._lock_funds(by_fund)
+
+        now = utc_now()
+        rows, balances, errors = [], [], []
+        for fund_id in sorted(by_fund):
+            fund = funds[fund_id]
+            transactions = sorted(
+                by_fund[fund_id],
+                key=lambda tx: (tx.transaction_date, tx.reference_number or "")
+            )
+            balance = opening_balance = Decimal(fund.current_balance)
+            references = iter(await next_numbers(
+                self.db,
+                fund.building_id,
+                count=sum(1 for tx in transactions if not tx.reference_number),
+                prefix="FTX"
+            ))
+
+            for transaction_data in transactions:
+                amount = Decimal(str(transaction_data.amount))
+                status = TransactionStatus.COMPLETED
+                if needs_approval(fund, transaction_data.transaction_type, amount):
+                    # Parked in the approval queue, the balance is unchanged
+                    status = TransactionStatus.PENDING
+                elif transaction_data.transaction_type in DEBIT_TYPES:
+                    if fund.withdrawal_limit is not None and amount > fund.withdrawal_limit:
+                        errors.append({
+                            "fund_id": fund_id,
+                            "reference_number": transaction_data.reference_number,
+                            "code": "WITHDRAWAL_LIMIT_EXCEEDED"
+                        })
+                    elif balance - amount < fund.minimum_balance:
+                        errors.append({
+                            "fund_id": fund_id,
+                            "reference_number": transaction_data.reference_number,
+                            "code": "INSUFFICIENT_FUNDS"
+                        })
+                    balance -= amount
+                else:
+                    balance += amount
+
+                rows.append({
+                    "fund_id": fund_id,
+                    "status": status,
+                    "payment_method": transaction_data.payment_method,
+                    "transaction_type": transaction_data.transaction_type,
+                    "amount": amount,
+                    "balance_after": balance,
+                    "reference_number": transaction_data.reference_number or next(references),
+                    "description": transaction_data.description or transaction_data.transaction_type.value,
+                    "transaction_date": transaction_data.transaction_date,
+                    "notes": transaction_data.notes,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_deleted": False,
+                })
+
+            fund.current_balance = balance
+            fund.updated_at = now
+            balances.append(FundBulkBalance(
+                fund_id=fund_id,
+                transactions=len(transactions),
+                opening_balance=opening_balance,
+                closing_balance=balance
+            ))
+
+        if errors:
+            await self.db.rollback()
+            raise BusinessLogicException(
+                detail=f"{len(errors)} transactions violate fund limits, nothing was imported",
+                code="BULK_TRANSACTIONS_REJECTED",
+                metadata={"errors": errors}
+            )
+
+        try:
+            await self._insert_rows(rows)
+            for fund_id, transactions in by_fund.items():
+                await invalidate_fund_balances(
+                    self.db, fund_id, min(tx.transaction_date for tx in transactions)
+                )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="process_bulk",
+                detail=str(e)
+            )
+
+        logger.info(f"Imported {len(rows)} transactions into {len(balances)} funds")
+        return FundTransactionBulkResult(created=len(rows), funds=balances)
+
+    async def _lock_funds(self, fund_ids) -> Dict[int, Fund]:
+        """Lock funds in ascending id order, so concurrent writers cannot deadlock"""
+        fund_ids = set(fund_ids)
+        query = select(Fund).where(
+            and_(
+                Fund.id.in_(fund_ids),
+                Fund.deleted_at.is_(None)
+            )
+        ).order_by(Fund.id).with_for_update()
+        result = await self.db.execute(query)
+        funds = {fund.id: fund for fund in result.scalars().all()}
+
+        missing = sorted(fund_ids - set(funds))
+        if missing:
+            await self.db.rollback()
+            raise ResourceNotFoundException(
+                resource_type="Fund",
+                resource_id=missing[0],
+                metadata={"missing_fund_ids": missing}
+            )
+        return funds
+
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Write fund transaction rows with multi-row inserts"""
+        for offset in range(0, len(rows), BULK_INSERT_SIZE):
+            await self.db.execute(
+                insert(FundTransaction).values(rows[offset:offset + BULK_INSERT_SIZE])
+            )
+
+    @handle_exceptions
+    async def transfer(self, transfer_data: FundTransferCreate) -> FundTransferResponse:
+        """Move money between two funds as one double-entry transaction"""
+        result = await self.transfer_batch([transfer_data])
+        return result.transfers[0]
+
+    @handle_exceptions
+    async def transfer_batch(
+            self,
+            transfers: List[FundTransferCreate]
+    ) -> FundTransferBatchResult:
+        """
+        Apply transfers in order, all or nothing.
+
+        Every fund involved is locked up front in ascending id order, so
+        overlapping batches serialize instead of deadlocking. Each transfer
+        writes a TRANSFER_OUT and a TRANSFER_IN row sharing one reference.
+        """
+        funds = await self._lock_funds(
+            {t.from_fund_id for t in transfers} | {t.to_fund_id for t in transfers}
+        )
+        return await self._apply_transfers(funds, transfers)
+
+    @handle_exceptions
+    async def sweep(self, sweep_data: FundSweepRequest) -> FundTransferBatchResult:
+        """
+        Transfer the available balance of every matching active fund into one fund.
+
+        Like any transfer, the sweep is refused if a source fund needs approval
+        for its amount.
+        """
+        sources = select(Fund.id).where(
+            and_(
+                Fund.fund_type == sweep_data.fund_type,
+                Fund.status == FundStatus.ACTIVE,
+                Fund.id != sweep_data.to_fund_id,
+                Fund.deleted_at.is_(None)
+            )
+        )
+        if sweep_data.building_id:
+            sources = sources.where(Fund.building_id == sweep_data.building_id)
+        result = await self.db.execute(sources)
+
+        # Amounts are taken from the locked rows, not from the unlocked read above
+        funds = await self._lock_funds({*result.scalars().all(), sweep_data.to_fund_id})
+        transfers = [
+            FundTransferCreate(
+                from_fund_id=fund.id,
+                to_fund_id=sweep_data.to_fund_id,
+                amount=fund.current_balance - fund.minimum_balance,
+                description=sweep_data.description or f"Sweep of {fund.name}"
+            )
+            for fund_id, fund in sorted(funds.items())
+            if fund_id != sweep_data.to_fund_id and fund.current_balance > fund.minimum_balance
+        ]
+        if not transfers:
+            await self.db.rollback()
+            return FundTransferBatchResult(total_amount=Decimal("0"))
+
+        return await self._apply_transfers(funds, transfers)
+
+    async def _apply_transfers(
+            self,
+            funds: Dict[int, Fund],
+            transfers: List[FundTransferCreate]
+    ) -> FundTransferBatchResult:
+        """
+        Validate and write transfers between already locked funds.
+
+        A transfer whose outgoing leg needs approval refuses the whole batch:
+        the two legs cannot wait in the approval queue as one.
+        """
+        now = utc_now()
+        rows, applied = [], []
+
+        for transfer_data in transfers:
+            source, target = funds[transfer_data.from_fund_id], funds[transfer_data.to_fund_id]
+            amount = Decimal(str(transfer_data.amount))
+
+            error = self._transfer_error(source, amount)
+            if error is not None:
+                # Built first, as the rollback expires the fund rows it describes
+                await self.db.rollback()
+                raise error
+
+            source.current_balance -= amount
+            target.current_balance += amount
+            source.updated_at = target.updated_at = now
+
+            reference_number = (
+                transfer_data.reference_number
+                or await next_number(self.db, source.building_id, prefix="FTX")
+            )
+            for fund, transaction_type, description in (
+                    (source, TransactionType.TRANSFER_OUT, f"Transfer to fund {target.id}"),
+                    (target, TransactionType.TRANSFER_IN, f"Transfer from fund {source.id}"),
+            ):
+                rows.append({
+                    "fund_id": fund.id,
+                    "status": TransactionStatus.COMPLETED,
+                    "payment_method": transfer_data.payment_method,
+                    "transaction_type": transaction_type,
+                    "amount": amount,
+                    "balance_after": fund.current_balance,
+                    "reference_number": reference_number,
+                    "description": transfer_data.description or description,
+                    "transaction_date": transfer_data.transaction_date,
+                    "notes": transfer_data.notes,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_deleted": False,
+                })
+            applied.append(FundTransferResponse(
+                reference_number=reference_number,
+                from_fund_id=source.id,
+                to_fund_id=target.id,
+                amount=amount,
+                from_balance_after=source.current_balance,
+                to_balance_after=target.current_balance
+            ))
+
+        try:
+            await self._insert_rows(rows)
+            earliest: Dict[int, datetime] = {}
+            for transfer_data in transfers:
+                for fund_id in (transfer_data.from_fund_id, transfer_data.to_fund_id):
+                    earliest[fund_id] = min(
+                        earliest.get(fund_id, transfer_data.transaction_date),
+                        transfer_data.transaction_date
+                    )
+            for fund_id, since in earliest.items():
+                await invalidate_fund_balances(self.db, fund_id, since)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="transfer",
+                detail=str(e)
+            )
+
+        return FundTransferBatchResult(
+            total_amount=sum((t.amount for t in applied), Decimal("0")),
+            transfers=applied
+        )
+
+    @staticmethod
+    def _transfer_error(source: Fund, amount: Decimal) -> Optional[BuildingManagementException]:
+        """Why `amount` cannot be transferred out of `source` now, None if it can"""
+        if needs_approval(source, TransactionType.TRANSFER_OUT, amount):
+            return BusinessLogicException(
+                detail=f"Transfers of {amount} out of fund {source.id} require approval, "
+                       f"submit a withdrawal to the approval queue instead",
+                code="APPROVAL_REQUIRED",
+                metadata={"fund_id": source.id}
+            )
+        if source.withdrawal_limit is not None and amount > source.withdrawal_limit:
+            return BusinessLogicException(
+                detail=f"Amount exceeds withdrawal limit of {source.withdrawal_limit}",
+                code="WITHDRAWAL_LIMIT_EXCEEDED",
+                metadata={"fund_id": source.id}
+            )
+        if source.current_balance - amount < source.minimum_balance:
+            return InsufficientFundsException(
+                required=float(amount),
+                available=float(source.current_balance - source.minimum_balance),
+                metadata={"fund_id": source.id}
+            )
+        return None
+
     @handle_exceptions
     async def create_approval_request(
             self,
             fund_id: int,
-            approval_data: FundApprovalRequest
-    ) -> FundApproval:
-        """Create a new fund approval request"""
+            transaction_data: FundTransactionCreate
+    ) -> FundTransaction:
+        """Park a transaction in the approval queue regardless of the threshold"""
         fund = await self.get(fund_id)
 
         if not fund.requires_approval:
@@ -166,20 +606,42 @@ class FundCRUD:
                 detail="This fund does not require approval for transactions",
                 code="APPROVAL_NOT_REQUIRED"
             )
+        return await self._park(fund, transaction_data)
 
-        approval = FundApproval(
-            fund_id=fund_id,
-            **approval_data.dict(),
-            status="pending",
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+    async def _park(self, fund: Fund, transaction_data: FundTransactionCreate) -> FundTransaction:
+        """Store a transaction as PENDING without changing the fund balance"""
+        amount = Decimal(str(transaction_data.amount))
+        if fund.withdrawal_limit is not None and amount > fund.withdrawal_limit:
+            raise BusinessLogicException(
+                detail=f"Amount exceeds withdrawal limit of {fund.withdrawal_limit}",
+                code="WITHDRAWAL_LIMIT_EXCEEDED"
+            )
+
+        now = utc_now()
+        transaction = FundTransaction(
+            fund_id=fund.id,
+            status=TransactionStatus.PENDING,
+            payment_method=transaction_data.payment_method,
+            transaction_type=transaction_data.transaction_type,
+            amount=amount,
+            balance_after=fund.current_balance,
+            reference_number=(
+                transaction_data.reference_number
+                or await next_number(self.db, fund.building_id, prefix="FTX")
+            ),
+            description=transaction_data.description or transaction_data.transaction_type.value,
+            transaction_date=transaction_data.transaction_date,
+            notes=transaction_data.notes,
+            created_at=now,
+            updated_at=now
         )
 
         try:
-            self.db.add(approval)
+            self.db.add(transaction)
             await self.db.commit()
-            await self.db.refresh(approval)
-            return approval
+            await self.db.refresh(transaction)
+            logger.info(f"Transaction {transaction.reference_number} is waiting for approval")
+            return transaction
         except Exception as e:
             await self.db.rollback()
             raise DatabaseOperationException(
@@ -187,6 +649,165 @@ class FundCRUD:
                 detail=str(e)
             )
 
+    @handle_exceptions
+    async def get_approval_queue(
+            self,
+            fund_id: Optional[int] = None,
+            building_id: Optional[int] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List[FundTransaction]:
+        """List transactions waiting for approval, oldest first"""
+        query = select(FundTransaction).where(
+            and_(
+                FundTransaction.status == TransactionStatus.PENDING,
+                FundTransaction.deleted_at.is_(None)
+            )
+        )
+        if fund_id:
+            query = query.where(FundTransaction.fund_id == fund_id)
+        if building_id:
+            query = query.where(
+                FundTransaction.fund_id.in_(select(Fund.id).where(Fund.building_id == building_id))
+            )
+
+        query = query.order_by(
+            FundTransaction.transaction_date, FundTransaction.id
+        ).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    @handle_exceptions
+    async def approve_transactions(self, approval_data: FundApprovalRequest) -> FundApprovalResult:
+        """
+        Approve pending transactions and apply them in one pass.
+
+        Funds are locked in ascending id order and each fund's approved
+        transactions are applied in date order. Transactions the fund can no
+        longer cover stay in the queue and are reported as skipped.
+        """
+        pending = await self._lock_pending(approval_data.transaction_ids)
+        funds = await self._lock_funds({transaction.fund_id for transaction in pending})
+
+        now = utc_now()
+        processed, skipped, earliest = [], [], {}
+        for transaction in sorted(pending, key=lambda tx: (tx.fund_id, tx.transaction_date, tx.id)):
+            fund = funds[transaction.fund_id]
+            amount = Decimal(transaction.amount)
+            if transaction.transaction_type in DEBIT_TYPES:
+                if fund.withdrawal_limit is not None and amount > fund.withdrawal_limit:
+                    skipped.append(FundApprovalSkipped(
+                        transaction_id=transaction.id, code="WITHDRAWAL_LIMIT_EXCEEDED"
+                    ))
+                    continue
+                if fund.current_balance - amount < fund.minimum_balance:
+                    skipped.append(FundApprovalSkipped(
+                        transaction_id=transaction.id, code="INSUFFICIENT_FUNDS"
+                    ))
+                    continue
+                fund.current_balance -= amount
+            else:
+                fund.current_balance += amount
+
+            fund.updated_at = now
+            transaction.status = TransactionStatus.COMPLETED
+            transaction.balance_after = fund.current_balance
+            transaction.updated_at = now
+            processed.append(transaction)
+            earliest[fund.id] = min(earliest.get(fund.id, transaction.transaction_date), transaction.transaction_date)
+
+        skipped.extend(
+            FundApprovalSkipped(transaction_id=transaction_id, code="NOT_PENDING")
+            for transaction_id in sorted(set(approval_data.transaction_ids) - {tx.id for tx in pending})
+        )
+
+        try:
+            await self._record_decisions(processed, ApprovalDecision.APPROVED, approval_data)
+            for fund_id, since in earliest.items():
+                await invalidate_fund_balances(self.db, fund_id, since)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="approve_transactions",
+                detail=str(e)
+            )
+
+        return FundApprovalResult(
+            decision=ApprovalDecision.APPROVED,
+            processed=[transaction.id for transaction in processed],
+            skipped=skipped
+        )
+
+    @handle_exceptions
+    async def reject_transactions(self, approval_data: FundApprovalRequest) -> FundApprovalResult:
+        """Reject pending transactions, they are cancelled without touching balances"""
+        pending = await self._lock_pending(approval_data.transaction_ids)
+
+        now = utc_now()
+        for transaction in pending:
+            transaction.status = TransactionStatus.CANCELLED
+            transaction.updated_at = now
+
+        try:
+            await self._record_decisions(pending, ApprovalDecision.REJECTED, approval_data)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="reject_transactions",
+                detail=str(e)
+            )
+
+        return FundApprovalResult(
+            decision=ApprovalDecision.REJECTED,
+            processed=[transaction.id for transaction in pending],
+            skipped=[
+                FundApprovalSkipped(transaction_id=transaction_id, code="NOT_PENDING")
+                for transaction_id in sorted(set(approval_data.transaction_ids) - {tx.id for tx in pending})
+            ]
+        )
+
+    async def _lock_pending(self, transaction_ids: List[int]) -> List[FundTransaction]:
+        """Lock the still pending transactions among transaction_ids"""
+        query = select(FundTransaction).where(
+            and_(
+                FundTransaction.id.in_(transaction_ids),
+                FundTransaction.status == TransactionStatus.PENDING,
+                FundTransaction.deleted_at.is_(None)
+            )
+        ).order_by(FundTransaction.id).with_for_update()
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def _record_decisions(
+            self,
+            transactions: List[FundTransaction],
+            decision: ApprovalDecision,
+            approval_data: FundApprovalRequest
+    ) -> None:
+        """Write one approval row per decided transaction"""
+        if not transactions:
+            return
+
+        now = utc_now()
+        await self.db.execute(
+            insert(FundApproval).values([
+                {
+                    "transaction_id": transaction.id,
+                    "fund_id": transaction.fund_id,
+                    "decision": decision,
+                    "approver": approval_data.approver,
+                    "comment": approval_data.comment,
+                    "decided_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_deleted": False,
+                }
+                for transaction in transactions
+            ])
+        )
+
     @handle_exceptions
     async def get_multi(
             self,
@@ -198,23 +819,63 @@ class FundCRUD:
         query = select(Fund).where(Fund.deleted_at.is_(None))
 
         if filters:
-            if filters.fund_type:
-                query = query.where(Fund.fund_type.in_(filters.fund_type))
-            if filters.status:
-                query = query.where(Fund.status.in_(filters.status))
-            if filters.min_balance:
-                query = query.where(Fund.current_balance >= filters.min_balance)
-            if filters.max_balance:
-                query = query.where(Fund.current_balance <= filters.max_balance)
-            if filters.requires_approval is not None:
-                query = query.where(Fund.requires_approval == filters.requires_approval)
-            if filters.tags:
-                query = query.where(Fund.tags.contains(filters.tags))
+            query = self._apply_filters(query, filters)
 
         query = query.order_by(desc(Fund.created_at)).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    def _apply_filters(query, filters: FundFilter):
+        """Apply fund filters to the query"""
+        if filters.building_id:
+            query = query.where(Fund.building_id == filters.building_id)
+        if filters.fund_type:
+            query = query.where(Fund.fund_type.in_(filters.fund_type))
+        if filters.status:
+            query = query.where(Fund.status.in_(filters.status))
+        if filters.min_balance:
+            query = query.where(Fund.current_balance >= filters.min_balance)
+        if filters.max_balance:
+            query = query.where(Fund.current_balance <= filters.max_balance)
+        if filters.requires_approval is not None:
+            query = query.where(Fund.requires_approval == filters.requires_approval)
+        if filters.tags:
+            query = query.where(Fund.tags.contains(filters.tags))
+        return query
+
+    @classmethod
+    def export_query(cls, filters: FundFilter):
+        """All columns of the filtered funds in id order, for streaming exports"""
+        query = select(*Fund.__table__.columns).where(Fund.deleted_at.is_(None))
+        return cls._apply_filters(query, filters).order_by(Fund.id)
+
+    @staticmethod
+    def transaction_export_query(filters: FundTransactionFilter):
+        """All columns of the filtered fund transactions in id order, for streaming exports"""
+        query = select(*FundTransaction.__table__.columns).where(FundTransaction.deleted_at.is_(None))
+        if filters.fund_id:
+            query = query.where(FundTransaction.fund_id == filters.fund_id)
+        if filters.building_id:
+            query = query.where(
+                FundTransaction.fund_id.in_(select(Fund.id).where(Fund.building_id == filters.building_id))
+            )
+        if filters.transaction_type:
+            query = query.where(FundTransaction.transaction_type.in_(filters.transaction_type))
+        if filters.status:
+            query = query.where(FundTransaction.status.in_(filters.status))
+        if filters.payment_method:
+            query = query.where(FundTransaction.payment_method.in_(filters.payment_method))
+        if filters.date_from:
+            query = query.where(FundTransaction.transaction_date >= filters.date_from)
+        if filters.date_to:
+            query = query.where(FundTransaction.transaction_date <= filters.date_to)
+        if filters.min_amount:
+            query = query.where(FundTransaction.amount >= filters.min_amount)
+        if filters.max_amount:
+            query = query.where(FundTransaction.amount <= filters.max_amount)
+        return query.order_by(FundTransaction.id)
+
     @handle_exceptions
     async def get_statistics(
             self,
@@ -273,6 +934,482 @@ class FundCRUD:
             }
         }
 
+    async def _delta(
+            self,
+            fund_id: int,
+            date_from: Optional[datetime],
+            date_to: Optional[datetime]
+    ) -> Decimal:
+        """Net of completed transactions dated in [date_from, date_to)"""
+        query = select(func.coalesce(func.sum(signed_amount()), 0)).where(
+            and_(
+                FundTransaction.fund_id == fund_id,
+                FundTransaction.status == TransactionStatus.COMPLETED,
+                FundTransaction.deleted_at.is_(None)
+            )
+        )
+        if date_from is not None:
+            query = query.where(FundTransaction.transaction_date >= date_from)
+        if date_to is not None:
+            query = query.where(FundTransaction.transaction_date < date_to)
+
+        result = await self.db.execute(query)
+        return Decimal(result.scalar())
+
+    @handle_exceptions
+    async def get_balance_at(self, fund_id: int, at: datetime) -> Decimal:
+        """
+        Balance of a fund before `at`.
+
+        Starts from the nearest month-end snapshot and adds the transactions
+        after it. Without a snapshot, later transactions are subtracted from
+        the current balance instead.
+        """
+        query = select(FundBalance).where(
+            and_(
+                FundBalance.fund_id == fund_id,
+                FundBalance.period_end < at.date()
+            )
+        ).order_by(FundBalance.period_end.desc()).limit(1)
+        result = await self.db.execute(query)
+        snapshot = result.scalar_one_or_none()
+
+        if snapshot is not None:
+            return Decimal(snapshot.balance) + await self._delta(
+                fund_id, period_cutoff(snapshot.period_end), at
+            )
+
+        fund = await self.get(fund_id)
+        return Decimal(fund.current_balance) - await self._delta(fund_id, at, None)
+
+    @handle_exceptions
+    async def snapshot_balances(self, period_end: Optional[date] = None) -> Tuple[date, int]:
+        """
+        Store the balance of every fund at the end of a closed period.
+
+        Defaults to the last closed month. Balances are computed as the current
+        balance minus the transactions dated after the period, in a single
+        INSERT ... SELECT; re-running a period overwrites its snapshots.
+        Returns the period end used and the number of funds stored.
+        """
+        period_end = period_end or utc_today().replace(day=1) - timedelta(days=1)
+        # Transactions can still be added to an open month, which would not invalidate its snapshot
+        if not is_closed_period(period_end):
+            raise ValidationException(
+                detail="Balances can only be snapshotted for months that have ended",
+                metadata={"period_end": str(period_end)}
+            )
+        now = utc_now()
+
+        later = select(
+            FundTransaction.fund_id,
+            func.sum(signed_amount()).label("delta")
+        ).where(
+            and_(
+                FundTransaction.status == TransactionStatus.COMPLETED,
+                FundTransaction.deleted_at.is_(None),
+                FundTransaction.transaction_date >= period_cutoff(period_end)
+            )
+        ).group_by(FundTransaction.fund_id).subquery("later")
+
+        balances = select(
+            Fund.id,
+            literal(period_end, Date),
+            Fund.current_balance - func.coalesce(later.c.delta, 0),
+            literal(now, DateTime),
+            literal(now, DateTime),
+            false()
+        ).outerjoin(
+            later, later.c.fund_id == Fund.id
+        ).where(Fund.deleted_at.is_(None))
+
+        statement = insert(FundBalance).from_select(
+            ["fund_id", "period_end", "balance", "created_at", "updated_at", "is_deleted"],
+            balances
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_fund_balances_period",
+            set_={"balance": statement.excluded.balance, "updated_at": now}
+        )
+
+        try:
+            result = await self.db.execute(statement)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="snapshot_balances",
+                detail=str(e)
+            )
+
+        logger.info(f"Stored {result.rowcount} fund balances for {period_end}")
+        return period_end, result.rowcount
+
+    @handle_exceptions
+    async def accrue_interest(
+            self,
+            period_start: Optional[date] = None,
+            period_end: Optional[date] = None
+    ) -> FundInterestResult:
+        """
+        Post interest on the average daily balance of every interest-bearing fund.
+
+        Defaults to the last closed month; periods that have not ended are
+        refused, as their balances can still change. The daily balance integral
+        is opening * days + sum(amount * time left in the period) over the
+        period's transactions, so one aggregate query prices all funds at once.
+        Every posting records its period: re-running a period posts nothing
+        new, and a period overlapping another one accrued for a fund is refused.
+        """
+        period_end = period_end or utc_today().replace(day=1) - timedelta(days=1)
+        period_start = period_start or period_end.replace(day=1)
+        if period_start > period_end:
+            raise ValidationException(
+                detail="period_start must not be after period_end",
+                metadata={"period_start": str(period_start), "period_end": str(period_end)}
+            )
+        if not is_closed_period(period_end):
+            raise ValidationException(
+                detail="Interest can only be accrued for months that have ended",
+                metadata={"period_end": str(period_end)}
+            )
+
+        start = datetime.combine(period_start, time.min)
+        cutoff = period_cutoff(period_end)
+        days = (period_end - period_start).days + 1
+        now = utc_now()
+
+        # Locks the funds in id order, like _lock_funds, so their balances and
+        # accrued periods cannot change until this run commits
+        result = await self.db.execute(
+            select(Fund.id).where(
+                and_(
+                    Fund.status == FundStatus.ACTIVE,
+                    Fund.deleted_at.is_(None),
+                    Fund.interest_rate > 0
+                )
+            ).order_by(Fund.id).with_for_update()
+        )
+        fund_ids = result.scalars().all()
+
+        # A new statement, so periods committed by runs that held the locks are seen
+        result = await self.db.execute(
+            select(
+                FundInterestAccrual.fund_id,
+                FundInterestAccrual.period_start,
+                FundInterestAccrual.period_end
+            ).where(
+                and_(
+                    FundInterestAccrual.fund_id.in_(fund_ids),
+                    FundInterestAccrual.deleted_at.is_(None),
+                    FundInterestAccrual.period_start <= period_end,
+                    FundInterestAccrual.period_end >= period_start
+                )
+            )
+        )
+        accrued, overlapping = set(), {}
+        for fund_id, accrued_start, accrued_end in result.all():
+            if (accrued_start, accrued_end) == (period_start, period_end):
+                accrued.add(fund_id)
+            else:
+                overlapping[fund_id] = f"{accrued_start} to {accrued_end}"
+        overlapping = {fund_id: period for fund_id, period in overlapping.items() if fund_id not in accrued}
+        if overlapping:
+            await self.db.rollback()
+            raise ValidationException(
+                detail=f"Interest was already accrued for part of {period_start} to {period_end} "
+                       f"on {len(overlapping)} funds",
+                metadata={"overlapping_periods": {str(fund_id): period for fund_id, period in sorted(overlapping.items())}}
+            )
+        fund_ids = [fund_id for fund_id in fund_ids if fund_id not in accrued]
+
+        # Days each transaction of the period contributes to the balance integral
+        remaining_days = func.extract(
+            "epoch", literal(cutoff, DateTime) - FundTransaction.transaction_date
+        ) / 86400
+        movements = select(
+            FundTransaction.fund_id,
+            func.sum(signed_amount()).label("since_start"),
+            func.sum(signed_amount() * remaining_days).filter(
+                FundTransaction.transaction_date < cutoff
+            ).label("weighted")
+        ).where(
+            and_(
+                FundTransaction.status == TransactionStatus.COMPLETED,
+                FundTransaction.deleted_at.is_(None),
+                FundTransaction.fund_id.in_(fund_ids),
+                FundTransaction.transaction_date >= start
+            )
+        ).group_by(FundTransaction.fund_id).subquery("movements")
+
+        opening = Fund.current_balance - func.coalesce(movements.c.since_start, 0)
+        balance_days = opening * days + func.coalesce(movements.c.weighted, 0)
+        interest = func.round(balance_days * Fund.interest_rate / 36500, 2)
+
+        query = select(
+            Fund.id,
+            Fund.building_id,
+            Fund.current_balance,
+            interest.label("interest")
+        ).outerjoin(
+            movements, movements.c.fund_id == Fund.id
+        ).where(
+            Fund.id.in_(fund_ids)
+        ).order_by(Fund.id)
+
+        try:
+            result = await self.db.execute(query)
+            accruals = [row for row in result.all() if row.interest > 0]
+
+            by_building: Dict[int, List[Any]] = defaultdict(list)
+            for row in accruals:
+                by_building[row.building_id].append(row)
+
+            rows = []
+            for building_id, building_accruals in by_building.items():
+                numbers = await next_numbers(self.db, building_id, len(building_accruals), prefix="FTX")
+                for row, reference_number in zip(building_accruals, numbers):
+                    rows.append({
+                        "fund_id": row.id,
+                        "status": TransactionStatus.COMPLETED,
+                        "payment_method": PaymentMethod.INTERNAL_TRANSFER,
+                        "transaction_type": TransactionType.INTEREST,
+                        "amount": row.interest,
+                        "balance_after": row.current_balance + row.interest,
+                        "reference_number": reference_number,
+                        "description": f"Interest {period_start} to {period_end}",
+                        "transaction_date": cutoff,
+                        "created_at": now,
+                        "updated_at": now,
+                        "is_deleted": False,
+                    })
+
+            posted: List[Dict[str, Any]] = []
+            periods: List[Dict[str, Any]] = []
+            for offset in range(0, len(rows), BULK_INSERT_SIZE):
+                inserted = await self.db.execute(
+                    insert(FundTransaction).values(
+                        rows[offset:offset + BULK_INSERT_SIZE]
+                    ).returning(FundTransaction.id, FundTransaction.fund_id, FundTransaction.balance_after)
+                )
+                for transaction_id, fund_id, balance_after in inserted.all():
+                    posted.append({"id": fund_id, "current_balance": balance_after, "updated_at": now})
+                    periods.append({
+                        "fund_id": fund_id,
+                        "transaction_id": transaction_id,
+                        "period_start": period_start,
+                        "period_end": period_end,
+                        "created_at": now,
+                        "updated_at": now,
+                        "is_deleted": False,
+                    })
+
+            if posted:
+                await self.db.execute(update(Fund), posted)
+                for offset in range(0, len(periods), BULK_INSERT_SIZE):
+                    await self.db.execute(
+                        insert(FundInterestAccrual).values(periods[offset:offset + BULK_INSERT_SIZE])
+                    )
+                for fund in posted:
+                    await invalidate_fund_balances(self.db, fund["id"], cutoff)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="accrue_interest",
+                detail=str(e)
+            )
+
+        posted_ids = {p["id"] for p in posted}
+        total = sum((row.interest for row in accruals if row.id in posted_ids), Decimal("0.00"))
+        logger.info(f"Posted interest of {total} to {len(posted)} funds for {period_start} to {period_end}")
+        return FundInterestResult(
+            period_start=period_start,
+            period_end=period_end,
+            funds_accrued=len(posted),
+            total_interest=total
+        )
+
+    @handle_exceptions
+    async def forecast(
+            self,
+            building_id: Optional[int] = None,
+            months: int = 12,
+            lookback_months: int = 12
+    ) -> FundForecastResponse:
+        """
+        Project month-end balances of all active funds over the coming months.
+
+        A building's inflow is its recurring charge schedule times its collection
+        rate over the lookback window, its outflow its recurring costs. Both are
+        split over the building's funds by their share of charge and cost linked
+        transactions in the lookback window, evenly without history. After
+        loading, all funds are projected at once as arrays.
+        """
+        first_month = month_index(utc_today()) + 1
+        forecast_months = [month_start(first_month + m) for m in range(months)]
+        lookback_start = datetime.combine(month_start(first_month - 1 - lookback_months), time.min)
+        now = utc_now()
+
+        fund_query = select(
+            Fund.id, Fund.name, Fund.building_id, Fund.current_balance, Fund.minimum_balance, Fund.target_amount
+        ).where(
+            and_(
+                Fund.status == FundStatus.ACTIVE,
+                Fund.deleted_at.is_(None)
+            )
+        ).order_by(Fund.id)
+        charge_query = select(
+            Charge.building_id,
+            func.coalesce(Charge.total_amount, Charge.amount),
+            Charge.due_date,
+            Charge.frequency
+        ).where(
+            and_(
+                Charge.recurring.is_(True),
+                Charge.parent_charge_id.is_(None),
+                Charge.frequency != ChargeFrequency.ONCE,
+                Charge.status != ChargeStatus.CANCELLED,
+                Charge.deleted_at.is_(None)
+            )
+        )
+        cost_query = select(
+            Cost.building_id, Cost.estimated_amount, Cost.planned_date, Cost.frequency_months
+        ).where(
+            and_(
+                Cost.is_recurring.is_(True),
+                Cost.frequency_months > 0,
+                Cost.status.notin_([CostStatus.CANCELLED, CostStatus.REJECTED]),
+                Cost.deleted_at.is_(None)
+            )
+        )
+        collection_query = select(
+            Charge.building_id,
+            func.sum(Charge.amount_paid),
+            func.sum(func.coalesce(Charge.total_amount, Charge.amount))
+        ).where(
+            and_(
+                Charge.due_date >= lookback_start,
+                Charge.due_date < now,
+                Charge.status != ChargeStatus.CANCELLED,
+                Charge.deleted_at.is_(None)
+            )
+        ).group_by(Charge.building_id)
+        history_query = select(
+            FundTransaction.fund_id,
+            func.sum(FundTransaction.amount).filter(
+                and_(
+                    FundTransaction.charge_id.isnot(None),
+                    FundTransaction.transaction_type.notin_(DEBIT_TYPES)
+                )
+            ),
+            func.sum(FundTransaction.amount).filter(
+                and_(
+                    FundTransaction.cost_id.isnot(None),
+                    FundTransaction.transaction_type.in_(DEBIT_TYPES)
+                )
+            )
+        ).where(
+            and_(
+                FundTransaction.status == TransactionStatus.COMPLETED,
+                FundTransaction.deleted_at.is_(None),
+                FundTransaction.transaction_date >= lookback_start
+            )
+        ).group_by(FundTransaction.fund_id)
+        if building_id is not None:
+            fund_query = fund_query.where(Fund.building_id == building_id)
+            charge_query = charge_query.where(Charge.building_id == building_id)
+            cost_query = cost_query.where(Cost.building_id == building_id)
+            collection_query = collection_query.where(Charge.building_id == building_id)
+            history_query = history_query.join(Fund, Fund.id == FundTransaction.fund_id).where(
+                Fund.building_id == building_id
+            )
+
+        funds = (await self.db.execute(fund_query)).all()
+        if not funds:
+            return FundForecastResponse(months=forecast_months, shortfalls=0, funds=[])
+
+        position = {b: i for i, b in enumerate(sorted({fund.building_id for fund in funds}))}
+        groups = len(position)
+        charges = [row for row in (await self.db.execute(charge_query)).all() if row[0] in position]
+        costs = [row for row in (await self.db.execute(cost_query)).all() if row[0] in position]
+        collections = (await self.db.execute(collection_query)).all()
+        history = {row[0]: row[1:] for row in (await self.db.execute(history_query)).all()}
+
+        # Collection rate per building, the portfolio rate where a building has no history
+        paid = np.zeros(groups)
+        billed = np.zeros(groups)
+        for charge_building, amount_paid, amount_billed in collections:
+            if charge_building in position:
+                paid[position[charge_building]] = amount_paid or 0
+                billed[position[charge_building]] = amount_billed or 0
+        portfolio_rate = paid.sum() / billed.sum() if billed.sum() > 0 else 1.0
+        rates = np.clip(np.where(billed > 0, paid / np.where(billed > 0, billed, 1), portfolio_rate), 0, 1)
+
+        charge_counts = occurrence_counts(
+            to_days([row[2] for row in charges]),
+            np.array([MONTH_STEPS.get(row[3], 0) for row in charges], dtype=np.int64),
+            np.array([DAY_STEPS.get(row[3], 0) for row in charges], dtype=np.int64),
+            first_month,
+            months
+        )
+        cost_counts = occurrence_counts(
+            to_days([row[2] for row in costs]),
+            np.array([row[3] for row in costs], dtype=np.int64),
+            np.zeros(len(costs), dtype=np.int64),
+            first_month,
+            months
+        )
+        income = monthly_totals(
+            np.array([position[row[0]] for row in charges], dtype=np.int64),
+            np.array([row[1] for row in charges], dtype=float),
+            charge_counts,
+            groups
+        ) * rates[:, None]
+        expenses = monthly_totals(
+            np.array([position[row[0]] for row in costs], dtype=np.int64),
+            np.array([row[1] for row in costs], dtype=float),
+            cost_counts,
+            groups
+        )
+
+        fund_group = np.array([position[fund.building_id] for fund in funds], dtype=np.int64)
+        collected = np.array([history.get(fund.id, (None, None))[0] or 0 for fund in funds], dtype=float)
+        spent = np.array([history.get(fund.id, (None, None))[1] or 0 for fund in funds], dtype=float)
+        projection = project_balances(
+            np.array([fund.current_balance for fund in funds], dtype=float),
+            np.array([fund.minimum_balance for fund in funds], dtype=float),
+            np.array([
+                fund.target_amount if fund.target_amount is not None else np.nan for fund in funds
+            ], dtype=float),
+            group_shares(collected, fund_group, groups)[:, None] * income[fund_group],
+            group_shares(spent, fund_group, groups)[:, None] * expenses[fund_group]
+        )
+
+        results = []
+        for i, fund in enumerate(funds):
+            balances = [Decimal(f"{value:.2f}") for value in projection.balances[i]]
+            shortfall, target = int(projection.first_shortfall[i]), int(projection.first_target[i])
+            results.append(FundForecast(
+                fund_id=fund.id,
+                name=fund.name,
+                building_id=fund.building_id,
+                current_balance=fund.current_balance,
+                minimum_balance=fund.minimum_balance,
+                target_amount=fund.target_amount,
+                balances=balances,
+                lowest_balance=min(balances, default=fund.current_balance),
+                shortfall=shortfall >= 0,
+                shortfall_month=forecast_months[shortfall] if shortfall >= 0 else None,
+                target_month=forecast_months[target] if target >= 0 else None
+            ))
+
+        return FundForecastResponse(
+            months=forecast_months,
+            shortfalls=sum(1 for result in results if result.shortfall),
+            funds=results
+        )
+
     @handle_exceptions
     async def get_monthly_report(
             self,
@@ -282,36 +1419,48 @@ class FundCRUD:
     ) -> Dict[str, Any]:
         """Generate monthly fund report"""
         fund = await self.get(fund_id)
-        start_date = datetime(year, month, 1, tzinfo=UTC)
-        end_date = (
-                           start_date + timedelta(days=32)
-                   ).replace(day=1) - timedelta(seconds=1)
+        start_date = datetime(year, month, 1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1)
+
+        opening_balance = await self.get_balance_at(fund_id, start_date)
 
         # Get transactions for the month
         tx_query = select(FundTransaction).where(
             and_(
                 FundTransaction.fund_id == fund_id,
-                FundTransaction.created_at.between(start_date, end_date)
+                FundTransaction.deleted_at.is_(None),
+                FundTransaction.transaction_date >= start_date,
+                FundTransaction.transaction_date < end_date
             )
-        ).order_by(FundTransaction.created_at)
+        ).order_by(FundTransaction.transaction_date, FundTransaction.id)
 
         result = await self.db.execute(tx_query)
         transactions = result.scalars().all()
 
+        closing_balance = opening_balance + sum(
+            (
+                -tx.amount if tx.transaction_type in DEBIT_TYPES else tx.amount
+                for tx in transactions
+                if tx.status == TransactionStatus.COMPLETED
+            ),
+            Decimal("0")
+        )
+
         return {
             "fund_name": fund.name,
             "period": f"{year}-{month:02d}",
-            "opening_balance": float(fund.current_balance),
-            "closing_balance": float(fund.current_balance),
+            "opening_balance": float(opening_balance),
+            "closing_balance": float(closing_balance),
             "minimum_balance": float(fund.minimum_balance),
             "transactions": [
                 {
-                    "date": tx.created_at.isoformat(),
+                    "date": tx.transaction_date.isoformat(),
                     "type": tx.transaction_type,
+                    "status": tx.status,
                     "amount": float(tx.amount),
                     "balance_after": float(tx.balance_after),
                     "reference": tx.reference_number
                 }
                 for tx in transactions
             ]
-        }
\ No newline at end of file
+        }
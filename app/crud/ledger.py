@@ -0,0 +1,362 @@
+from typing import AsyncIterator, Iterable, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    select, and_, or_, func, literal, union_all, tuple_, cast, delete, Numeric
+)
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import base64
+import binascii
+import json
+import logging
+
+from app.models.charge import Charge, Payment, ChargeStatus
+from app.models.ledger import AccountBalance, LedgerAccountType
+from app.models.unit import Unit
+from app.schemas.ledger import LedgerEntry, LedgerPage
+from app.utils.helpers import utc_now, utc_today
+from app.core.exceptions import (
+    ValidationException,
+    DatabaseOperationException,
+    handle_exceptions
+)
+
+logger = logging.getLogger(__name__)
+
+MONEY = Numeric(14, 2)
+
+# (entry_date, entry_type, entry_id, balance) of the last entry of a page
+LedgerCursor = Tuple[datetime, str, int, Decimal]
+
+
+def account_clause(account_type: LedgerAccountType, account_id: int):
+    """Build the filter selecting charges billed to a ledger account"""
+    if account_type == LedgerAccountType.UNIT:
+        return Charge.unit_id == account_id
+    owned_units = select(Unit.id).where(Unit.owner_id == account_id)
+    return or_(
+        Charge.owner_id == account_id,
+        Charge.unit_id.in_(owned_units)
+    )
+
+
+def period_cutoff(period_end: date) -> datetime:
+    """First instant after a period, entries before it belong to the period"""
+    return datetime.combine(period_end + timedelta(days=1), time.min)
+
+
+def is_closed_period(period_end: date) -> bool:
+    """Whether a month has ended, only then is its balance final and cached"""
+    return period_end < utc_today().replace(day=1)
+
+
+def encode_cursor(cursor: LedgerCursor) -> str:
+    entry_date, entry_type, entry_id, balance = cursor
+    payload = json.dumps([entry_date.isoformat(), entry_type, entry_id, str(balance)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(value: str) -> LedgerCursor:
+    try:
+        entry_date, entry_type, entry_id, balance = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return datetime.fromisoformat(entry_date), str(entry_type), int(entry_id), Decimal(balance)
+    except (binascii.Error, ValueError, TypeError, ArithmeticError):
+        raise ValidationException(detail="Invalid ledger cursor")
+
+
+async def invalidate_balances(
+        db: AsyncSession,
+        since: datetime,
+        unit_ids: Iterable[Optional[int]] = (),
+        owner_ids: Iterable[Optional[int]] = ()
+) -> None:
+    """
+    Drop cached period balances made stale by an entry dated `since`.
+
+    Owners of the given units are invalidated as well. The caller commits.
+    """
+    # Only closed months are cached, an entry in an open month changes none of them
+    if not is_closed_period(since.date()):
+        return
+
+    unit_ids = {unit_id for unit_id in unit_ids if unit_id is not None}
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id is not None}
+    if unit_ids:
+        result = await db.execute(select(Unit.owner_id).where(Unit.id.in_(unit_ids)))
+        owner_ids.update(owner_id for owner_id in result.scalars().all() if owner_id is not None)
+
+    accounts = []
+    if unit_ids:
+        accounts.append(and_(
+            AccountBalance.account_type == LedgerAccountType.UNIT,
+            AccountBalance.account_id.in_(unit_ids)
+        ))
+    if owner_ids:
+        accounts.append(and_(
+            AccountBalance.account_type == LedgerAccountType.OWNER,
+            AccountBalance.account_id.in_(owner_ids)
+        ))
+    if not accounts:
+        return
+
+    await db.execute(
+        delete(AccountBalance).where(
+            and_(
+                AccountBalance.period_end >= since.date(),
+                or_(*accounts)
+            )
+        )
+    )
+
+
+class LedgerCRUD:
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    def _entries(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None
+    ):
+        """Union of an account's charges (debits) and payments (credits)"""
+        clause = account_clause(account_type, account_id)
+
+        charges = select(
+            literal("charge").label("entry_type"),
+            Charge.id.label("entry_id"),
+            Charge.due_date.label("entry_date"),
+            Charge.title.label("description"),
+            Charge.total_amount.label("debit"),
+            cast(0, MONEY).label("credit")
+        ).where(
+            and_(
+                clause,
+                Charge.deleted_at.is_(None),
+                Charge.status != ChargeStatus.CANCELLED
+            )
+        )
+        payments = select(
+            literal("payment").label("entry_type"),
+            Payment.id.label("entry_id"),
+            Payment.payment_date.label("entry_date"),
+            Payment.transaction_id.label("description"),
+            cast(0, MONEY).label("debit"),
+            cast(Payment.amount, MONEY).label("credit")
+        ).join(
+            Charge, Payment.charge_id == Charge.id
+        ).where(
+            and_(
+                clause,
+                Payment.deleted_at.is_(None)
+            )
+        )
+
+        # Bound each branch separately so the date indexes are used
+        if date_from is not None:
+            charges = charges.where(Charge.due_date >= date_from)
+            payments = payments.where(Payment.payment_date >= date_from)
+        if date_to is not None:
+            charges = charges.where(Charge.due_date < date_to)
+            payments = payments.where(Payment.payment_date < date_to)
+
+        return union_all(charges, payments).subquery("entries")
+
+    def _statement_query(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            date_from: Optional[datetime],
+            date_to: Optional[datetime],
+            after: Optional[LedgerCursor] = None
+    ):
+        """Entries in statement order with their running total"""
+        entries = self._entries(account_type, account_id, date_from, date_to)
+        order = (entries.c.entry_date, entries.c.entry_type, entries.c.entry_id)
+
+        query = select(
+            entries,
+            func.sum(entries.c.debit - entries.c.credit).over(
+                order_by=order,
+                rows=(None, 0)
+            ).label("running_total")
+        )
+        if after is not None:
+            query = query.where(tuple_(*order) > tuple_(*after[:3]))
+        return query.order_by(*order)
+
+    async def _delta(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            date_from: Optional[datetime],
+            date_to: datetime
+    ) -> Decimal:
+        """Net of charges minus payments dated in [date_from, date_to)"""
+        entries = self._entries(account_type, account_id, date_from, date_to)
+        result = await self.db.execute(
+            select(func.coalesce(func.sum(entries.c.debit - entries.c.credit), 0))
+        )
+        return Decimal(result.scalar())
+
+    @handle_exceptions
+    async def get_opening_balance(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            start_date: date
+    ) -> Decimal:
+        """
+        Balance of an account before start_date.
+
+        Starts from the nearest cached month-end balance and adds the entries
+        after it. The month-end preceding start_date is cached on the way, if
+        that month has closed, so later statements only read the current
+        month's entries.
+        """
+        period_end = start_date.replace(day=1) - timedelta(days=1)
+
+        query = select(AccountBalance).where(
+            and_(
+                AccountBalance.account_type == account_type,
+                AccountBalance.account_id == account_id,
+                AccountBalance.period_end <= period_end
+            )
+        ).order_by(AccountBalance.period_end.desc()).limit(1)
+        result = await self.db.execute(query)
+        snapshot = result.scalar_one_or_none()
+
+        if snapshot is not None and snapshot.period_end == period_end:
+            balance = Decimal(snapshot.balance)
+        else:
+            balance = (Decimal(snapshot.balance) if snapshot else Decimal("0")) + await self._delta(
+                account_type,
+                account_id,
+                period_cutoff(snapshot.period_end) if snapshot else None,
+                period_cutoff(period_end)
+            )
+            if is_closed_period(period_end):
+                await self._store_balance(account_type, account_id, period_end, balance)
+
+        return balance + await self._delta(
+            account_type,
+            account_id,
+            period_cutoff(period_end),
+            datetime.combine(start_date, time.min)
+        )
+
+    async def _store_balance(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            period_end: date,
+            balance: Decimal
+    ) -> None:
+        """Cache a month-end balance"""
+        now = utc_now()
+        statement = insert(AccountBalance).values(
+            account_type=account_type,
+            account_id=account_id,
+            period_end=period_end,
+            balance=balance,
+            created_at=now,
+            updated_at=now,
+            is_deleted=False
+        ).on_conflict_do_update(
+            constraint="uq_account_balances_period",
+            set_={"balance": balance, "updated_at": now}
+        )
+
+        try:
+            await self.db.execute(statement)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="store_balance",
+                detail=str(e)
+            )
+
+    @handle_exceptions
+    async def get_statement(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            start_date: Optional[date] = None,
+            end_date: Optional[date] = None,
+            cursor: Optional[str] = None,
+            limit: int = 100
+    ) -> LedgerPage:
+        """
+        Get a page of an account statement.
+
+        The cursor carries the running balance of the last entry returned, so
+        each page only reads its own rows.
+        """
+        date_from = datetime.combine(start_date, time.min) if start_date else None
+        date_to = period_cutoff(end_date) if end_date else None
+
+        after = decode_cursor(cursor) if cursor else None
+        if after is not None:
+            opening_balance = after[3]
+        elif start_date is not None:
+            opening_balance = await self.get_opening_balance(account_type, account_id, start_date)
+        else:
+            opening_balance = Decimal("0")
+
+        query = self._statement_query(
+            account_type, account_id, date_from, date_to, after
+        ).limit(limit + 1)
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        entries = [self._to_entry(row, opening_balance) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = entries[-1]
+            next_cursor = encode_cursor((last.entry_date, last.entry_type, last.entry_id, last.balance))
+
+        return LedgerPage(
+            account_type=account_type,
+            account_id=account_id,
+            start_date=start_date,
+            end_date=end_date,
+            opening_balance=opening_balance,
+            entries=entries,
+            next_cursor=next_cursor
+        )
+
+    async def stream_statement(
+            self,
+            account_type: LedgerAccountType,
+            account_id: int,
+            start_date: Optional[date] = None,
+            end_date: Optional[date] = None,
+            batch_size: int = 1000
+    ) -> AsyncIterator[LedgerEntry]:
+        """Stream a whole statement from a server-side cursor"""
+        date_from = datetime.combine(start_date, time.min) if start_date else None
+        date_to = period_cutoff(end_date) if end_date else None
+        opening_balance = (
+            await self.get_opening_balance(account_type, account_id, start_date)
+            if start_date else Decimal("0")
+        )
+
+        query = self._statement_query(account_type, account_id, date_from, date_to)
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield self._to_entry(row, opening_balance)
+
+    @staticmethod
+    def _to_entry(row, opening_balance: Decimal) -> LedgerEntry:
+        return LedgerEntry(
+            entry_type=row.entry_type,
+            entry_id=row.entry_id,
+            entry_date=row.entry_date,
+            description=row.description,
+            debit=row.debit,
+            credit=row.credit,
+            balance=opening_balance + row.running_total
+        )
@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, cast, literal, tuple_, Date
+from datetime import date
+import logging
+
+from app.core.config import settings
+from app.crud.charge import open_charges_clause
+from app.models.charge import Charge
+from app.models.unit import Unit
+from app.schemas.report import DebtorAging, DebtorsReport
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_debtors_cache = TTLCache(ttl=settings.DEBTORS_REPORT_CACHE_SECONDS, maxsize=256)
+
+# Bitmask returned by GROUPING(unit_id, owner_id, tenant_id) for each grouping set
+_GROUPING_SETS = {
+    0b111: "buildings",
+    0b011: "units",
+    0b101: "owners",
+    0b110: "tenants",
+}
+
+
+async def generate_debtors_report(
+        db: AsyncSession,
+        building_id: Optional[int] = None,
+        as_of: Optional[date] = None
+) -> DebtorsReport:
+    """
+    Aging-bucket debtors report per building, unit, owner and tenant.
+
+    All four breakdowns come from one pass over the open charges using
+    GROUPING SETS; results are cached per building for a few minutes.
+    """
+    as_of = as_of or date.today()
+    cache_key = (building_id, as_of)
+    report = _debtors_cache.get(cache_key)
+    if report is not None:
+        return report
+
+    days_past_due = literal(as_of, Date) - cast(Charge.due_date, Date)
+    balance = Charge.balance_due
+    owner_id = func.coalesce(Charge.owner_id, Unit.owner_id)
+
+    def bucket(condition):
+        return func.coalesce(func.sum(balance).filter(condition), 0)
+
+    query = select(
+        Charge.building_id,
+        Charge.unit_id,
+        owner_id.label("owner_id"),
+        Charge.tenant_id,
+        func.grouping(Charge.unit_id, owner_id, Charge.tenant_id).label("grouping_set"),
+        bucket(days_past_due <= 0).label("current"),
+        bucket(days_past_due.between(1, 30)).label("days_1_30"),
+        bucket(days_past_due.between(31, 60)).label("days_31_60"),
+        bucket(days_past_due.between(61, 90)).label("days_61_90"),
+        bucket(days_past_due > 90).label("days_90_plus"),
+        func.coalesce(func.sum(balance), 0).label("total"),
+        func.count().label("open_charges")
+    ).select_from(Charge).outerjoin(
+        Unit, Charge.unit_id == Unit.id
+    ).where(
+        open_charges_clause()
+    ).group_by(
+        func.grouping_sets(
+            tuple_(Charge.building_id),
+            tuple_(Charge.building_id, Charge.unit_id),
+            tuple_(Charge.building_id, owner_id),
+            tuple_(Charge.building_id, Charge.tenant_id)
+        )
+    )
+    if building_id is not None:
+        query = query.where(Charge.building_id == building_id)
+
+    result = await db.execute(query)
+
+    sections: Dict[str, List[DebtorAging]] = {name: [] for name in _GROUPING_SETS.values()}
+    for row in result:
+        section = _GROUPING_SETS[row.grouping_set]
+        key = {
+            "buildings": None,
+            "units": row.unit_id,
+            "owners": row.owner_id,
+            "tenants": row.tenant_id,
+        }[section]
+        # Charges not linked to a unit/owner/tenant only count towards the building
+        if section != "buildings" and key is None:
+            continue
+        sections[section].append(DebtorAging(
+            building_id=row.building_id,
+            id=key,
+            current=row.current,
+            days_1_30=row.days_1_30,
+            days_31_60=row.days_31_60,
+            days_61_90=row.days_61_90,
+            days_90_plus=row.days_90_plus,
+            total=row.total,
+            open_charges=row.open_charges
+        ))
+
+    for rows in sections.values():
+        rows.sort(key=lambda aging: aging.total, reverse=True)
+
+    report = DebtorsReport(as_of=as_of, building_id=building_id, **sections)
+    _debtors_cache.set(cache_key, report)
+    logger.info(f"Generated debtors report for building {building_id} as of {as_of}")
+    return report
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -61,7 +61,8 @@ class CRUDTenant(CRUDBase[Tenant, TenantCreate, TenantUpdate]):
             *,
             skip: int = 0,
             limit: int = 100,
-            building_id: Optional[int] = None
+            building_id: Optional[int] = None,
+            options: Sequence[Any] = ()
     ) -> List[Tenant]:
         """
         Get multiple tenants with optional filtering.
@@ -71,11 +72,12 @@ class CRUDTenant(CRUDBase[Tenant, TenantCreate, TenantUpdate]):
             skip: Number of records to skip
             limit: Maximum number of records to return
             building_id: Optional building ID filter
+            options: Loader options, e.g. relationships to eager load
 
         Returns:
             List of tenant instances
         """
-        query = select(Tenant)
+        query = select(Tenant).options(*options)
         if building_id:
             query = query.filter(Tenant.building_id == building_id)
         query = query.offset(skip).limit(limit)
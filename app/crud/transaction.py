@@ -1,23 +1,41 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, func, text
-from datetime import datetime, UTC, timedelta
+from sqlalchemy import select, update, and_, or_, desc, func, text, case, exists, cast, Numeric
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta
 from decimal import Decimal
+from collections import Counter
+import asyncio
 import logging
 
+from app.models.fund import Fund, FundTransaction, TransactionStatus as FundTransactionStatus
 from app.models.transaction import (
     Transaction,
+    TransactionType,
     TransactionSplit,
     TransactionAttachment,
-    TransactionReconciliation
+    TransactionReconciliation,
+    ReconciliationRun,
+    ReconciliationSource,
+    MatchType
 )
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionFilter,
-    TransactionReconciliation as ReconciliationSchema
+    TransactionSplitCreate,
+    TransactionReconciliation as ReconciliationSchema,
+    BankStatementReconcile,
+    ReconciliationRunResponse,
+    ReconciliationPage,
+    ReconciliationReview
 )
-from core.exceptions import (
+from app.crud.fund import signed_amount
+from app.utils.helpers import utc_now
+from app.utils.numbering import next_number
+from app.utils.reconciliation import LedgerItem, StatementLine, match_statement
+from app.core.exceptions import (
+    BuildingManagementException,
     ResourceNotFoundException,
     DatabaseOperationException,
     BusinessLogicException,
@@ -26,6 +44,20 @@ from core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT of reconciliation results
+RECONCILIATION_BATCH_SIZE = 1000
+
+# Transaction types paying money out of the building's account
+OUTGOING_TYPES = (TransactionType.REFUND,)
+
+
+def signed_transaction_amount():
+    """Transaction amount signed like a bank statement line, negative for money leaving the account"""
+    return case(
+        (Transaction.transaction_type.in_(OUTGOING_TYPES), -Transaction.amount),
+        else_=Transaction.amount
+    )
+
 
 class TransactionCRUD:
     def __init__(self, db_session: AsyncSession):
@@ -38,13 +70,14 @@ class TransactionCRUD:
 
         # Generate transaction number if not provided
         if not transaction_data.transaction_number:
-            timestamp = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
-            transaction_data.transaction_number = f"TXN-{timestamp}"
+            transaction_data.transaction_number = await next_number(
+                self.db, transaction_data.building_id, prefix="TXN"
+            )
 
         transaction = Transaction(
             **transaction_data.dict(),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+            created_at=utc_now(),
+            updated_at=utc_now()
         )
 
         try:
@@ -98,13 +131,13 @@ class TransactionCRUD:
         # Handle status changes
         if "status" in update_data:
             if update_data["status"] == "completed":
-                update_data["approved_at"] = datetime.now(UTC)
+                update_data["approved_at"] = utc_now()
                 update_data["approved_by"] = "fastapi1403"
 
         for field, value in update_data.items():
             setattr(transaction, field, value)
 
-        transaction.updated_at = datetime.now(UTC)
+        transaction.updated_at = utc_now()
 
         try:
             await self.db.commit()
@@ -124,30 +157,67 @@ class TransactionCRUD:
             split_data: Dict[str, Any]
     ) -> TransactionSplit:
         """Add a split to a transaction"""
-        transaction = await self.get(transaction_id)
-
-        # Validate split amount
-        total_splits = await self.get_total_splits(transaction_id)
-        new_split_amount = Decimal(str(split_data["amount"]))
+        splits = await self.add_splits(transaction_id, [TransactionSplitCreate(**split_data)])
+        return splits[0]
 
-        if total_splits + new_split_amount > transaction.amount:
-            raise BusinessLogicException(
-                detail="Split amount exceeds remaining transaction amount",
-                code="INVALID_SPLIT_AMOUNT"
+    @handle_exceptions
+    async def add_splits(
+            self,
+            transaction_id: int,
+            splits: List[TransactionSplitCreate]
+    ) -> List[TransactionSplit]:
+        """
+        Allocate parts of a transaction, all or nothing.
+
+        The parent's allocated_amount is raised with a conditional UPDATE that
+        only matches while the allocation fits the transaction amount, so
+        concurrent splits cannot overshoot it. The splits are then written with
+        a single multi-row INSERT.
+        """
+        total = sum((Decimal(str(split.amount)) for split in splits), Decimal("0"))
+
+        statement = update(Transaction).where(
+            and_(
+                Transaction.id == transaction_id,
+                Transaction.deleted_at.is_(None),
+                Transaction.allocated_amount + total <= cast(Transaction.amount, Numeric(14, 2))
             )
+        ).values(
+            allocated_amount=Transaction.allocated_amount + total
+        ).returning(Transaction.id).execution_options(synchronize_session=False)
 
-        split = TransactionSplit(
-            transaction_id=transaction_id,
-            **split_data,
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
-        )
-
+        now = utc_now()
         try:
-            self.db.add(split)
+            result = await self.db.execute(statement)
+            if result.scalar_one_or_none() is None:
+                await self.db.rollback()
+                transaction = await self.get(transaction_id)
+                raise BusinessLogicException(
+                    detail="Split amount exceeds remaining transaction amount",
+                    code="INVALID_SPLIT_AMOUNT",
+                    metadata={
+                        "requested": float(total),
+                        "remaining": float(Decimal(str(transaction.amount)) - transaction.allocated_amount)
+                    }
+                )
+
+            inserted = await self.db.scalars(
+                insert(TransactionSplit).values([
+                    {
+                        "transaction_id": transaction_id,
+                        **split.model_dump(),
+                        "created_at": now,
+                        "updated_at": now,
+                        "is_deleted": False,
+                    }
+                    for split in splits
+                ]).returning(TransactionSplit)
+            )
+            created = inserted.all()
             await self.db.commit()
-            await self.db.refresh(split)
-            return split
+            return created
+        except BuildingManagementException:
+            raise
         except Exception as e:
             await self.db.rollback()
             raise DatabaseOperationException(
@@ -158,11 +228,8 @@ class TransactionCRUD:
     @handle_exceptions
     async def get_total_splits(self, transaction_id: int) -> Decimal:
         """Get total amount of splits for a transaction"""
-        query = select(func.sum(TransactionSplit.amount)).where(
-            TransactionSplit.transaction_id == transaction_id
-        )
-        result = await self.db.execute(query)
-        return result.scalar() or Decimal("0")
+        transaction = await self.get(transaction_id)
+        return transaction.allocated_amount
 
     @handle_exceptions
     async def add_attachment(
@@ -176,8 +243,8 @@ class TransactionCRUD:
         attachment = TransactionAttachment(
             transaction_id=transaction_id,
             **attachment_data,
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+            created_at=utc_now(),
+            updated_at=utc_now()
         )
 
         try:
@@ -229,30 +296,228 @@ class TransactionCRUD:
         return result.scalars().all()
 
     @handle_exceptions
-    async def reconcile(
+    async def reconcile(self, statement: BankStatementReconcile) -> ReconciliationRunResponse:
+        """
+        Reconcile a bank statement against transactions and fund transactions.
+
+        Ledger entries in the statement window are loaded once and matched in
+        memory (see app.utils.reconciliation); entries confirmed by an earlier
+        run are left out. Every line's outcome is stored for later review.
+        """
+        tolerance = timedelta(days=statement.date_tolerance_days)
+        date_from = min(line.date for line in statement.lines) - tolerance
+        date_to = max(line.date for line in statement.lines) + tolerance
+
+        items = []
+        for source in statement.sources:
+            items.extend(await self._ledger_items(source, date_from, date_to, statement.building_id))
+
+        lines = [
+            StatementLine(number, line.date, line.amount, line.reference, line.memo)
+            for number, line in enumerate(statement.lines, start=1)
+        ]
+        # Matching is CPU bound, keep the event loop responsive
+        matches, _ = await asyncio.to_thread(
+            match_statement, lines, items, tolerance, statement.min_memo_score
+        )
+        by_line = {match.line_number: match for match in matches}
+
+        now = utc_now()
+        run = ReconciliationRun(
+            building_id=statement.building_id,
+            statement_name=statement.statement_name,
+            date_from=date_from.date(),
+            date_to=date_to.date(),
+            date_tolerance_days=statement.date_tolerance_days,
+            total_lines=len(lines),
+            matched_lines=len(matches),
+            created_by=statement.created_by,
+            created_at=now,
+            updated_at=now
+        )
+
+        try:
+            self.db.add(run)
+            await self.db.flush()
+
+            rows = []
+            for line in lines:
+                match = by_line.get(line.line_number)
+                rows.append({
+                    "run_id": run.id,
+                    "line_number": line.line_number,
+                    "statement_date": line.date,
+                    "amount": line.amount,
+                    "reference": line.reference,
+                    "memo": line.memo,
+                    "match_type": MatchType(match.match_type) if match else MatchType.UNMATCHED,
+                    "source": ReconciliationSource(match.source) if match else None,
+                    "source_id": match.item_id if match else None,
+                    "score": match.score if match else 0.0,
+                    "reviewed": False,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_deleted": False,
+                })
+            for offset in range(0, len(rows), RECONCILIATION_BATCH_SIZE):
+                await self.db.execute(
+                    insert(TransactionReconciliation).values(rows[offset:offset + RECONCILIATION_BATCH_SIZE])
+                )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseOperationException(
+                operation="reconcile",
+                detail=str(e)
+            )
+
+        by_match_type = Counter(row["match_type"] for row in rows)
+        logger.info(f"Reconciliation run {run.id}: {len(matches)} of {len(lines)} lines matched")
+        return ReconciliationRunResponse(
+            id=run.id,
+            statement_name=run.statement_name,
+            building_id=run.building_id,
+            date_from=run.date_from,
+            date_to=run.date_to,
+            total_lines=run.total_lines,
+            matched_lines=run.matched_lines,
+            by_match_type=dict(by_match_type)
+        )
+
+    async def _ledger_items(
+            self,
+            source: ReconciliationSource,
+            date_from: datetime,
+            date_to: datetime,
+            building_id: Optional[int]
+    ) -> List[LedgerItem]:
+        """Load the ledger entries of one source in a window as plain tuples"""
+        if source == ReconciliationSource.FUND_TRANSACTION:
+            model = FundTransaction
+            entry_date = FundTransaction.transaction_date
+            query = select(
+                FundTransaction.id,
+                entry_date,
+                signed_amount(),
+                FundTransaction.reference_number,
+                FundTransaction.description
+            ).where(FundTransaction.status == FundTransactionStatus.COMPLETED)
+            if building_id:
+                query = query.where(
+                    FundTransaction.fund_id.in_(select(Fund.id).where(Fund.building_id == building_id))
+                )
+        else:
+            model = Transaction
+            entry_date = func.coalesce(Transaction.payment_date, Transaction.due_date)
+            query = select(
+                Transaction.id,
+                entry_date,
+                signed_transaction_amount(),
+                Transaction.reference_number,
+                Transaction.description
+            )
+            if building_id:
+                query = query.where(Transaction.building_id == building_id)
+
+        # Entries confirmed by an earlier run are already reconciled
+        confirmed = exists().where(
+            and_(
+                TransactionReconciliation.source == source,
+                TransactionReconciliation.source_id == model.id,
+                TransactionReconciliation.confirmed.is_(True)
+            )
+        )
+        query = query.where(
+            and_(
+                model.deleted_at.is_(None),
+                entry_date >= date_from,
+                entry_date <= date_to,
+                ~confirmed
+            )
+        )
+
+        result = await self.db.execute(query)
+        return [
+            LedgerItem(source.value, item_id, entry_date_value, Decimal(str(amount)), reference, memo)
+            for item_id, entry_date_value, amount, reference, memo in result.all()
+        ]
+
+    @handle_exceptions
+    async def get_reconciliation_run(self, run_id: int) -> ReconciliationRunResponse:
+        """Get a reconciliation run with its line counts per match type"""
+        run = await self.db.get(ReconciliationRun, run_id)
+        if not run or run.deleted_at is not None:
+            raise ResourceNotFoundException(
+                resource_type="ReconciliationRun",
+                resource_id=run_id
+            )
+
+        query = select(
+            TransactionReconciliation.match_type,
+            func.count(TransactionReconciliation.id)
+        ).where(
+            TransactionReconciliation.run_id == run_id
+        ).group_by(TransactionReconciliation.match_type)
+        result = await self.db.execute(query)
+
+        response = ReconciliationRunResponse.model_validate(run)
+        response.by_match_type = dict(result.all())
+        return response
+
+    @handle_exceptions
+    async def get_reconciliation_lines(
             self,
-            transaction_id: int,
-            reconciliation_data: ReconciliationSchema
-    ) -> TransactionReconciliation:
-        """Reconcile a transaction"""
-        transaction = await self.get(transaction_id)
+            run_id: int,
+            reviewed: Optional[bool] = None,
+            match_type: Optional[MatchType] = None,
+            after_line: int = 0,
+            limit: int = 500
+    ) -> ReconciliationPage:
+        """Page through the lines of a run in statement order"""
+        query = select(TransactionReconciliation).where(
+            and_(
+                TransactionReconciliation.run_id == run_id,
+                TransactionReconciliation.line_number > after_line
+            )
+        )
+        if reviewed is not None:
+            query = query.where(TransactionReconciliation.reviewed == reviewed)
+        if match_type:
+            query = query.where(TransactionReconciliation.match_type == match_type)
 
-        reconciliation = TransactionReconciliation(
-            transaction_id=transaction_id,
-            **reconciliation_data.dict(),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC)
+        query = query.order_by(TransactionReconciliation.line_number).limit(limit + 1)
+        result = await self.db.execute(query)
+        lines = result.scalars().all()
+
+        return ReconciliationPage(
+            items=[ReconciliationSchema.model_validate(line) for line in lines[:limit]],
+            next_line=lines[limit - 1].line_number if len(lines) > limit else None
         )
 
+    @handle_exceptions
+    async def review_reconciliation(self, run_id: int, review: ReconciliationReview) -> int:
+        """Confirm or reject matched lines of a run, returns the number of lines updated"""
+        statement = update(TransactionReconciliation).where(
+            and_(
+                TransactionReconciliation.run_id == run_id,
+                TransactionReconciliation.id.in_(review.ids)
+            )
+        ).values(
+            reviewed=True,
+            confirmed=review.confirmed,
+            reviewed_by=review.reviewed_by,
+            reviewed_at=utc_now(),
+            updated_at=utc_now()
+        ).execution_options(synchronize_session=False)
+
         try:
-            self.db.add(reconciliation)
+            result = await self.db.execute(statement)
             await self.db.commit()
-            await self.db.refresh(reconciliation)
-            return reconciliation
+            return result.rowcount
         except Exception as e:
             await self.db.rollback()
             raise DatabaseOperationException(
-                operation="reconcile",
+                operation="review_reconciliation",
                 detail=str(e)
             )
 
@@ -1,9 +1,10 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.crud.ledger import invalidate_balances
 from app.models.unit import Unit
 from app.schemas.unit import UnitCreate, UnitUpdate
 
@@ -53,7 +54,15 @@ class CRUDUnit(CRUDBase[Unit, UnitCreate, UnitUpdate]):
             Updated unit instance
         """
         obj_data = obj_in.model_dump(exclude_unset=True) if isinstance(obj_in, UnitUpdate) else obj_in
-        return await super().update(db, db_obj=db_obj, obj_in=obj_data)
+        previous_owner_id = db_obj.owner_id
+        unit = await super().update(db, db_obj=db_obj, obj_in=obj_data)
+
+        # Owner balances cover the units they own now, so every cached
+        # month of both owners is stale once the unit changes hands
+        if unit.owner_id != previous_owner_id:
+            await invalidate_balances(db, datetime.min, owner_ids=(previous_owner_id, unit.owner_id))
+            await db.commit()
+        return unit
 
     async def get_multi(
             self,
@@ -61,7 +70,8 @@ class CRUDUnit(CRUDBase[Unit, UnitCreate, UnitUpdate]):
             *,
             skip: int = 0,
             limit: int = 100,
-            building_id: Optional[int] = None
+            building_id: Optional[int] = None,
+            options: Sequence[Any] = ()
     ) -> List[Unit]:
         """
         Get multiple units with optional filtering.
@@ -71,11 +81,12 @@ class CRUDUnit(CRUDBase[Unit, UnitCreate, UnitUpdate]):
             skip: Number of records to skip
             limit: Maximum number of records to return
             building_id: Optional building ID filter
+            options: Loader options, e.g. relationships to eager load
 
         Returns:
             List of unit instances
         """
-        query = select(Unit)
+        query = select(Unit).options(*options)
         if building_id:
             query = query.filter(Unit.building_id == building_id)
         query = query.offset(skip).limit(limit)
@@ -1,4 +1,4 @@
-from models.base import *  # noqa
+from app.models.base import *  # noqa
 
 # Alembic will import this
 __all__ = ["TableBase"]
\ No newline at end of file
@@ -0,0 +1,8 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Session handed out by get_db instead of a new one, set by the batch endpoint
+# so the writes of a batch share one transaction
+shared_session: ContextVar[Optional[AsyncSession]] = ContextVar("shared_session", default=None)
@@ -1,10 +1,13 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from core.config import settings
+from app.core.config import settings
+from app.db.scope import shared_session
 
 engine = create_async_engine(
     settings.async_database_url,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     future=True,
     echo=True,
 )
@@ -16,6 +19,12 @@ AsyncSessionLocal = sessionmaker(
 )
 
 async def get_db():
+    session = shared_session.get()
+    if session is not None:
+        # Owned by the batch that set it, which commits and closes it
+        yield session
+        return
+
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -5,7 +5,7 @@ from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
 
 from app.db.session import get_db
-from crud import crud_building
+from app.crud import crud_building
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
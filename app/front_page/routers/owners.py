@@ -6,7 +6,7 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from crud import crud_owner
+from app.crud import crud_owner
 
 router = APIRouter(prefix="/dashboard")
 templates = Jinja2Templates(directory="app/templates")
@@ -1,20 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.templating import Jinja2Templates
-from core.config import settings
+from app.core.config import settings
+from app.core.admission import AdmissionController, AdmissionMiddleware
+from app.core.compression import CompressionMiddleware, PrecompressedStaticFiles
+from app.core.response_cache import ResponseCacheMiddleware, response_cache
+from app.core.responses import FastJSONResponse
+from app.core.single_flight import SingleFlightMiddleware
+from app.db.session import engine
 from app.api.v1 import (
     buildings,
     floors,
     units,
     owners,
     tenants,
-    # funds,
-    # transactions,
+    funds,
+    transactions,
     charges,
     # costs,
+    ledger,
+    reports,
+    exports,
+    batch,
 )
 from app.front_page.routers import (
     dashboard as front_page_dashboard,
@@ -26,13 +37,40 @@ from app.front_page.routers import (
     home as front_page_home,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Runs once the server has drained in-flight requests
+    await response_cache.close()
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    description="Building Management System API"
+    description="Building Management System API",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
+# Shed load before it reaches the connection pool; cache hits skip it
+admission = AdmissionController(
+    capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT
+)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
+# Collapse bursts of identical reads into one, outside admission so waiting copies take no slot
+if settings.SINGLE_FLIGHT_ENABLED:
+    app.add_middleware(SingleFlightMiddleware)
+
+# Serve repeated entity reads from the response cache, inside CORS and compression so they apply per request
+if settings.RESPONSE_CACHE_ENABLED or (settings.RESPONSE_CACHE_ENABLED is None and response_cache.shared):
+    app.add_middleware(ResponseCacheMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +80,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and HTML responses, static files come precompressed
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    level=settings.COMPRESSION_LEVEL
+)
+
 # Add error handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -51,19 +96,24 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="app/templates")
 
 # Include routers
+app.include_router(exports.router, prefix=settings.API_V1_STR, tags=["exports"])
+app.include_router(batch.router, prefix=settings.API_V1_STR, tags=["batch"])
 app.include_router(buildings.router, prefix=settings.API_V1_STR, tags=["buildings"])
 app.include_router(floors.router, prefix=settings.API_V1_STR, tags=["floors"])
 app.include_router(units.router, prefix=settings.API_V1_STR, tags=["units"])
 app.include_router(owners.router, prefix=settings.API_V1_STR, tags=["owners"])
 app.include_router(tenants.router, prefix=settings.API_V1_STR, tags=["tenants"])
-# app.include_router(funds.router, prefix=settings.API_V1_STR, tags=["funds"])
-# app.include_router(transactions.router, prefix=settings.API_V1_STR, tags=["transactions"])
+app.include_router(charges.router, prefix=settings.API_V1_STR, tags=["charges"])
+app.include_router(ledger.router, prefix=settings.API_V1_STR, tags=["ledger"])
+app.include_router(reports.router, prefix=settings.API_V1_STR, tags=["reports"])
+app.include_router(funds.router, prefix=settings.API_V1_STR, tags=["funds"])
+app.include_router(transactions.router, prefix=settings.API_V1_STR, tags=["transactions"])
 app.include_router(front_page_dashboard.router, prefix="", tags=["dashboards"])
 app.include_router(front_page_buildings.router, prefix="", tags=["dashboards"])
 app.include_router(front_page_home.router, prefix="", tags=["dashboards"])
@@ -76,4 +126,17 @@ app.include_router(front_page_units.router, prefix="", tags=["dashboards"])
 # Add health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+# Admission limits, queue depths and pool usage for Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    pool = engine.pool
+    return PlainTextResponse(
+        admission.render_metrics()
+        + "# HELP db_pool_checked_out Connections of the pool in use\n"
+        + "# TYPE db_pool_checked_out gauge\n"
+        + f"db_pool_checked_out {pool.checkedout()}\n",
+        media_type="text/plain; version=0.0.4"
+    )
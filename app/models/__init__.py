@@ -3,7 +3,9 @@ from app.models.floor import Floor
 from app.models.unit import Unit
 from app.models.owner import Owner
 from app.models.tenant import Tenant
+from app.models.ledger import AccountBalance
+from app.models.table_version import TableVersion
 
 __all__ = [
-    "Building", "Floor", "Unit", "Owner", "Tenant"
+    "Building", "Floor", "Unit", "Owner", "Tenant", "AccountBalance", "TableVersion"
 ]
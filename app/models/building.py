@@ -28,6 +28,11 @@ class Building(TableBase, table=True):
         default=None,
         description="Description of the building"
     )
+    transaction_number_format: Optional[str] = Field(
+        default=None,
+        max_length=100,
+        description="Format of transaction numbers, e.g. 'B1-{year}-{number:06d}'"
+    )
 
     # Relationships
     floors: List["Floor"] = Relationship(back_populates="building")
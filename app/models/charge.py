@@ -1,8 +1,9 @@
 from datetime import datetime, UTC
+from decimal import Decimal
 from enum import Enum
 from typing import Optional, List
 
-from sqlalchemy import Column, Enum as SQLEnum
+from sqlalchemy import Column, Computed, Enum as SQLEnum, Index, Numeric, UniqueConstraint, text
 from sqlmodel import Field, Relationship
 
 from app.models.base import TableBase
@@ -41,10 +42,46 @@ class ChargeFrequency(str, Enum):
     YEARLY = "yearly"
 
 
+# Rows covered by the open-charge partial indexes
+OPEN_CHARGES_PREDICATE = (
+    "status IN ('PENDING', 'OVERDUE', 'PARTIALLY_PAID') AND deleted_at IS NULL"
+)
+
+
+# Generated column expressions, kept in sync with the alembic migration
+TAX_AMOUNT_SQL = (
+    "CASE WHEN is_taxable AND COALESCE(tax_rate, 0) > 0 "
+    "THEN round((amount * tax_rate / 100)::numeric, 2) ELSE 0 END"
+)
+TOTAL_AMOUNT_SQL = f"round(amount::numeric, 2) + {TAX_AMOUNT_SQL}"
+BALANCE_DUE_SQL = f"{TOTAL_AMOUNT_SQL} - round(amount_paid::numeric, 2)"
+
+
 # Model for managing charges/fees in the building management system
 class Charge(TableBase, table=True):
     __tablename__ = "charges"
-    # __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_charges_unit_id_due_date", "unit_id", "due_date", "id"),
+        Index("ix_charges_owner_id_due_date", "owner_id", "due_date", "id"),
+        # Partial indexes over open charges for aging/debtors reports
+        Index(
+            "ix_charges_open_status_due_date", "status", "due_date",
+            postgresql_where=text(OPEN_CHARGES_PREDICATE)
+        ),
+        Index(
+            "ix_charges_open_building_due_date", "building_id", "due_date",
+            postgresql_where=text(OPEN_CHARGES_PREDICATE)
+        ),
+        # "Who owes the most" per building
+        Index(
+            "ix_charges_building_balance_due", "building_id", text("balance_due DESC"),
+            postgresql_where=text("balance_due > 0 AND deleted_at IS NULL")
+        ),
+        # One materialized occurrence per recurring charge and due date
+        UniqueConstraint("parent_charge_id", "due_date", name="uq_charges_parent_due_date"),
+    )
+    # Fetch generated columns with RETURNING instead of expiring them on flush
+    __mapper_args__ = {"eager_defaults": True}
 
     # Charge details
     title: str = Field(..., max_length=100)
@@ -68,6 +105,11 @@ class Charge(TableBase, table=True):
         default=ChargeFrequency.ONCE
     )
     recurring: bool = Field(default=False)
+    parent_charge_id: Optional[int] = Field(
+        default=None,
+        foreign_key="charges.id",
+        description="Recurring charge this occurrence was generated from"
+    )
 
     # Payment tracking
     amount_paid: float = Field(default=0.0)
@@ -86,6 +128,23 @@ class Charge(TableBase, table=True):
     tax_rate: Optional[float] = Field(default=0.0)
     is_taxable: bool = Field(default=False)
 
+    # Stored generated columns, computed by the database on every write
+    tax_amount: Optional[Decimal] = Field(
+        default=None,
+        sa_column=Column(Numeric(14, 2), Computed(TAX_AMOUNT_SQL, persisted=True)),
+        description="Tax amount if the charge is taxable"
+    )
+    total_amount: Optional[Decimal] = Field(
+        default=None,
+        sa_column=Column(Numeric(14, 2), Computed(TOTAL_AMOUNT_SQL, persisted=True)),
+        description="Total amount including tax"
+    )
+    balance_due: Optional[Decimal] = Field(
+        default=None,
+        sa_column=Column(Numeric(14, 2), Computed(BALANCE_DUE_SQL, persisted=True)),
+        description="Remaining balance"
+    )
+
     # Relationships
     unit: Optional["Unit"] = Relationship(back_populates="charges")
     owner: Optional["Owner"] = Relationship(back_populates="charges")
@@ -112,23 +171,6 @@ class Charge(TableBase, table=True):
             }
         }
 
-    @property
-    def tax_amount(self) -> float:
-        """Calculate tax amount if charge is taxable"""
-        if self.is_taxable and self.tax_rate > 0:
-            return round(self.amount * (self.tax_rate / 100), 2)
-        return 0.0
-
-    @property
-    def total_amount(self) -> float:
-        """Calculate total amount including tax"""
-        return round(self.amount + self.tax_amount, 2)
-
-    @property
-    def balance_due(self) -> float:
-        """Calculate remaining balance"""
-        return round(self.total_amount - self.amount_paid, 2)
-
     @property
     def is_overdue(self) -> bool:
         """Check if charge is overdue"""
@@ -151,7 +193,9 @@ class Charge(TableBase, table=True):
 # Model for tracking payments against charges
 class Payment(TableBase, table=True):
     __tablename__ = "payments"
-    # __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_payments_charge_id_payment_date", "charge_id", "payment_date"),
+    )
 
     charge_id: int = Field(..., foreign_key="charges.id")
     amount: float = Field(..., gt=0)
@@ -1,12 +1,13 @@
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 from decimal import Decimal
 from enum import Enum
 from typing import Optional, List
 
-from sqlalchemy import Column, Enum as SQLEnum, Index
+from sqlalchemy import Column, Enum as SQLEnum, Index, UniqueConstraint, text
 from sqlmodel import Field, Relationship
 
 from app.models.base import TableBase
+from app.utils.helpers import utc_now
 
 
 # Enum for fund types
@@ -53,6 +54,12 @@ class TransactionStatus(str, Enum):
     PROCESSING = "processing"  # Currently processing
 
 
+# Enumeration for approval decisions
+class ApprovalDecision(str, Enum):
+    APPROVED = "approved"  # Transaction applied to the fund
+    REJECTED = "rejected"  # Transaction cancelled
+
+
 # Enumeration for payment methods
 class PaymentMethod(str, Enum):
     CASH = "cash"
@@ -88,6 +95,7 @@ class Fund(TableBase, table=True):
     current_balance: Decimal = Field(default=Decimal('0.00'), description="Current balance of the fund")
     target_amount: Optional[Decimal] = Field(default=None, description="Target amount for the fund")
     minimum_balance: Decimal = Field(default=Decimal('0.00'), description="Minimum required balance for the fund")
+    interest_rate: Optional[Decimal] = Field(default=None, description="Annual interest rate in percent")
 
     # Association
     building_id: int = Field(..., foreign_key="buildings.id", description="ID of the building this fund belongs to")
@@ -141,7 +149,17 @@ class Fund(TableBase, table=True):
 # Model for tracking fund transactions
 class FundTransaction(TableBase, table=True):
     __tablename__ = "fund_transactions"
-    # __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_fund_transactions_fund_id_transaction_date", "fund_id", "transaction_date"),
+        # Approval queue listing
+        Index("ix_fund_transactions_fund_id_status", "fund_id", "status", "transaction_date"),
+        # One interest posting per fund and period, interest is dated at the period cutoff
+        Index(
+            "uq_fund_transactions_interest_period", "fund_id", "transaction_date",
+            unique=True,
+            postgresql_where=text("transaction_type = 'INTEREST'")
+        ),
+    )
 
     fund_id: int = Field(..., foreign_key="funds.id", description="ID of the associated fund")
     status: TransactionStatus = Field(
@@ -196,6 +214,89 @@ class FundTransaction(TableBase, table=True):
         }
 
 
+# Model for fund balances at the end of a period, maintained by the snapshot job
+class FundBalance(TableBase, table=True):
+    __tablename__ = "fund_balances"
+    __table_args__ = (
+        UniqueConstraint("fund_id", "period_end", name="uq_fund_balances_period"),
+    )
+
+    fund_id: int = Field(..., foreign_key="funds.id", description="ID of the fund")
+    period_end: date = Field(..., description="Last day of the period covered by the balance")
+    balance: Decimal = Field(
+        default=Decimal('0.00'),
+        description="Fund balance after all completed transactions up to and including period_end"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "fund_id": 1,
+                "period_end": "2025-01-31",
+                "balance": "10500.00"
+            }
+        }
+
+
+# Model for the periods interest was posted for, which must not overlap per fund
+class FundInterestAccrual(TableBase, table=True):
+    __tablename__ = "fund_interest_accruals"
+    __table_args__ = (
+        UniqueConstraint("fund_id", "period_start", "period_end", name="uq_fund_interest_accruals_period"),
+    )
+
+    fund_id: int = Field(..., foreign_key="funds.id", description="ID of the fund")
+    transaction_id: int = Field(
+        ...,
+        foreign_key="fund_transactions.id",
+        description="ID of the interest posting"
+    )
+    period_start: date = Field(..., description="First day the interest was earned on")
+    period_end: date = Field(..., description="Last day the interest was earned on")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "fund_id": 1,
+                "transaction_id": 42,
+                "period_start": "2025-01-01",
+                "period_end": "2025-01-31"
+            }
+        }
+
+
+# Model for approval decisions on pending fund transactions
+class FundApproval(TableBase, table=True):
+    __tablename__ = "fund_approvals"
+
+    transaction_id: int = Field(
+        ...,
+        foreign_key="fund_transactions.id",
+        index=True,
+        description="ID of the pending transaction decided on"
+    )
+    fund_id: int = Field(..., foreign_key="funds.id", description="ID of the fund")
+    decision: ApprovalDecision = Field(
+        sa_column=Column(SQLEnum(ApprovalDecision), nullable=False),
+        description="Decision taken on the transaction"
+    )
+    approver: str = Field(..., max_length=100, description="User who took the decision")
+    comment: Optional[str] = Field(default=None, max_length=500, description="Reason for the decision")
+    decided_at: datetime = Field(default_factory=utc_now, description="Date of the decision")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transaction_id": 1,
+                "fund_id": 1,
+                "decision": "approved",
+                "approver": "fastapi1403",
+                "comment": "Roof repair invoice checked",
+                "decided_at": "2025-01-17T09:30:00Z"
+            }
+        }
+
+
 # Forward references for type hints
 from app.models.building import Building
 from app.models.charge import Charge
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import Column, Enum as SQLEnum, UniqueConstraint
+from sqlmodel import Field
+
+from app.models.base import TableBase
+
+
+# Enumeration for ledger account types
+class LedgerAccountType(str, Enum):
+    UNIT = "unit"  # Charges billed to a unit
+    OWNER = "owner"  # Charges billed to an owner or any unit they own
+
+
+# Model for caching account balances at the end of a period
+class AccountBalance(TableBase, table=True):
+    __tablename__ = "account_balances"
+    __table_args__ = (
+        UniqueConstraint("account_type", "account_id", "period_end", name="uq_account_balances_period"),
+    )
+
+    account_type: LedgerAccountType = Field(
+        sa_column=Column(SQLEnum(LedgerAccountType), nullable=False),
+        description="Type of the ledger account"
+    )
+    account_id: int = Field(..., description="ID of the unit or owner")
+    period_end: date = Field(..., description="Last day of the period covered by the balance")
+    balance: Decimal = Field(
+        default=Decimal('0.00'),
+        description="Charges minus payments dated up to and including period_end"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "account_type": "unit",
+                "account_id": 1,
+                "period_end": "2025-01-31",
+                "balance": "250.00"
+            }
+        }
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, text
+from sqlmodel import Field, SQLModel
+
+# Tables whose triggers bump their row in table_versions when a transaction writing them commits
+VERSIONED_TABLES = ("buildings", "floors", "units", "owners", "tenants")
+
+
+# Model for per-table change counters, maintained by database triggers
+class TableVersion(SQLModel, table=True):
+    __tablename__ = "table_versions"
+
+    table_name: str = Field(primary_key=True, max_length=63, description="Name of the counted table")
+    version: int = Field(
+        default=0,
+        sa_column=Column(BigInteger, nullable=False, server_default=text("0")),
+        description="Incremented by every committed transaction that writes to the table"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "table_name": "buildings",
+                "version": 42
+            }
+        }
@@ -1,9 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Column, Enum as SQLEnum
+from sqlalchemy import Column, Enum as SQLEnum, Index, text
 from sqlmodel import Field, Relationship
 
 from app.models.base import TableBase
@@ -46,30 +46,107 @@ class PaymentMethod(str, Enum):
     OTHER = "other"
 
 
+# Model for the allocation of part of a transaction, e.g. a bill split over units
+class TransactionSplit(TableBase, table=True):
+    __tablename__ = "transaction_splits"
+
+    transaction_id: int = Field(..., foreign_key="transactions.id", index=True,
+                                description="ID of the split transaction")
+    amount: Decimal = Field(..., description="Amount allocated by the split")
+    unit_id: Optional[int] = Field(default=None, foreign_key="units.id",
+                                   description="ID of the unit the amount is allocated to")
+    description: Optional[str] = Field(default=None, max_length=200, description="Description of the split")
+    notes: Optional[str] = Field(default=None, max_length=500, description="Additional notes")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transaction_id": 1,
+                "amount": "25.50",
+                "unit_id": 101,
+                "description": "Unit 101 share of the January water bill"
+            }
+        }
+
+
+# Model for documents attached to a transaction
+class TransactionAttachment(TableBase, table=True):
+    __tablename__ = "transaction_attachments"
+
+    transaction_id: int = Field(..., foreign_key="transactions.id", index=True)
+
+    # Document information
+    title: str = Field(..., max_length=200)
+    file_path: str = Field(..., max_length=500)
+    file_size: int = Field(...)  # in bytes
+    mime_type: str = Field(..., max_length=100)
+    description: Optional[str] = Field(default=None, max_length=500)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "transaction_id": 1,
+                "title": "Bank receipt",
+                "file_path": "/documents/receipts/txn_1.pdf",
+                "file_size": 204800,
+                "mime_type": "application/pdf"
+            }
+        }
+
+
+# Enumeration for ledgers a bank statement is reconciled against
+class ReconciliationSource(str, Enum):
+    TRANSACTION = "transaction"  # Rows of the transactions table
+    FUND_TRANSACTION = "fund_transaction"  # Rows of the fund_transactions table
+
+
+# Enumeration for how a statement line was matched
+class MatchType(str, Enum):
+    REFERENCE = "reference"  # Same normalized reference
+    AMOUNT_DATE = "amount_date"  # Same amount within the date tolerance
+    MEMO = "memo"  # Same amount and similar memo
+    UNMATCHED = "unmatched"  # No ledger entry found
+
+
 # Model for representing a transaction in the building management system
 class Transaction(TableBase, table=True):
     __tablename__ = "transactions"
     # __table_args__ = {'extend_existing': True}
 
+    # Enum type names differ from the fund enums of the same class names
     transaction_type: TransactionType = Field(
-        sa_column=Column(SQLEnum(TransactionType)),
+        sa_column=Column(SQLEnum(TransactionType, name="paymenttransactiontype")),
         description="Type of the transaction"
     )
     status: TransactionStatus = Field(
-        sa_column=Column(SQLEnum(TransactionStatus)),
+        sa_column=Column(SQLEnum(TransactionStatus, name="paymenttransactionstatus")),
         default=TransactionStatus.PENDING,
         description="Status of the transaction"
     )
     payment_method: PaymentMethod = Field(
-        sa_column=Column(SQLEnum(PaymentMethod)),
+        sa_column=Column(SQLEnum(PaymentMethod, name="paymenttransactionmethod")),
         description="Payment method used for the transaction"
     )
     building_id: int = Field(foreign_key="buildings.id", description="ID of the associated building")
     unit_id: int = Field(foreign_key="units.id", description="ID of the associated unit")
     tenant_id: int = Field(foreign_key="tenants.id", description="ID of the associated tenant")
     fund_id: int = Field(foreign_key="funds.id", description="ID of the associated fund")
-    type: TransactionType = Field(description="Type of the transaction")
+    type: TransactionType = Field(
+        sa_column=Column(SQLEnum(TransactionType, name="paymenttransactiontype"), nullable=False),
+        description="Type of the transaction"
+    )
+    transaction_number: Optional[str] = Field(
+        default=None,
+        max_length=50,
+        unique=True,
+        description="Human-readable transaction number, allocated when not given"
+    )
     amount: float = Field(description="Amount of the transaction")
+    allocated_amount: Decimal = Field(
+        default=Decimal('0.00'),
+        sa_column_kwargs={"server_default": text("0")},
+        description="Sum of the splits of the transaction, maintained on every split insert"
+    )
     description: Optional[str] = Field(default=None, description="Description of the transaction")
     reference_number: Optional[str] = Field(default=None, description="Reference number for the transaction")
     due_date: datetime = Field(description="Due date for the transaction")
@@ -103,5 +180,84 @@ class Transaction(TableBase, table=True):
         }
 
 
+# Model for a bank statement reconciliation run
+class ReconciliationRun(TableBase, table=True):
+    __tablename__ = "reconciliation_runs"
+
+    building_id: Optional[int] = Field(
+        default=None,
+        foreign_key="buildings.id",
+        description="Building whose ledgers were matched, all buildings when empty"
+    )
+    statement_name: Optional[str] = Field(default=None, max_length=200, description="Name of the bank statement")
+    date_from: date = Field(..., description="First day of the matched window")
+    date_to: date = Field(..., description="Last day of the matched window")
+    date_tolerance_days: int = Field(default=3, description="Allowed date difference for amount matches")
+    total_lines: int = Field(default=0, description="Number of statement lines")
+    matched_lines: int = Field(default=0, description="Number of statement lines matched")
+    created_by: str = Field(default="fastapi1403", max_length=100, description="User who ran the reconciliation")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "building_id": 1,
+                "statement_name": "Bank statement January 2025",
+                "date_from": "2024-12-29",
+                "date_to": "2025-02-03",
+                "date_tolerance_days": 3,
+                "total_lines": 1200,
+                "matched_lines": 1184
+            }
+        }
+
+
+# Model for the match of one bank statement line, reviewed incrementally
+class TransactionReconciliation(TableBase, table=True):
+    __tablename__ = "transaction_reconciliations"
+    __table_args__ = (
+        Index("ix_transaction_reconciliations_run_review", "run_id", "reviewed", "line_number"),
+        Index("ix_transaction_reconciliations_source", "source", "source_id"),
+    )
+
+    run_id: int = Field(..., foreign_key="reconciliation_runs.id", description="ID of the reconciliation run")
+    line_number: int = Field(..., description="Position of the line in the statement")
+    statement_date: datetime = Field(..., description="Booking date on the statement")
+    amount: Decimal = Field(..., description="Signed amount on the statement")
+    reference: Optional[str] = Field(default=None, max_length=100, description="Reference on the statement")
+    memo: Optional[str] = Field(default=None, max_length=500, description="Memo on the statement")
+    match_type: MatchType = Field(
+        sa_column=Column(SQLEnum(MatchType), nullable=False),
+        description="How the line was matched"
+    )
+    source: Optional[ReconciliationSource] = Field(
+        default=None,
+        sa_column=Column(SQLEnum(ReconciliationSource), nullable=True),
+        description="Ledger of the matched entry"
+    )
+    source_id: Optional[int] = Field(default=None, description="ID of the matched ledger entry")
+    score: float = Field(default=0.0, description="Match confidence between 0 and 1")
+    reviewed: bool = Field(default=False, description="Whether a user reviewed the match")
+    confirmed: Optional[bool] = Field(default=None, description="Review outcome, empty until reviewed")
+    reviewed_by: Optional[str] = Field(default=None, max_length=100, description="User who reviewed the match")
+    reviewed_at: Optional[datetime] = Field(default=None, description="Date of the review")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "run_id": 1,
+                "line_number": 17,
+                "statement_date": "2025-01-03T00:00:00",
+                "amount": "1500.00",
+                "reference": "TRX-2025-001",
+                "memo": "Rent unit 101 January",
+                "match_type": "reference",
+                "source": "transaction",
+                "source_id": 42,
+                "score": 1.0,
+                "reviewed": False
+            }
+        }
+
+
 # Forward references for type hints
 from app.models.fund import Fund
@@ -30,7 +30,7 @@ class Unit(TableBase, table=True):
 
     floor_id: int = Field(foreign_key="floors.id", description="ID of the associated floor")
     unit_number: str = Field(..., index=True, description="Unique number of the unit")
-    owner_id: int = Field(foreign_key="owners.id", description="ID of the owner of this unit")
+    owner_id: int = Field(foreign_key="owners.id", index=True, description="ID of the owner of this unit")
     type: UnitType = Field(default=UnitType.RESIDENTIAL, description="Type of the unit")
     status: UnitStatus = Field(default=UnitStatus.OCCUPIED, description="Status of the unit")
     area: float = Field(description="Area of the unit in square meters")
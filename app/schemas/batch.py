@@ -0,0 +1,41 @@
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# Sub-operations accepted in one batch
+MAX_BATCH_OPERATIONS = 50
+
+
+class BatchOperation(BaseModel):
+    """One API call inside a batch"""
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = Field(default="GET")
+    path: str = Field(..., description="API path with query string, e.g. /api/v1/floors/3")
+    body: Optional[Any] = Field(default=None, description="JSON body of a write")
+
+
+class BatchRequest(BaseModel):
+    """Operations to run in one round trip"""
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "operations": [
+                    {"method": "GET", "path": "/api/v1/buildings/"},
+                    {"method": "GET", "path": "/api/v1/floors/3"}
+                ]
+            }
+        }
+    }
+
+
+class BatchResult(BaseModel):
+    """Response of one operation, in request order"""
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """Results of a batch; writes are committed together or not at all"""
+    committed: bool = Field(..., description="Whether the writes of the batch were committed")
+    results: List[BatchResult]
@@ -1,13 +1,24 @@
 from datetime import datetime, timezone
 from typing import Optional, List
+from pydantic import field_validator
 from sqlmodel import Field
 from app.schemas.base import SchemaBase
+from app.utils.numbering import validate_number_format
 
 # Base Pydantic model for Building with common attributes
 class BuildingBase(SchemaBase):
     name: str = Field(..., description="Name of the building")
     total_floors: int = Field(..., description="Total number of floors in the building")
     description: Optional[str] = Field(None, description="Description of the building")
+    transaction_number_format: Optional[str] = Field(
+        None,
+        max_length=100,
+        description="Format of transaction numbers, placeholders: prefix, number, year, month, building_id"
+    )
+
+    @field_validator('transaction_number_format')
+    def validate_transaction_number_format(cls, v: Optional[str]) -> Optional[str]:
+        return validate_number_format(v) if v else v
 
     class Config:
         json_schema_extra = {
@@ -27,6 +38,15 @@ class BuildingUpdate(SchemaBase):
     name: Optional[str] = Field(None, description="Name of the building")
     total_floors: Optional[int] = Field(None, description="Total number of floors in the building")
     description: Optional[str] = Field(None, description="Description of the building")
+    transaction_number_format: Optional[str] = Field(
+        None,
+        max_length=100,
+        description="Format of transaction numbers, placeholders: prefix, number, year, month, building_id"
+    )
+
+    @field_validator('transaction_number_format')
+    def validate_transaction_number_format(cls, v: Optional[str]) -> Optional[str]:
+        return validate_number_format(v) if v else v
 
     class Config:
         json_schema_extra = {
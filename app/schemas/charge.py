@@ -1,10 +1,10 @@
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
-from pydantic import Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 from app.models.charge import ChargeType, ChargeStatus, ChargeFrequency
-from schemas.base import SchemaBase
+from app.schemas.base import SchemaBase
 
 
 class ChargeBase(SchemaBase):
@@ -187,6 +187,17 @@ class ChargeFilter(SchemaBase):
     start_date_to: Optional[date] = None
     min_amount: Optional[Decimal] = Field(default=None, ge=0)
     max_amount: Optional[Decimal] = Field(default=None, ge=0)
+    building_id: Optional[int] = None
+    min_balance_due: Optional[Decimal] = Field(default=None, ge=0)
+    max_balance_due: Optional[Decimal] = Field(default=None, ge=0)
+    has_balance_due: Optional[bool] = Field(
+        default=None,
+        description="Only charges with (or without) an outstanding balance"
+    )
+    is_overdue: Optional[bool] = Field(default=None, description="Only unpaid charges past their due date")
+    unit_id: Optional[int] = None
+    owner_id: Optional[int] = None
+    tenant_id: Optional[int] = None
     search: Optional[str] = Field(
         default=None,
         description="Search term for name or description"
@@ -225,4 +236,95 @@ class ChargeStatistics(SchemaBase):
                 }
             }
         }
-    )
\ No newline at end of file
+    )
+
+class AccountPaymentCreate(BaseModel):
+    """Schema for a payment allocated across an owner's or unit's open charges"""
+    owner_id: Optional[int] = Field(
+        default=None,
+        description="ID of the paying owner (covers charges on all of their units)"
+    )
+    unit_id: Optional[int] = Field(
+        default=None,
+        description="ID of the paying unit"
+    )
+    amount: Decimal = Field(
+        ...,
+        description="Total amount paid",
+        gt=0,
+        decimal_places=2
+    )
+    payment_method: str = Field(
+        ...,
+        description="Method used for the payment",
+        max_length=50
+    )
+    payment_reference: str = Field(
+        ...,
+        description="External reference of the payment (bank or receipt number)",
+        max_length=100
+    )
+    payment_date: Optional[datetime] = Field(
+        default=None,
+        description="Date of the payment, defaults to now"
+    )
+    notes: Optional[str] = Field(
+        default=None,
+        max_length=500
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "owner_id": 1,
+                "amount": "350.00",
+                "payment_method": "bank_transfer",
+                "payment_reference": "BNK-2025-000123",
+                "notes": "Owner payment for January and February"
+            }
+        }
+    )
+
+    @model_validator(mode='after')
+    def validate_payer(self) -> 'AccountPaymentCreate':
+        if (self.owner_id is None) == (self.unit_id is None):
+            raise ValueError("Exactly one of owner_id or unit_id must be provided")
+        return self
+
+
+class PaymentAllocation(BaseModel):
+    """Part of an account payment applied to a single charge"""
+    charge_id: int = Field(..., description="ID of the charge the amount was applied to")
+    payment_id: int = Field(..., description="ID of the created payment row")
+    amount: Decimal = Field(..., description="Amount applied to the charge")
+    balance_due: Decimal = Field(..., description="Remaining balance of the charge")
+    status: ChargeStatus = Field(..., description="Status of the charge after the payment")
+
+
+class AccountPaymentResponse(BaseModel):
+    """Result of a FIFO account payment"""
+    amount: Decimal = Field(..., description="Total amount paid")
+    allocated_amount: Decimal = Field(..., description="Amount applied to open charges")
+    unallocated_amount: Decimal = Field(
+        ...,
+        description="Amount left over once every open charge is settled"
+    )
+    allocations: List[PaymentAllocation] = Field(
+        default_factory=list,
+        description="Allocations in due-date order"
+    )
+
+
+class ChargeOccurrence(BaseModel):
+    """An upcoming occurrence of a recurring charge"""
+    charge_id: int = Field(..., description="ID of the recurring charge")
+    sequence: int = Field(..., description="Occurrence number, 0 being the charge itself")
+    due_date: datetime = Field(..., description="Due date of the occurrence")
+    amount: Decimal = Field(..., description="Amount before tax")
+    total_amount: Optional[Decimal] = Field(default=None, description="Amount including tax")
+
+
+class ChargeMaterializeResult(BaseModel):
+    """Result of materializing recurring charges"""
+    recurring_charges: int = Field(..., description="Recurring charges scanned")
+    created: int = Field(..., description="Occurrences written")
@@ -80,7 +80,7 @@ class CostBase(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "title": "Monthly Elevator Maintenance",
                 "description": "Regular elevator maintenance service",
                 "amount": "500.00",
@@ -144,7 +144,7 @@ class CostBulkCreate(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "costs": [
                     {
                         "title": "Monthly Elevator Maintenance",
@@ -194,7 +194,7 @@ class CostStatistics(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "total_costs": 150,
                 "total_amount": "75000.00",
                 "pending_amount": "25000.00",
@@ -1,11 +1,19 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, List
 
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.schemas.mixins import BaseSchema
-from app.models.fund import FundType, FundStatus, TransactionType, TransactionStatus, PaymentMethod
+from app.utils.helpers import utc_now
+from app.models.fund import (
+    FundType,
+    FundStatus,
+    TransactionType,
+    TransactionStatus,
+    PaymentMethod,
+    ApprovalDecision
+)
 
 
 class FundBase(BaseSchema):
@@ -50,6 +58,12 @@ class FundBase(BaseSchema):
         ge=0,
         decimal_places=2
     )
+    interest_rate: Optional[Decimal] = Field(
+        default=None,
+        description="Annual interest rate in percent",
+        ge=0,
+        le=100
+    )
     start_date: datetime = Field(
         ...,
         description="Start date of the fund"
@@ -80,7 +94,7 @@ class FundBase(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "name": "Building Maintenance Fund",
                 "description": "Fund for regular building maintenance and repairs",
                 "fund_type": "maintenance",
@@ -115,6 +129,7 @@ class FundUpdate(BaseSchema):
     target_amount: Optional[Decimal] = Field(default=None, gt=0)
     current_balance: Optional[Decimal] = Field(default=None, ge=0)
     minimum_balance: Optional[Decimal] = Field(default=None, ge=0)
+    interest_rate: Optional[Decimal] = Field(default=None, ge=0, le=100)
     end_date: Optional[datetime] = None
     contribution_frequency: Optional[str] = None
     contribution_amount: Optional[Decimal] = Field(default=None, gt=0)
@@ -157,7 +172,7 @@ class FundBulkCreate(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "funds": [
                     {
                         "name": "Building Maintenance Fund",
@@ -185,6 +200,7 @@ class FundFilter(BaseSchema):
     status: Optional[List[FundStatus]] = None
     min_balance: Optional[Decimal] = Field(default=None, ge=0)
     max_balance: Optional[Decimal] = Field(default=None, gt=0)
+    requires_approval: Optional[bool] = None
     tags: Optional[List[str]] = None
 
 
@@ -200,7 +216,7 @@ class FundStatistics(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "total_funds": 5,
                 "total_balance": "150000.00",
                 "total_target": "500000.00",
@@ -273,7 +289,7 @@ class FundTransactionBase(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "fund_id": 1,
                 "building_id": 1,
                 "transaction_type": "contribution",
@@ -334,7 +350,7 @@ class FundTransactionBulkCreate(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "transactions": [
                     {
                         "fund_id": 1,
@@ -353,6 +369,141 @@ class FundTransactionBulkCreate(BaseSchema):
         }
 
 
+class FundBulkBalance(BaseModel):
+    """Balance change of one fund in a bulk import"""
+    fund_id: int = Field(..., description="ID of the fund")
+    transactions: int = Field(..., description="Number of transactions applied to the fund")
+    opening_balance: Decimal = Field(..., description="Fund balance before the import")
+    closing_balance: Decimal = Field(..., description="Fund balance after the import")
+
+
+class FundTransactionBulkResult(BaseModel):
+    """Result of a bulk fund transaction import"""
+    created: int = Field(..., description="Number of transactions created")
+    funds: List[FundBulkBalance] = Field(default_factory=list)
+
+
+class FundTransferCreate(BaseModel):
+    """Schema for moving money between two funds"""
+    from_fund_id: int = Field(..., description="ID of the fund debited")
+    to_fund_id: int = Field(..., description="ID of the fund credited")
+    amount: Decimal = Field(..., gt=0, decimal_places=2, description="Amount transferred")
+    payment_method: PaymentMethod = Field(
+        default=PaymentMethod.INTERNAL_TRANSFER,
+        description="Method of payment"
+    )
+    reference_number: Optional[str] = Field(
+        default=None,
+        max_length=50,
+        description="Reference shared by both legs of the transfer"
+    )
+    description: Optional[str] = Field(default=None, max_length=500)
+    transaction_date: datetime = Field(default_factory=utc_now)
+    notes: Optional[str] = Field(default=None, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_distinct_funds(self):
+        if self.from_fund_id == self.to_fund_id:
+            raise ValueError("A transfer needs two different funds")
+        return self
+
+
+class FundTransferBatchCreate(BaseModel):
+    """Schema for applying many transfers atomically"""
+    transfers: List[FundTransferCreate] = Field(..., min_length=1)
+
+
+class FundSweepRequest(BaseModel):
+    """Schema for sweeping the available balance of many funds into one"""
+    to_fund_id: int = Field(..., description="ID of the fund receiving the sweep")
+    fund_type: FundType = Field(
+        default=FundType.OPERATIONAL,
+        description="Type of the funds swept"
+    )
+    building_id: Optional[int] = Field(default=None, description="Only sweep funds of this building")
+    description: Optional[str] = Field(default=None, max_length=500)
+
+
+class FundTransferResponse(BaseModel):
+    """Both legs of an applied transfer"""
+    reference_number: str
+    from_fund_id: int
+    to_fund_id: int
+    amount: Decimal
+    from_balance_after: Decimal
+    to_balance_after: Decimal
+
+
+class FundTransferBatchResult(BaseModel):
+    """Result of a batch of transfers"""
+    total_amount: Decimal = Field(..., description="Sum of all transferred amounts")
+    transfers: List[FundTransferResponse] = Field(default_factory=list)
+
+
+class FundApprovalRequest(BaseModel):
+    """Schema for approving or rejecting pending fund transactions"""
+    transaction_ids: List[int] = Field(..., min_length=1, description="IDs of the pending transactions")
+    approver: str = Field(..., max_length=100, description="User taking the decision")
+    comment: Optional[str] = Field(default=None, max_length=500, description="Reason for the decision")
+
+
+class FundApprovalSkipped(BaseModel):
+    """A pending transaction left in the queue by a batch approval"""
+    transaction_id: int
+    code: str = Field(..., description="Why the transaction could not be applied")
+
+
+class FundApprovalResult(BaseModel):
+    """Outcome of a batch approval or rejection"""
+    decision: ApprovalDecision
+    processed: List[int] = Field(default_factory=list, description="IDs of the transactions decided on")
+    skipped: List[FundApprovalSkipped] = Field(default_factory=list)
+
+
+class FundQueueItem(BaseModel):
+    """A fund transaction waiting for approval"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    fund_id: int
+    transaction_type: TransactionType
+    amount: Decimal
+    reference_number: str
+    description: str
+    transaction_date: datetime
+    notes: Optional[str] = None
+
+
+class FundInterestResult(BaseModel):
+    """Result of an interest accrual run"""
+    period_start: date
+    period_end: date
+    funds_accrued: int = Field(..., description="Funds that received an interest posting in this run")
+    total_interest: Decimal = Field(..., description="Sum of the interest posted in this run")
+
+
+class FundForecast(BaseModel):
+    """Projected month-end balances of one fund"""
+    fund_id: int
+    name: str
+    building_id: int
+    current_balance: Decimal
+    minimum_balance: Decimal
+    target_amount: Optional[Decimal] = None
+    balances: List[Decimal] = Field(..., description="Projected balance at the end of each forecast month")
+    lowest_balance: Decimal
+    shortfall: bool = Field(..., description="Whether the balance is expected to drop below the minimum")
+    shortfall_month: Optional[date] = None
+    target_month: Optional[date] = Field(default=None, description="First month the target amount is reached")
+
+
+class FundForecastResponse(BaseModel):
+    """Balance forecast over all funds of a building or the whole portfolio"""
+    months: List[date]
+    shortfalls: int
+    funds: List[FundForecast]
+
+
 class FundTransactionFilter(BaseSchema):
     """Schema for filtering fund transactions"""
     fund_id: Optional[int] = None
@@ -380,7 +531,7 @@ class FundTransactionStatistics(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "total_transactions": 100,
                 "total_contributions": "50000.00",
                 "total_withdrawals": "20000.00",
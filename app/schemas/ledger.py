@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, List
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.models.ledger import LedgerAccountType
+
+
+class LedgerEntry(BaseModel):
+    """A single charge or payment line of an account statement"""
+    entry_type: str = Field(..., description="Either 'charge' or 'payment'")
+    entry_id: int = Field(..., description="ID of the charge or payment")
+    entry_date: datetime = Field(..., description="Due date of a charge or date of a payment")
+    description: Optional[str] = Field(default=None, description="Charge title or payment reference")
+    debit: Decimal = Field(..., description="Amount charged, tax included")
+    credit: Decimal = Field(..., description="Amount paid")
+    balance: Decimal = Field(..., description="Running balance after this entry")
+
+
+class LedgerPage(BaseModel):
+    """A page of an account statement"""
+    account_type: LedgerAccountType = Field(..., description="Type of the ledger account")
+    account_id: int = Field(..., description="ID of the unit or owner")
+    start_date: Optional[date] = Field(default=None, description="First day of the statement")
+    end_date: Optional[date] = Field(default=None, description="Last day of the statement")
+    opening_balance: Decimal = Field(..., description="Balance before the first entry of this page")
+    entries: List[LedgerEntry] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, empty on the last page"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "account_type": "unit",
+                "account_id": 1,
+                "start_date": "2025-01-01",
+                "opening_balance": "100.00",
+                "entries": [
+                    {
+                        "entry_type": "charge",
+                        "entry_id": 12,
+                        "entry_date": "2025-01-05T00:00:00",
+                        "description": "Monthly Maintenance Fee",
+                        "debit": "105.00",
+                        "credit": "0.00",
+                        "balance": "205.00"
+                    }
+                ],
+                "next_cursor": None
+            }
+        }
+    )
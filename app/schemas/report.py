@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional, List
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class AgingBuckets(BaseModel):
+    """Outstanding balance split by days past due date"""
+    current: Decimal = Field(default=Decimal('0.00'), description="Not yet due")
+    days_1_30: Decimal = Field(default=Decimal('0.00'), description="1 to 30 days past due")
+    days_31_60: Decimal = Field(default=Decimal('0.00'), description="31 to 60 days past due")
+    days_61_90: Decimal = Field(default=Decimal('0.00'), description="61 to 90 days past due")
+    days_90_plus: Decimal = Field(default=Decimal('0.00'), description="More than 90 days past due")
+    total: Decimal = Field(default=Decimal('0.00'), description="Total outstanding balance")
+    open_charges: int = Field(default=0, description="Number of open charges")
+
+
+class DebtorAging(AgingBuckets):
+    """Aging of a single building, unit, owner or tenant"""
+    building_id: int = Field(..., description="ID of the building")
+    id: Optional[int] = Field(
+        default=None,
+        description="ID of the unit, owner or tenant, empty for building rows"
+    )
+
+
+class DebtorsReport(BaseModel):
+    """Aging-bucket debtors report"""
+    as_of: date = Field(..., description="Date the ages are computed against")
+    building_id: Optional[int] = Field(default=None, description="Building filter, empty for all buildings")
+    buildings: List[DebtorAging] = Field(default_factory=list)
+    units: List[DebtorAging] = Field(default_factory=list)
+    owners: List[DebtorAging] = Field(default_factory=list)
+    tenants: List[DebtorAging] = Field(default_factory=list)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "as_of": "2025-03-01",
+                "building_id": 1,
+                "buildings": [
+                    {
+                        "building_id": 1,
+                        "current": "1200.00",
+                        "days_1_30": "800.00",
+                        "days_31_60": "300.00",
+                        "days_61_90": "0.00",
+                        "days_90_plus": "150.00",
+                        "total": "2450.00",
+                        "open_charges": 21
+                    }
+                ],
+                "units": [],
+                "owners": [],
+                "tenants": []
+            }
+        }
+    )
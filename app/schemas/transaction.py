@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional, List
-from pydantic import Field
+from typing import Optional, List, Dict
+from pydantic import BaseModel, ConfigDict, Field
 from app.schemas.mixins import BaseSchema
 from app.models.fund import TransactionType, TransactionStatus, PaymentMethod
+from app.models.transaction import MatchType, ReconciliationSource
 
 
 class TransactionBase(BaseSchema):
@@ -46,6 +47,11 @@ class TransactionBase(BaseSchema):
         default=None,
         description="Date when payment was made"
     )
+    transaction_number: Optional[str] = Field(
+        default=None,
+        description="Transaction number, allocated from the building's number format when empty",
+        max_length=50
+    )
     reference_number: Optional[str] = Field(
         default=None,
         description="Reference or transaction number",
@@ -77,7 +83,7 @@ class TransactionBase(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "transaction_type": "rent",
                 "amount": "1500.00",
                 "status": "completed",
@@ -142,7 +148,7 @@ class TransactionBulkCreate(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "transactions": [{
                     "transaction_type": "rent",
                     "amount": "1500.00",
@@ -175,6 +181,98 @@ class TransactionFilter(BaseSchema):
     tags: Optional[List[str]] = None
 
 
+class TransactionSplitCreate(BaseModel):
+    """Schema for allocating part of a transaction"""
+    amount: Decimal = Field(..., gt=0, decimal_places=2, description="Amount allocated")
+    unit_id: Optional[int] = Field(default=None, description="Unit the amount is allocated to")
+    description: Optional[str] = Field(default=None, max_length=200)
+    notes: Optional[str] = Field(default=None, max_length=500)
+
+
+class TransactionSplitBatchCreate(BaseModel):
+    """Schema for allocating a transaction in one go, e.g. a bill over all units"""
+    splits: List[TransactionSplitCreate] = Field(..., min_length=1, max_length=10000)
+
+
+class TransactionSplitResponse(TransactionSplitCreate):
+    """Schema for a stored split"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    transaction_id: int
+
+
+class StatementLineCreate(BaseModel):
+    """A line of a bank statement"""
+    date: datetime = Field(..., description="Booking date")
+    amount: Decimal = Field(..., description="Signed amount, negative for money leaving the account")
+    reference: Optional[str] = Field(default=None, max_length=100)
+    memo: Optional[str] = Field(default=None, max_length=500)
+
+
+class BankStatementReconcile(BaseModel):
+    """Schema for reconciling a bank statement against the ledgers"""
+    statement_name: Optional[str] = Field(default=None, max_length=200)
+    building_id: Optional[int] = Field(default=None, description="Only match entries of this building")
+    sources: List[ReconciliationSource] = Field(
+        default_factory=lambda: list(ReconciliationSource),
+        min_length=1,
+        description="Ledgers to match against"
+    )
+    date_tolerance_days: int = Field(default=3, ge=0, le=31)
+    min_memo_score: float = Field(default=0.5, gt=0, le=1)
+    created_by: str = Field(default="fastapi1403", max_length=100)
+    lines: List[StatementLineCreate] = Field(..., min_length=1, max_length=200000)
+
+
+class TransactionReconciliation(BaseModel):
+    """Match of one bank statement line"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    line_number: int
+    statement_date: datetime
+    amount: Decimal
+    reference: Optional[str] = None
+    memo: Optional[str] = None
+    match_type: MatchType
+    source: Optional[ReconciliationSource] = None
+    source_id: Optional[int] = None
+    score: float
+    reviewed: bool
+    confirmed: Optional[bool] = None
+
+
+class ReconciliationRunResponse(BaseModel):
+    """Summary of a reconciliation run"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    statement_name: Optional[str] = None
+    building_id: Optional[int] = None
+    date_from: date
+    date_to: date
+    total_lines: int
+    matched_lines: int
+    by_match_type: Dict[MatchType, int] = Field(default_factory=dict)
+
+
+class ReconciliationPage(BaseModel):
+    """A page of reconciliation lines, in statement order"""
+    items: List[TransactionReconciliation] = Field(default_factory=list)
+    next_line: Optional[int] = Field(
+        default=None,
+        description="Pass as after_line to fetch the next page, empty on the last page"
+    )
+
+
+class ReconciliationReview(BaseModel):
+    """Schema for confirming or rejecting matches"""
+    ids: List[int] = Field(..., min_length=1)
+    confirmed: bool = Field(..., description="Whether the matches are correct")
+    reviewed_by: str = Field(..., max_length=100)
+
+
 class TransactionStatistics(BaseSchema):
     """Schema for transaction statistics"""
     total_transactions: int = Field(..., description="Total number of transactions")
@@ -188,7 +286,7 @@ class TransactionStatistics(BaseSchema):
     class Config:
         json_schema_extra = {
             "example": {
-                **BaseSchema.Config.json_schema_extra["example"],
+                **BaseSchema.model_config["json_schema_extra"]["example"],
                 "total_transactions": 500,
                 "total_amount": "750000.00",
                 "pending_amount": "25000.00",
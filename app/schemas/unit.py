@@ -66,7 +66,7 @@ class UnitBase(BaseSchema):
 
     @model_validator(mode='after')
     def validate_status_and_owner(self) -> 'UnitBase':
-        if self.status == UnitStatus.OCCUPIED and self.current_owner_id is None:
+        if self.status == UnitStatus.OCCUPIED and self.owner_id is None:
             raise ValueError("Occupied units must have an owner")
         return self
 
@@ -154,7 +154,7 @@ class UnitUpdate(BaseModel):
 
     @model_validator(mode='after')
     def validate_partial_update(self) -> 'UnitUpdate':
-        if self.status == UnitStatus.OCCUPIED and self.current_owner_id is None:
+        if self.status == UnitStatus.OCCUPIED and self.owner_id is None:
             raise ValueError("Cannot set status to occupied without an owner")
         return self
 
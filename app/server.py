@@ -0,0 +1,96 @@
+"""
+Production entry point: gunicorn managing uvicorn workers.
+
+The application is imported once in the master and forked into one worker
+per available core, so workers start fast and share the imported code.
+uvicorn picks uvloop and httptools when they are installed. On SIGTERM
+gunicorn stops accepting connections, lets the workers finish in-flight
+requests for up to SERVER_GRACEFUL_TIMEOUT seconds and runs the
+application's shutdown, which disposes the database pool.
+
+Usage (from the repository root):
+
+    PYTHONPATH=.:app python -m app.server
+
+Every worker has its own connection pool, so the database sees up to
+WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+"""
+import os
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # bundled with uvicorn before 0.30
+    from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "auto",  # uvloop when installed
+        "http": "auto",  # httptools when installed
+        "lifespan": "on",
+        "proxy_headers": True,
+        "server_header": False,
+    }
+
+
+def available_cores() -> int:
+    """Cores this process may run on, which respects container CPU sets"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    # Connections opened in the master must not be shared with the children
+    from app.db.session import engine
+    engine.sync_engine.dispose(close=False)
+
+
+class Server(BaseApplication):
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+def server_options() -> Dict[str, Any]:
+    workers = settings.WEB_CONCURRENCY or available_cores()
+    if workers > 1 and settings.RESPONSE_CACHE_ENABLED and not settings.RESPONSE_CACHE_REDIS_URL:
+        # Each worker would keep serving responses another worker's writes made stale
+        raise RuntimeError(
+            "The in-process response cache only supports one worker: "
+            "set RESPONSE_CACHE_REDIS_URL, WEB_CONCURRENCY=1 or unset RESPONSE_CACHE_ENABLED"
+        )
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": workers,
+        "worker_class": Worker,
+        "preload_app": True,
+        "post_fork": post_fork,
+        "backlog": settings.SERVER_BACKLOG,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "timeout": settings.SERVER_WORKER_TIMEOUT,
+        # Recycle workers now and then, staggered so they never restart together
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS // 10,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+if __name__ == "__main__":
+    Server(server_options()).run()
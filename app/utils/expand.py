@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.orm import selectinload
+
+from app.core.responses import FastJSONResponse, serializer_for
+from app.models import Building, Floor, Owner, Tenant, Unit
+from app.models.base import TableBase
+from app.schemas.building import BuildingResponse
+from app.schemas.floor import FloorResponse
+from app.schemas.owner import OwnerResponse
+from app.schemas.tenant import TenantResponse
+from app.schemas.unit import UnitResponse
+
+# Relationships clients may expand, with the schema their rows are returned in
+EXPANDABLE: Dict[Type[TableBase], Dict[str, Type[BaseModel]]] = {
+    Building: {"floors": FloorResponse},
+    Floor: {"building": BuildingResponse, "units": UnitResponse},
+    Unit: {"floor": FloorResponse, "owner": OwnerResponse, "tenant": TenantResponse},
+    Owner: {"units": UnitResponse},
+    Tenant: {"unit": UnitResponse},
+}
+
+# Longest relationship chain in one path, e.g. floors.units.tenant
+MAX_EXPAND_DEPTH = 3
+# Most comma separated paths in one expand parameter
+MAX_EXPAND_PATHS = 5
+# Page size cap when expanding, as each root row can carry hundreds of related rows
+MAX_EXPAND_LIMIT = 20
+
+EXPAND_DESCRIPTION = (
+    "Comma separated relationship paths to embed in the response, e.g. floors.units.tenant. "
+    f"At most {MAX_EXPAND_PATHS} paths of {MAX_EXPAND_DEPTH} levels; "
+    f"lists are capped at {MAX_EXPAND_LIMIT} rows when expanding."
+)
+
+ExpandTree = Dict[str, "ExpandTree"]
+
+
+def parse_expand(model: Type[TableBase], expand: Optional[str]) -> ExpandTree:
+    """
+    Parse an expand parameter into a tree of relationship names.
+
+    floors.units.tenant,floors.units.owner becomes
+    {"floors": {"units": {"tenant": {}, "owner": {}}}}. Unknown relationships
+    and paths over the limits are rejected with 422.
+    """
+    tree: ExpandTree = {}
+    if not expand:
+        return tree
+
+    paths = [path.strip() for path in expand.split(",") if path.strip()]
+    if len(paths) > MAX_EXPAND_PATHS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_EXPAND_PATHS} expand paths are allowed")
+
+    for path in paths:
+        names = path.split(".")
+        if len(names) > MAX_EXPAND_DEPTH:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Expand path {path} is deeper than {MAX_EXPAND_DEPTH} levels"
+            )
+        current, node = model, tree
+        for name in names:
+            relations = EXPANDABLE.get(current, {})
+            if name not in relations:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Cannot expand {name} of {current.__tablename__}, expandable: {', '.join(sorted(relations)) or 'none'}"
+                )
+            current = getattr(current, name).property.mapper.class_
+            node = node.setdefault(name, {})
+    return tree
+
+
+def expand_options(model: Type[TableBase], tree: ExpandTree) -> List[Any]:
+    """
+    selectinload chains for an expand tree.
+
+    Each relationship costs one IN query for all parents at that level, so
+    the number of queries depends on the tree, not on the number of rows.
+    Soft-deleted related rows are left out.
+    """
+    options = []
+    for name, subtree in tree.items():
+        attribute = getattr(model, name)
+        target = attribute.property.mapper.class_
+        loader = selectinload(attribute.and_(target.deleted_at.is_(None)))
+        if subtree:
+            loader = loader.options(*expand_options(target, subtree))
+        options.append(loader)
+    return options
+
+
+def expanded_models(model: Type[TableBase], tree: ExpandTree) -> Set[Type[TableBase]]:
+    """Models whose rows appear in the expanded response besides the root"""
+    models = set()
+    for name, subtree in tree.items():
+        target = getattr(model, name).property.mapper.class_
+        models.add(target)
+        models |= expanded_models(target, subtree)
+    return models
+
+
+def expand_limit(tree: ExpandTree, limit: int) -> int:
+    return min(limit, MAX_EXPAND_LIMIT) if tree else limit
+
+
+def _dump(obj: Any, schema: Type[BaseModel], tree: ExpandTree) -> Dict[str, Any]:
+    data = serializer_for(schema)[0].row(obj)
+    relations = EXPANDABLE[type(obj)]
+    for name, subtree in tree.items():
+        value = getattr(obj, name)
+        if value is None:
+            data[name] = None
+        elif isinstance(value, list):
+            data[name] = [_dump(item, relations[name], subtree) for item in value]
+        else:
+            data[name] = _dump(value, relations[name], subtree)
+    return data
+
+
+def expanded_response(content: Any, schema: Type[BaseModel], tree: ExpandTree) -> Any:
+    """
+    Rows with their expanded relationships nested under the relationship names.
+
+    Without expansion the rows are returned unchanged for the route's usual
+    encoding.
+    """
+    if not tree:
+        return content
+    if isinstance(content, (list, tuple)):
+        return FastJSONResponse(to_json([_dump(obj, schema, tree) for obj in content]))
+    return FastJSONResponse(to_json(_dump(content, schema, tree)))
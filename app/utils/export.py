@@ -0,0 +1,156 @@
+import csv
+import io
+import logging
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select, or_, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.base import TableBase
+from app.core.exceptions import ValidationException
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2000
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"  # One JSON object per line
+    CSV = "csv"  # Header line followed by one row per line
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+class ExportOptions(BaseModel):
+    """Query parameters of every export besides its filters"""
+    format: ExportFormat = ExportFormat.NDJSON
+
+
+# Fields every filter schema inherits from the base schemas, never filters
+AUDIT_FIELDS = {"id", "created_at", "updated_at", "created_by", "updated_by", "deleted_at", "is_deleted"}
+
+
+def column_query(model: Type[TableBase], filters: Optional[BaseModel] = None, **options: Any) -> Select:
+    """All columns of the model's live rows in id order, narrowed by a filter schema"""
+    query = select(*model.__table__.columns).where(model.deleted_at.is_(None))
+    if filters is not None:
+        query = apply_filter_fields(query, model, filters, **options)
+    return query.order_by(model.id)
+
+
+def apply_filter_fields(
+        query: Select,
+        model: Type[TableBase],
+        filters: BaseModel,
+        date_column: Any = None,
+        amount_column: Any = None,
+        search_columns: Sequence[Any] = (),
+        aliases: Optional[Dict[str, Any]] = None,
+        conditions: Optional[Dict[str, Callable[[Any], Any]]] = None
+) -> Select:
+    """
+    Apply the fields of a filter schema that map onto columns.
+
+    A list value filters with IN and a scalar with equality on the column of
+    the same name (or its alias); date_from/date_to, min_amount/max_amount
+    and search use the given columns, and conditions build the clause of a
+    field from its value. A field set without any of these raises a
+    ValidationException rather than exporting unfiltered rows.
+    """
+    aliases = aliases or {}
+    conditions = conditions or {}
+    for name in type(filters).model_fields.keys() - AUDIT_FIELDS - ExportOptions.model_fields.keys():
+        value = getattr(filters, name)
+        if value is None or value == []:
+            continue
+        if name == "date_from" and date_column is not None:
+            query = query.where(date_column >= value)
+        elif name == "date_to" and date_column is not None:
+            query = query.where(date_column <= value)
+        elif name == "min_amount" and amount_column is not None:
+            query = query.where(amount_column >= value)
+        elif name == "max_amount" and amount_column is not None:
+            query = query.where(amount_column <= value)
+        elif name == "search" and search_columns:
+            query = query.where(or_(*(column.ilike(f"%{value}%") for column in search_columns)))
+        elif name in conditions:
+            query = query.where(conditions[name](value))
+        else:
+            if name in aliases:
+                column = aliases[name]
+            elif name in model.__table__.columns:
+                column = getattr(model, name)
+            else:
+                raise ValidationException(
+                    detail=f"Filter {name} is not supported by the {model.__tablename__} export",
+                    metadata={"field": name}
+                )
+            query = query.where(column.in_(value) if isinstance(value, list) else column == value)
+    return query
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(to_json(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(query: Select, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Encode the rows of a column query batch by batch from a server-side cursor.
+
+    The export owns its session, as the request's session is closed before a
+    streamed body is sent. Memory stays at one batch whatever the row count.
+    When the client disconnects the generator is cancelled or closed, which
+    closes the cursor and returns the connection.
+    """
+    exported = 0
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+        if export_format == ExportFormat.CSV:
+            yield encode_csv([columns])
+
+        try:
+            async for rows in result.partitions():
+                exported += len(rows)
+                if export_format == ExportFormat.CSV:
+                    yield encode_csv(rows)
+                else:
+                    yield encode_ndjson(columns, rows)
+        finally:
+            await result.close()
+            logger.info(f"Exported {exported} rows as {export_format.value}")
+
+
+def export_response(query: Select, export_format: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{date.today().isoformat()}.{export_format.value}"
+    return StreamingResponse(
+        stream_export(query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,102 @@
+from datetime import date, datetime
+from typing import NamedTuple
+
+import numpy as np
+
+# datetime64[M] counts months from 1970-01
+_EPOCH_MONTH = 1970 * 12
+
+
+def month_index(value: date) -> int:
+    """Months since year 0, so consecutive months differ by one"""
+    return value.year * 12 + value.month - 1
+
+
+def month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def to_days(values) -> np.ndarray:
+    """Dates or datetimes as a datetime64[D] array"""
+    return np.array([np.datetime64(v.date() if isinstance(v, datetime) else v, "D") for v in values],
+                    dtype="datetime64[D]")
+
+
+def occurrence_counts(
+        anchor: np.ndarray,
+        step_months: np.ndarray,
+        step_days: np.ndarray,
+        first_month: int,
+        horizon: int
+) -> np.ndarray:
+    """
+    Occurrences of each schedule (rows) in each month of the horizon (columns).
+
+    A schedule steps either by whole months (step_months > 0) or by days
+    (step_days > 0) from its anchor, matching app.utils.schedule.
+    """
+    months = np.arange(first_month, first_month + horizon)
+
+    # Month-stepped: one occurrence in every step-th month from the anchor month
+    anchor_months = anchor.astype("datetime64[M]").astype(np.int64) + _EPOCH_MONTH
+    elapsed = months[None, :] - anchor_months[:, None]
+    by_month = (elapsed >= 0) & (elapsed % np.maximum(step_months, 1)[:, None] == 0)
+
+    # Day-stepped: occurrences with index n >= 0 inside [month start, next month start)
+    bounds = (np.arange(first_month, first_month + horizon + 1) - _EPOCH_MONTH)
+    bounds = bounds.astype("datetime64[M]").astype("datetime64[D]")
+    offsets = (bounds[None, :] - anchor[:, None]).astype(np.int64)
+    step = np.maximum(step_days, 1)[:, None]
+    reached = np.maximum(-(-offsets // step), 0)
+    by_day = np.diff(reached, axis=1)
+
+    return np.where(
+        step_months[:, None] > 0,
+        by_month.astype(np.int64),
+        np.where(step_days[:, None] > 0, by_day, 0)
+    )
+
+
+def monthly_totals(group: np.ndarray, amount: np.ndarray, counts: np.ndarray, groups: int) -> np.ndarray:
+    """Sum amount * occurrences per group and month"""
+    totals = np.zeros((groups, counts.shape[1]))
+    np.add.at(totals, group, amount[:, None] * counts)
+    return totals
+
+
+def group_shares(weights: np.ndarray, group: np.ndarray, groups: int) -> np.ndarray:
+    """Share of each member in its group's total, split evenly where the group has none"""
+    totals = np.bincount(group, weights=weights, minlength=groups)[group]
+    members = np.bincount(group, minlength=groups)[group]
+    return np.where(totals > 0, weights / np.where(totals > 0, totals, 1), 1 / members)
+
+
+class Projection(NamedTuple):
+    balances: np.ndarray
+    first_shortfall: np.ndarray
+    first_target: np.ndarray
+
+
+def project_balances(
+        current: np.ndarray,
+        minimum: np.ndarray,
+        target: np.ndarray,
+        inflow: np.ndarray,
+        outflow: np.ndarray
+) -> Projection:
+    """
+    Month-end balances of every fund (rows) given its monthly flows.
+
+    first_shortfall and first_target hold the first month the balance is below
+    the minimum or at the target, -1 if it never is; NaN targets never match.
+    """
+    balances = current[:, None] + np.cumsum(inflow - outflow, axis=1)
+
+    below = balances < minimum[:, None]
+    with np.errstate(invalid="ignore"):
+        at_target = balances >= target[:, None]
+    return Projection(
+        balances=balances,
+        first_shortfall=np.where(below.any(axis=1), below.argmax(axis=1), -1),
+        first_target=np.where(at_target.any(axis=1), at_target.argmax(axis=1), -1)
+    )
@@ -1,7 +1,21 @@
-from datetime import datetime
+from datetime import date, datetime, UTC
 
 def format_datetime(dt: datetime) -> str:
     """Format datetime for display"""
     if not dt:
         return ""
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+def utc_now() -> datetime:
+    """Current UTC time without tzinfo, as the timestamp columns store it"""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+def utc_today() -> date:
+    """Current UTC date, which periods of the stored timestamps are counted in"""
+    return utc_now().date()
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC, naive ones are assumed to be UTC already"""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(UTC).replace(tzinfo=None)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+import math
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.building import Building
+from app.utils.helpers import utc_now
+from app.core.config import settings
+
+# Postgres sequence shared by transaction and fund transaction numbers
+NUMBER_SEQUENCE = "document_number_seq"
+
+# Placeholders available in a number format
+FORMAT_FIELDS = ("prefix", "number", "year", "month", "building_id")
+
+
+def format_number(
+        number_format: str,
+        number: int,
+        prefix: str,
+        building_id: Optional[int] = None,
+        when: Optional[datetime] = None
+) -> str:
+    """Render a sequence value with a format like '{prefix}-{year}-{number:08d}'"""
+    when = when or utc_now()
+    return number_format.format(
+        prefix=prefix,
+        number=number,
+        year=when.year,
+        month=when.month,
+        building_id=building_id or 0
+    )
+
+
+def validate_number_format(number_format: str) -> str:
+    """Reject formats that do not render or could produce duplicate numbers"""
+    if "{number" not in number_format:
+        raise ValueError("Number format must contain the {number} placeholder")
+    try:
+        format_number(number_format, 1, "TXN", 1)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Invalid number format, available placeholders are {FORMAT_FIELDS}: {e}")
+    return number_format
+
+
+class NumberAllocator:
+    """
+    Hands out values of a Postgres sequence from blocks reserved per process.
+
+    The sequence increments by the block size, so one nextval() reserves a
+    whole block and most numbers need no database round trip. Numbers are
+    unique across workers but not gapless: unused blocks are lost on restart.
+    """
+
+    def __init__(self, sequence: str):
+        self.sequence = sequence
+        self._block_size: Optional[int] = None
+        self._blocks: Deque[range] = deque()
+        self._lock = asyncio.Lock()
+
+    async def take(self, db: AsyncSession, count: int = 1) -> List[int]:
+        """Return `count` unused sequence values"""
+        async with self._lock:
+            available = sum(len(block) for block in self._blocks)
+            if available < count:
+                await self._reserve(db, count - available)
+
+            numbers: List[int] = []
+            while len(numbers) < count:
+                block = self._blocks[0]
+                needed = count - len(numbers)
+                numbers.extend(block[:needed])
+                if needed >= len(block):
+                    self._blocks.popleft()
+                else:
+                    self._blocks[0] = block[needed:]
+            return numbers
+
+    async def _reserve(self, db: AsyncSession, needed: int) -> None:
+        """Reserve enough blocks for `needed` numbers in one round trip"""
+        if self._block_size is None:
+            result = await db.execute(
+                text("SELECT increment_by FROM pg_sequences WHERE sequencename = :name"),
+                {"name": self.sequence}
+            )
+            self._block_size = result.scalar_one()
+
+        result = await db.execute(
+            text(f"SELECT nextval('{self.sequence}') FROM generate_series(1, :blocks)"),
+            {"blocks": math.ceil(needed / self._block_size)}
+        )
+        for start in result.scalars().all():
+            self._blocks.append(range(start, start + self._block_size))
+
+
+document_numbers = NumberAllocator(NUMBER_SEQUENCE)
+
+async def next_numbers(
+        db: AsyncSession,
+        building_id: Optional[int],
+        count: int = 1,
+        prefix: str = "TXN"
+) -> List[str]:
+    """Allocate `count` formatted document numbers for a building"""
+    # Read on every call, a format changed by any worker applies at once
+    number_format = settings.TRANSACTION_NUMBER_FORMAT
+    if building_id is not None:
+        result = await db.execute(
+            select(Building.transaction_number_format).where(Building.id == building_id)
+        )
+        number_format = result.scalar_one_or_none() or number_format
+
+    now = utc_now()
+    return [
+        format_number(number_format, number, prefix, building_id, now)
+        for number in await document_numbers.take(db, count)
+    ]
+
+
+async def next_number(db: AsyncSession, building_id: Optional[int], prefix: str = "TXN") -> str:
+    """Allocate one formatted document number for a building"""
+    numbers = await next_numbers(db, building_id, 1, prefix)
+    return numbers[0]
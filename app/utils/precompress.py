@@ -0,0 +1,72 @@
+"""
+Write .gz and .br siblings of static assets, served by PrecompressedStaticFiles.
+
+Run at build time (see the Dockerfile):
+
+    python -m app.utils.precompress app/static
+"""
+import argparse
+import gzip
+import os
+from typing import Iterator
+
+from app.core.compression import PRECOMPRESSED_EXTENSIONS
+
+try:
+    import brotli
+except ImportError:  # .gz siblings only
+    brotli = None
+
+# Compressed copies must save at least this share of the original to be kept
+MINIMUM_SAVING = 0.05
+
+
+def assets(root: str) -> Iterator[str]:
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(PRECOMPRESSED_EXTENSIONS):
+                yield os.path.join(directory, name)
+
+
+def write_sibling(path: str, suffix: str, data: bytes, original_size: int) -> bool:
+    """Write a compressed copy unless it saves too little; returns whether it was written"""
+    target = path + suffix
+    if len(data) > original_size * (1 - MINIMUM_SAVING):
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+    with open(target, "wb") as f:
+        f.write(data)
+    # Same mtime as the original, so Last-Modified and ETag match both variants
+    stat_result = os.stat(path)
+    os.utime(target, (stat_result.st_atime, stat_result.st_mtime))
+    return True
+
+
+def precompress(root: str) -> None:
+    files = original_total = compressed_total = 0
+    for path in assets(root):
+        with open(path, "rb") as f:
+            original = f.read()
+        files += 1
+        original_total += len(original)
+
+        sizes = [len(original)]
+        if write_sibling(path, ".gz", gzip.compress(original, compresslevel=9, mtime=0), len(original)):
+            sizes.append(os.path.getsize(path + ".gz"))
+        if brotli is not None:
+            if write_sibling(path, ".br", brotli.compress(original, quality=11), len(original)):
+                sizes.append(os.path.getsize(path + ".br"))
+        compressed_total += min(sizes)
+
+    print(f"{files} assets, {original_total} bytes, {compressed_total} bytes at best compression")
+    if brotli is None:
+        print("brotli is not installed, only .gz siblings were written")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root", nargs="?", default="app/static")
+    args = parser.parse_args()
+
+    precompress(args.root)
@@ -0,0 +1,159 @@
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+# Memo tokens shared by more ledger items than this are too common to discriminate
+MAX_TOKEN_FREQUENCY = 50
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+
+
+class StatementLine(NamedTuple):
+    line_number: int
+    date: datetime
+    amount: Decimal
+    reference: Optional[str]
+    memo: Optional[str]
+
+
+class LedgerItem(NamedTuple):
+    source: str
+    id: int
+    date: datetime
+    amount: Decimal
+    reference: Optional[str]
+    memo: Optional[str]
+
+
+class Match(NamedTuple):
+    line_number: int
+    source: str
+    item_id: int
+    match_type: str
+    score: float
+
+
+def normalize_reference(value: Optional[str]) -> str:
+    """Reference reduced to upper-case letters and digits"""
+    return _NON_ALNUM.sub("", value.upper()) if value else ""
+
+
+def memo_tokens(value: Optional[str]) -> FrozenSet[str]:
+    """Distinctive words of a memo"""
+    if not value:
+        return frozenset()
+    return frozenset(token for token in _NON_ALNUM.split(value.upper()) if len(token) >= 3)
+
+
+def cents(amount: Decimal) -> int:
+    return int((amount * 100).to_integral_value())
+
+
+def match_statement(
+        lines: Iterable[StatementLine],
+        items: Iterable[LedgerItem],
+        date_tolerance: timedelta,
+        min_memo_score: float = 0.5
+) -> Tuple[List[Match], List[StatementLine]]:
+    """
+    Match bank statement lines to ledger items, each item used at most once.
+
+    Three passes, each only over what the previous ones left:
+      1. hash join on the normalized reference, for equal amounts only,
+      2. sort-merge join per amount on date within `date_tolerance`,
+      3. memo token similarity among items of the same amount.
+    Amounts of lines and items must be signed alike, negative for money
+    leaving the account. Returns the matches and the statement lines left
+    unmatched.
+    """
+    lines = list(lines)
+    items = list(items)
+    used = set()
+    matches: List[Match] = []
+
+    # 1. Exact reference
+    by_reference: Dict[str, List[LedgerItem]] = defaultdict(list)
+    for item in items:
+        reference = normalize_reference(item.reference)
+        if reference:
+            by_reference[reference].append(item)
+
+    remaining = []
+    for line in lines:
+        # A shared reference with another amount, such as a partial payment, is left to review
+        item = next((
+            item for item in by_reference.get(normalize_reference(line.reference), ())
+            if (item.source, item.id) not in used and item.amount == line.amount
+        ), None)
+        if item is None:
+            remaining.append(line)
+            continue
+        used.add((item.source, item.id))
+        matches.append(Match(line.line_number, item.source, item.id, "reference", 1.0))
+    lines = remaining
+
+    # 2. Amount and date, merged per amount bucket in date order
+    line_buckets: Dict[int, List[StatementLine]] = defaultdict(list)
+    for line in lines:
+        line_buckets[cents(line.amount)].append(line)
+    item_buckets: Dict[int, List[LedgerItem]] = defaultdict(list)
+    for item in items:
+        if (item.source, item.id) not in used:
+            item_buckets[cents(item.amount)].append(item)
+
+    tolerance_days = date_tolerance.total_seconds() / 86400
+    remaining = []
+    for amount, bucket in line_buckets.items():
+        bucket.sort(key=lambda line: (line.date, line.line_number))
+        candidates = sorted(item_buckets.get(amount, ()), key=lambda item: (item.date, item.id))
+        position = 0
+        for line in bucket:
+            while position < len(candidates) and candidates[position].date < line.date - date_tolerance:
+                position += 1
+            if position < len(candidates) and candidates[position].date <= line.date + date_tolerance:
+                item = candidates[position]
+                position += 1
+                used.add((item.source, item.id))
+                days = abs((item.date - line.date).total_seconds()) / 86400
+                score = 1.0 - days / (tolerance_days + 1)
+                matches.append(Match(line.line_number, item.source, item.id, "amount_date", round(score, 4)))
+            else:
+                remaining.append(line)
+    lines = remaining
+
+    # 3. Fuzzy memo among items of the same amount
+    token_index: Dict[Tuple[int, str], List[LedgerItem]] = defaultdict(list)
+    item_tokens: Dict[Tuple[str, int], FrozenSet[str]] = {}
+    for item in items:
+        if (item.source, item.id) in used:
+            continue
+        tokens = memo_tokens(item.memo)
+        item_tokens[(item.source, item.id)] = tokens
+        for token in tokens:
+            token_index[(cents(item.amount), token)].append(item)
+
+    unmatched = []
+    for line in sorted(lines, key=lambda line: line.line_number):
+        tokens = memo_tokens(line.memo)
+        amount = cents(line.amount)
+        best, best_score = None, 0.0
+        for token in tokens:
+            postings = token_index.get((amount, token), ())
+            if len(postings) > MAX_TOKEN_FREQUENCY:
+                continue
+            for item in postings:
+                if (item.source, item.id) in used:
+                    continue
+                other = item_tokens[(item.source, item.id)]
+                score = len(tokens & other) / len(tokens | other)
+                if score > best_score:
+                    best, best_score = item, score
+        if best is not None and best_score >= min_memo_score:
+            used.add((best.source, best.id))
+            matches.append(Match(line.line_number, best.source, best.id, "memo", round(best_score, 4)))
+        else:
+            unmatched.append(line)
+
+    return matches, unmatched
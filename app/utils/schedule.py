@@ -0,0 +1,81 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+from app.models.charge import ChargeFrequency
+
+# Frequencies stepping by a fixed number of days
+DAY_STEPS = {
+    ChargeFrequency.DAILY: 1,
+    ChargeFrequency.WEEKLY: 7,
+}
+
+# Frequencies stepping by calendar months
+MONTH_STEPS = {
+    ChargeFrequency.MONTHLY: 1,
+    ChargeFrequency.QUARTERLY: 3,
+    ChargeFrequency.YEARLY: 12,
+}
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a date by whole months, clamping the day to the end of the month"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def nth_occurrence(anchor: datetime, frequency: ChargeFrequency, n: int) -> datetime:
+    """
+    Date of the n-th occurrence of a schedule, the anchor being occurrence 0.
+
+    Occurrences are always computed from the anchor, so a schedule starting on
+    the 31st falls on the 28th/29th in February and back on the 31st in March.
+    """
+    if frequency in DAY_STEPS:
+        return anchor + timedelta(days=n * DAY_STEPS[frequency])
+    if frequency in MONTH_STEPS:
+        return add_months(anchor, n * MONTH_STEPS[frequency])
+    if n == 0:
+        return anchor
+    raise ValueError(f"Frequency {frequency} has a single occurrence")
+
+
+def _first_index(anchor: datetime, frequency: ChargeFrequency, start: Optional[datetime]) -> int:
+    """Index of the first occurrence on or after start, without walking the schedule"""
+    if start is None or start <= anchor:
+        return 0
+    if frequency in DAY_STEPS:
+        step = timedelta(days=DAY_STEPS[frequency])
+        return -(-(start - anchor) // step)
+    months = (start.year - anchor.year) * 12 + start.month - anchor.month
+    n = max(0, months // MONTH_STEPS[frequency])
+    while nth_occurrence(anchor, frequency, n) < start:
+        n += 1
+    return n
+
+
+def iter_occurrences(
+        anchor: datetime,
+        frequency: ChargeFrequency,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+) -> Iterator[Tuple[int, datetime]]:
+    """
+    Lazily yield (index, due date) of a schedule's occurrences in [start, end).
+
+    Without an end the generator is unbounded; slice it with itertools.islice.
+    """
+    if frequency == ChargeFrequency.ONCE:
+        if (start is None or anchor >= start) and (end is None or anchor < end):
+            yield 0, anchor
+        return
+
+    n = _first_index(anchor, frequency, start)
+    while True:
+        occurrence = nth_occurrence(anchor, frequency, n)
+        if end is not None and occurrence >= end:
+            return
+        yield n, occurrence
+        n += 1
@@ -0,0 +1,113 @@
+"""
+Concurrency benchmark for FundCRUD.process_transaction.
+
+Fires many parallel withdrawals at a single fund, each on its own session,
+and checks that no update was lost and the minimum balance held.
+
+Usage (from the repository root, with the database settings in .env):
+
+    PYTHONPATH=.:app python benchmarks/fund_withdrawals.py --withdrawals 500
+"""
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from core.config import settings
+from core.exceptions import InsufficientFundsException
+from app.crud.fund import FundCRUD
+from app.models.building import Building
+from app.models.fund import Fund, FundTransaction, FundType, TransactionType, PaymentMethod
+from app.schemas.fund import FundTransactionCreate
+from app.utils.helpers import utc_now
+
+
+async def withdraw(session_factory, fund: Fund, amount: Decimal, semaphore: asyncio.Semaphore) -> bool:
+    async with semaphore, session_factory() as session:
+        try:
+            await FundCRUD(session).process_transaction(
+                fund.id,
+                FundTransactionCreate(
+                    fund_id=fund.id,
+                    building_id=fund.building_id,
+                    transaction_type=TransactionType.WITHDRAWAL,
+                    amount=amount,
+                    payment_method=PaymentMethod.BANK_TRANSFER,
+                    description="benchmark withdrawal"
+                )
+            )
+            return True
+        except InsufficientFundsException:
+            return False
+
+
+async def main(withdrawals: int, concurrency: int, balance: Decimal, minimum: Decimal, amount: Decimal) -> None:
+    engine = create_async_engine(
+        settings.async_database_url,
+        pool_size=concurrency,
+        max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        building = (await session.execute(select(Building).limit(1))).scalar_one()
+        now = utc_now()
+        fund = Fund(
+            name="Benchmark Fund",
+            description="Concurrent withdrawal benchmark",
+            fund_type=FundType.OPERATIONAL,
+            current_balance=balance,
+            minimum_balance=minimum,
+            building_id=building.id,
+            requires_approval=False,
+            created_at=now,
+            updated_at=now
+        )
+        session.add(fund)
+        await session.commit()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        withdraw(session_factory, fund, amount, semaphore) for _ in range(withdrawals)
+    ))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        final_balance = (await session.execute(
+            select(Fund.current_balance).where(Fund.id == fund.id)
+        )).scalar_one()
+        await session.execute(delete(FundTransaction).where(FundTransaction.fund_id == fund.id))
+        await session.execute(delete(Fund).where(Fund.id == fund.id))
+        await session.commit()
+    await engine.dispose()
+
+    succeeded = sum(results)
+    expected_balance = balance - amount * succeeded
+    expected_succeeded = min(withdrawals, int((balance - minimum) // amount))
+
+    print(f"withdrawals:     {withdrawals} ({concurrency} concurrent)")
+    print(f"succeeded:       {succeeded} (expected {expected_succeeded})")
+    print(f"rejected:        {withdrawals - succeeded}")
+    print(f"final balance:   {final_balance} (expected {expected_balance})")
+    print(f"elapsed:         {elapsed:.3f}s ({withdrawals / elapsed:.0f} tx/s)")
+
+    assert final_balance == expected_balance, "lost update detected"
+    assert final_balance >= minimum, "minimum balance violated"
+    assert succeeded == expected_succeeded, "valid withdrawals were rejected"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--withdrawals", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--balance", type=Decimal, default=Decimal("10000.00"))
+    parser.add_argument("--minimum", type=Decimal, default=Decimal("1000.00"))
+    parser.add_argument("--amount", type=Decimal, default=Decimal("25.00"))
+    args = parser.parse_args()
+
+    asyncio.run(main(args.withdrawals, args.concurrency, args.balance, args.minimum, args.amount))
@@ -0,0 +1,123 @@
+"""
+Per-row JSON encode cost of list responses, before and after FastJSONRoute.
+
+"before" is what FastAPI does for a response_model: validate every ORM row
+into the schema, dump it to JSON-able data and json.dumps the result.
+"after" is the precompiled ORMSerializer used by FastJSONRoute. Schemas it
+does not support are listed without timings. No database is needed, the
+rows are built in memory.
+
+Usage (from the repository root):
+
+    PYTHONPATH=.:app python benchmarks/json_encoding.py --rows 1000
+"""
+import argparse
+import json
+import timeit
+from datetime import date, datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core.responses import ORMSerializer
+from app.models.building import Building
+from app.models.tenant import Tenant, TenantStatus, TenantType
+from app.models.unit import Unit, UnitStatus, UnitType
+from app.schemas.building import BuildingResponse
+from app.schemas.tenant import TenantResponse
+from app.schemas.unit import UnitResponse
+
+
+def buildings(count: int) -> List[Building]:
+    now = datetime.now()
+    return [
+        Building(
+            id=i,
+            name=f"Building {i}",
+            total_floors=10 + i % 20,
+            description="Residential building with parking",
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def tenants(count: int) -> List[Tenant]:
+    now = datetime.now()
+    return [
+        Tenant(
+            id=i,
+            unit_id=i,
+            tenant_type=TenantType.INDIVIDUAL,
+            status=TenantStatus.ACTIVE,
+            name=f"Tenant {i}",
+            phone=f"+4915{i:08d}",
+            email=f"tenant{i}@example.com",
+            occupant_count=1 + i % 4,
+            lease_start_date=date(2025, 1, 1),
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def units(count: int) -> List[Unit]:
+    now = datetime.now()
+    return [
+        Unit(
+            id=i,
+            floor_id=1 + i % 10,
+            unit_number=f"{i}A",
+            owner_id=1 + i % 50,
+            type=UnitType.RESIDENTIAL,
+            status=UnitStatus.OCCUPIED,
+            area=75.5,
+            has_parking=i % 2 == 0,
+            constant_extra_charge=0.0,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def validate_and_dump(adapter: TypeAdapter, rows) -> bytes:
+    """Mirror of FastAPI's serialize_response followed by JSONResponse.render"""
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def main(rows: int, repeat: int) -> None:
+    for schema, factory in (
+            (BuildingResponse, buildings),
+            (TenantResponse, tenants),
+            (UnitResponse, units),
+    ):
+        if not ORMSerializer.supports(schema):
+            print(f"{schema.__name__}")
+            print("  has validators, encoded by FastAPI as before")
+            continue
+
+        data = factory(rows)
+        adapter = TypeAdapter(List[schema])
+        serializer = ORMSerializer(schema)
+
+        before = min(timeit.repeat(lambda: validate_and_dump(adapter, data), number=1, repeat=repeat))
+        after = min(timeit.repeat(lambda: serializer.encode(data), number=1, repeat=repeat))
+        same = json.loads(validate_and_dump(adapter, data)) == json.loads(serializer.encode(data))
+
+        print(f"{schema.__name__}")
+        print(f"  before:          {before / rows * 1e6:8.2f} us/row")
+        print(f"  after:           {after / rows * 1e6:8.2f} us/row ({before / after:.1f}x)")
+        print(f"  identical JSON:  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.rows, args.repeat)
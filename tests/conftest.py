@@ -0,0 +1,80 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import psycopg2
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The application imports both app.* and the modules under app/ (core, db, crud, models)
+for path in (os.path.join(ROOT, "app"), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Settings without defaults; nothing connects to the database at import
+for name, value in {
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_DB": "building_management",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    """
+    URL of a freshly migrated test database next to the configured one.
+
+    Tests using it are skipped when Postgres is not reachable.
+    """
+    name = f"{os.environ['POSTGRES_DB']}_test"
+    try:
+        admin = psycopg2.connect(
+            host=os.environ["POSTGRES_SERVER"],
+            user=os.environ["POSTGRES_USER"],
+            password=os.environ["POSTGRES_PASSWORD"],
+            dbname="postgres",
+            connect_timeout=3,
+        )
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+        cursor.execute(f'CREATE DATABASE "{name}"')
+
+    environment = {**os.environ, "POSTGRES_DB": name, "PYTHONPATH": os.pathsep.join((ROOT, os.path.join(ROOT, "app")))}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT, env=environment, check=True, capture_output=True
+    )
+    yield (
+        f"postgresql+asyncpg://{os.environ['POSTGRES_USER']}:{os.environ['POSTGRES_PASSWORD']}"
+        f"@{os.environ['POSTGRES_SERVER']}/{name}"
+    )
+
+    with admin.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+    admin.close()
+
+
+@pytest.fixture
+def run_db(database_url):
+    """Run `test(session)` to completion on its own event loop and connection"""
+    def run(test):
+        async def main():
+            engine = create_async_engine(database_url, poolclass=NullPool)
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as session:
+                    return await test(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import PriorityGate, Priority, Rejected, route_group
+
+
+@pytest.mark.parametrize("path, group", [
+    ("/api/v1/charges/pay-account", "payments"),
+    ("/api/v1/charges/3/schedule", "charges"),
+    ("/api/v1/reports/debtors", "reports"),
+    ("/api/v1/funds/forecast", "reports"),
+    ("/api/v1/owners/export", "exports"),
+    ("/dashboard", "dashboards"),
+    ("/buildings", "dashboards"),
+    ("/floors/2", "dashboards"),
+    ("/owners/3", "dashboards"),
+    ("/tenants", "dashboards"),
+    ("/units/4", "dashboards"),
+    ("/api/v1/buildings/1", "default"),
+    ("/api/v1/units", "default"),
+    ("/buildings-report", "default"),
+])
+def test_route_group(path, group):
+    assert route_group(path).name == group
+
+
+@pytest.mark.parametrize("path", ["/health", "/static/app.js", "/docs", "/api/v1/batch", "/api/v1/batch/"])
+def test_route_group_exempt(path):
+    assert route_group(path) is None
+
+
+def test_gate_caps_low_priority_at_its_share():
+    async def run():
+        gate = PriorityGate(4)
+        assert gate.limit(Priority.LOW) == 2
+        await gate.acquire(Priority.LOW, 1)
+        await gate.acquire(Priority.LOW, 1)
+        with pytest.raises(Rejected):
+            await gate.acquire(Priority.LOW, 0.01)
+        # The slots kept free still admit payments
+        await gate.acquire(Priority.CRITICAL, 0.01)
+        assert gate.in_use == 3
+
+    asyncio.run(run())
+
+
+def test_gate_grants_highest_priority_first():
+    async def run():
+        gate = PriorityGate(1)
+        await gate.acquire(Priority.NORMAL, 1)
+        granted = []
+
+        async def wait(priority):
+            await gate.acquire(priority, 1)
+            granted.append(priority)
+            gate.release()
+
+        waiters = [asyncio.create_task(wait(Priority.LOW)), asyncio.create_task(wait(Priority.CRITICAL))]
+        await asyncio.sleep(0)
+        gate.release()
+        await asyncio.gather(*waiters)
+        assert granted == [Priority.CRITICAL, Priority.LOW]
+        assert gate.in_use == 0
+
+    asyncio.run(run())
@@ -0,0 +1,21 @@
+import sys
+
+
+def test_app_imports_and_builds_openapi():
+    from app.main import app
+
+    paths = app.openapi()["paths"]
+    assert any(path.startswith("/api/v1/funds") for path in paths)
+    assert any(path.startswith("/api/v1/transactions") for path in paths)
+
+
+def test_app_uses_one_engine():
+    # db.session is a second module with its own engine, which the server would not dispose
+    import app.main  # noqa: F401
+
+    assert "app.db.session" in sys.modules
+    assert "db.session" not in sys.modules
+    # Nor may settings and exception classes load twice under bare module names
+    assert "core.config" not in sys.modules
+    assert "core.exceptions" not in sys.modules
+    assert "crud" not in sys.modules
@@ -0,0 +1,10 @@
+from app.core.compression import parse_accept_encoding
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br") == {"gzip", "deflate", "br"}
+
+
+def test_parse_accept_encoding_skips_refused_codings():
+    assert parse_accept_encoding("BR;q=0, gzip; q=0.8, identity;q=0.000") == {"gzip"}
+
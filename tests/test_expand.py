@@ -0,0 +1,30 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models import Building, Owner, Unit
+from app.utils.expand import MAX_EXPAND_PATHS, expanded_models, parse_expand
+
+
+def test_parse_expand_merges_paths():
+    tree = parse_expand(Building, "floors.units.tenant, floors.units.owner")
+    assert tree == {"floors": {"units": {"tenant": {}, "owner": {}}}}
+
+
+def test_parse_expand_empty():
+    assert parse_expand(Building, None) == {}
+    assert parse_expand(Building, "") == {}
+
+
+@pytest.mark.parametrize("expand", [
+    "tenants",  # not a relationship of buildings
+    "floors.units.owner.units",  # deeper than allowed
+    ",".join(["floors"] * (MAX_EXPAND_PATHS + 1)),
+])
+def test_parse_expand_rejects(expand):
+    with pytest.raises(HTTPException) as error:
+        parse_expand(Building, expand)
+    assert error.value.status_code == 422
+
+
+def test_expanded_models():
+    assert expanded_models(Unit, parse_expand(Unit, "owner.units")) == {Owner, Unit}
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from app.utils.forecast import (
+    group_shares,
+    month_index,
+    month_start,
+    monthly_totals,
+    occurrence_counts,
+    project_balances,
+    to_days,
+)
+
+
+def test_month_index_round_trips():
+    assert month_index(date(2024, 12, 31)) + 1 == month_index(date(2025, 1, 1))
+    assert month_start(month_index(date(2024, 2, 29))) == date(2024, 2, 1)
+
+
+def test_occurrence_counts_by_month_and_by_day():
+    counts = occurrence_counts(
+        anchor=to_days([date(2023, 11, 15), date(2024, 1, 31), datetime(2024, 1, 1, 8), date(2024, 3, 1)]),
+        step_months=np.array([3, 1, 0, 0]),
+        step_days=np.array([0, 0, 7, 0]),
+        first_month=month_index(date(2024, 1, 1)),
+        horizon=4
+    )
+    assert counts.tolist() == [
+        [0, 1, 0, 0],  # Quarterly from November
+        [1, 1, 1, 1],  # Monthly from January
+        [5, 4, 4, 5],  # Weekly from the 1st of January
+        [0, 0, 0, 0],  # Neither, a one-off
+    ]
+
+
+def test_monthly_totals_and_group_shares():
+    counts = np.array([[1, 0], [1, 1], [0, 2]])
+    totals = monthly_totals(np.array([0, 0, 1]), np.array([10.0, 5.0, 2.5]), counts, 2)
+    assert totals.tolist() == [[15.0, 5.0], [0.0, 5.0]]
+
+    shares = group_shares(np.array([1.0, 3.0, 0.0, 0.0]), np.array([0, 0, 1, 1]), 2)
+    assert shares.tolist() == [0.25, 0.75, 0.5, 0.5]
+
+
+def test_project_balances_finds_the_first_shortfall_and_target():
+    projection = project_balances(
+        current=np.array([100.0, 100.0]),
+        minimum=np.array([50.0, 0.0]),
+        target=np.array([np.nan, 130.0]),
+        inflow=np.array([[0.0, 0.0, 0.0], [10.0, 10.0, 10.0]]),
+        outflow=np.array([[20.0, 20.0, 20.0], [0.0, 0.0, 0.0]])
+    )
+    assert projection.balances.tolist() == [[80.0, 60.0, 40.0], [110.0, 120.0, 130.0]]
+    assert projection.first_shortfall.tolist() == [2, -1]
+    assert projection.first_target.tolist() == [-1, 2]
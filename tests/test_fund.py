@@ -0,0 +1,310 @@
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.fund import FundCRUD, needs_approval
+from app.models.building import Building
+from app.models.fund import (
+    Fund, FundBalance, FundInterestAccrual, FundTransaction, FundType, PaymentMethod, TransactionStatus, TransactionType
+)
+from app.schemas.fund import FundApprovalRequest, FundSweepRequest, FundTransactionCreate, FundTransferCreate
+from app.utils.helpers import utc_today
+
+
+async def add_funds(session, *specs):
+    """A building with one fund per spec, each a dict of Fund fields"""
+    building = Building(name="Test building", total_floors=1)
+    session.add(building)
+    await session.flush()
+    funds = [
+        Fund(name=f"Fund {i}", description="Test fund", building_id=building.id, **spec)
+        for i, spec in enumerate(specs)
+    ]
+    session.add_all(funds)
+    await session.commit()
+    return funds
+
+
+async def balances(session, *fund_ids):
+    result = await session.execute(select(Fund.id, Fund.current_balance).where(Fund.id.in_(fund_ids)))
+    return dict(result.all())
+
+
+
+@pytest.mark.parametrize("requires_approval, threshold, transaction_type, amount, expected", [
+    (False, None, TransactionType.WITHDRAWAL, "500", False),
+    (True, None, TransactionType.WITHDRAWAL, "1", True),
+    (True, "100", TransactionType.WITHDRAWAL, "100", False),
+    (True, "100", TransactionType.FEE, "100.01", True),
+    (True, "100", TransactionType.CONTRIBUTION, "500", False),
+])
+def test_needs_approval(requires_approval, threshold, transaction_type, amount, expected):
+    fund = Fund(
+        name="Fund", description="Test fund", building_id=1, requires_approval=requires_approval,
+        approval_threshold=Decimal(threshold) if threshold else None
+    )
+    assert needs_approval(fund, transaction_type, Decimal(amount)) is expected
+
+
+def test_parked_withdrawals_apply_on_approval_only(run_db):
+    async def test(session):
+        fund, = await add_funds(
+            session,
+            {"current_balance": Decimal("1000"), "requires_approval": True, "approval_threshold": Decimal("100")},
+        )
+        fund_id, building_id = fund.id, fund.building_id
+        crud = FundCRUD(session)
+
+        def withdrawal(amount):
+            return FundTransactionCreate(
+                fund_id=fund_id, building_id=building_id,
+                transaction_type=TransactionType.WITHDRAWAL, payment_method=PaymentMethod.BANK_TRANSFER,
+                amount=Decimal(amount)
+            )
+
+        approved = await crud.process_transaction(fund_id, withdrawal("300"))
+        rejected = await crud.process_transaction(fund_id, withdrawal("200"))
+        approved_id, rejected_id = approved.id, rejected.id
+        assert (approved.status, rejected.status) == (TransactionStatus.PENDING, TransactionStatus.PENDING)
+        assert await balances(session, fund_id) == {fund_id: Decimal("1000")}
+
+        result = await crud.approve_transactions(FundApprovalRequest(transaction_ids=[approved_id], approver="manager"))
+        assert (result.processed, result.skipped) == ([approved_id], [])
+        result = await crud.reject_transactions(
+            FundApprovalRequest(transaction_ids=[rejected_id, approved_id], approver="manager")
+        )
+        assert result.processed == [rejected_id]
+        assert [(s.transaction_id, s.code) for s in result.skipped] == [(approved_id, "NOT_PENDING")]
+
+        statuses = await session.execute(
+            select(FundTransaction.id, FundTransaction.status, FundTransaction.balance_after)
+            .where(FundTransaction.fund_id == fund_id)
+        )
+        assert set(statuses.all()) == {
+            (approved_id, TransactionStatus.COMPLETED, Decimal("700")),
+            (rejected_id, TransactionStatus.CANCELLED, Decimal("1000")),
+        }
+        assert await balances(session, fund_id) == {fund_id: Decimal("700")}
+
+    run_db(test)
+
+def test_transfer_over_approval_threshold_is_refused(run_db):
+    async def test(session):
+        source, target = await add_funds(
+            session,
+            {"current_balance": Decimal("1000"), "requires_approval": True, "approval_threshold": Decimal("100")},
+            {"requires_approval": False},
+        )
+        source_id, target_id = source.id, target.id
+        with pytest.raises(HTTPException) as error:
+            await FundCRUD(session).transfer(FundTransferCreate(
+                from_fund_id=source_id, to_fund_id=target_id, amount=Decimal("150")
+            ))
+        assert error.value.detail["code"] == "APPROVAL_REQUIRED"
+        assert await balances(session, source_id, target_id) == {source_id: Decimal("1000"), target_id: Decimal("0")}
+
+    run_db(test)
+
+
+def test_transfer_within_approval_threshold_writes_both_legs(run_db):
+    async def test(session):
+        source, target = await add_funds(
+            session,
+            {"current_balance": Decimal("1000"), "requires_approval": True, "approval_threshold": Decimal("100")},
+            {"requires_approval": False},
+        )
+        result = await FundCRUD(session).transfer(FundTransferCreate(
+            from_fund_id=source.id, to_fund_id=target.id, amount=Decimal("60")
+        ))
+        assert (result.from_balance_after, result.to_balance_after) == (Decimal("940"), Decimal("60"))
+        assert await balances(session, source.id, target.id) == {source.id: Decimal("940"), target.id: Decimal("60")}
+
+        rows = await session.execute(
+            select(FundTransaction.fund_id, FundTransaction.transaction_type, FundTransaction.reference_number)
+            .where(FundTransaction.reference_number == result.reference_number)
+            .order_by(FundTransaction.fund_id)
+        )
+        assert rows.all() == [
+            (source.id, TransactionType.TRANSFER_OUT, result.reference_number),
+            (target.id, TransactionType.TRANSFER_IN, result.reference_number),
+        ]
+
+    run_db(test)
+
+
+
+def test_transfer_batch_applies_transfers_in_order(run_db):
+    async def test(session):
+        first, second = await add_funds(
+            session,
+            {"current_balance": Decimal("100"), "requires_approval": False},
+            {"requires_approval": False},
+        )
+        result = await FundCRUD(session).transfer_batch([
+            FundTransferCreate(from_fund_id=first.id, to_fund_id=second.id, amount=Decimal("100")),
+            FundTransferCreate(from_fund_id=second.id, to_fund_id=first.id, amount=Decimal("40")),
+        ])
+        assert result.total_amount == Decimal("140")
+        assert [(t.from_balance_after, t.to_balance_after) for t in result.transfers] == [
+            (Decimal("0"), Decimal("100")),
+            (Decimal("60"), Decimal("40")),
+        ]
+        assert await balances(session, first.id, second.id) == {first.id: Decimal("40"), second.id: Decimal("60")}
+
+    run_db(test)
+
+
+def test_transfer_batch_is_all_or_nothing(run_db):
+    async def test(session):
+        first, second = await add_funds(
+            session,
+            {"current_balance": Decimal("100"), "requires_approval": False},
+            {"requires_approval": False},
+        )
+        first_id, second_id = first.id, second.id
+        with pytest.raises(HTTPException) as error:
+            await FundCRUD(session).transfer_batch([
+                FundTransferCreate(from_fund_id=first_id, to_fund_id=second_id, amount=Decimal("60")),
+                FundTransferCreate(from_fund_id=first_id, to_fund_id=second_id, amount=Decimal("60")),
+            ])
+        assert error.value.detail["code"] == "INSUFFICIENT_FUNDS"
+        assert await balances(session, first_id, second_id) == {first_id: Decimal("100"), second_id: Decimal("0")}
+
+        with pytest.raises(HTTPException) as error:
+            await FundCRUD(session).transfer(FundTransferCreate(
+                from_fund_id=first_id, to_fund_id=second_id + 1000, amount=Decimal("10")
+            ))
+        assert error.value.status_code == 404
+        assert await balances(session, first_id) == {first_id: Decimal("100")}
+
+    run_db(test)
+
+
+def test_opposite_transfers_do_not_deadlock(run_db):
+    async def test(session):
+        first, second = await add_funds(
+            session,
+            {"current_balance": Decimal("1000"), "requires_approval": False},
+            {"current_balance": Decimal("1000"), "requires_approval": False},
+        )
+        first_id, second_id = first.id, second.id
+
+        async def shuttle(from_fund_id, to_fund_id):
+            # Its own connection, so the two directions contend for the row locks
+            async with AsyncSession(session.bind, expire_on_commit=False) as own:
+                for _ in range(10):
+                    await FundCRUD(own).transfer_batch([
+                        FundTransferCreate(from_fund_id=from_fund_id, to_fund_id=to_fund_id, amount=Decimal("1")),
+                        FundTransferCreate(from_fund_id=to_fund_id, to_fund_id=from_fund_id, amount=Decimal("2")),
+                    ])
+
+        await asyncio.gather(shuttle(first_id, second_id), shuttle(second_id, first_id))
+        assert await balances(session, first_id, second_id) == {
+            first_id: Decimal("1000"), second_id: Decimal("1000")
+        }
+
+    run_db(test)
+
+def test_sweep_of_a_fund_needing_approval_is_refused(run_db):
+    async def test(session):
+        source, target = await add_funds(
+            session,
+            {"current_balance": Decimal("500"), "fund_type": FundType.OPERATIONAL, "requires_approval": True},
+            {"fund_type": FundType.RESERVE, "requires_approval": False},
+        )
+        source_id, target_id, building_id = source.id, target.id, source.building_id
+        with pytest.raises(HTTPException) as error:
+            await FundCRUD(session).sweep(FundSweepRequest(to_fund_id=target_id, building_id=building_id))
+        assert error.value.detail["code"] == "APPROVAL_REQUIRED"
+        assert await balances(session, source_id, target_id) == {source_id: Decimal("500"), target_id: Decimal("0")}
+
+    run_db(test)
+
+
+def test_interest_is_accrued_once_per_period(run_db):
+    async def test(session):
+        fund, = await add_funds(session, {"current_balance": Decimal("1000"), "interest_rate": Decimal("3.65")})
+        fund_id = fund.id
+        crud = FundCRUD(session)
+        result = await crud.accrue_interest(date(2021, 1, 1), date(2021, 1, 31))
+        assert result.funds_accrued >= 1
+        assert await balances(session, fund_id) == {fund_id: Decimal("1003.10")}
+
+        again = await crud.accrue_interest(date(2021, 1, 1), date(2021, 1, 31))
+        assert (again.funds_accrued, again.total_interest) == (0, Decimal("0.00"))
+        assert await balances(session, fund_id) == {fund_id: Decimal("1003.10")}
+
+        periods = await session.execute(
+            select(FundInterestAccrual.period_start, FundInterestAccrual.period_end)
+            .where(FundInterestAccrual.fund_id == fund_id)
+        )
+        assert periods.all() == [(date(2021, 1, 1), date(2021, 1, 31))]
+
+    run_db(test)
+
+
+def test_interest_over_an_accrued_period_is_refused(run_db):
+    async def test(session):
+        fund, = await add_funds(session, {"current_balance": Decimal("1000"), "interest_rate": Decimal("5")})
+        fund_id = fund.id
+        crud = FundCRUD(session)
+        await crud.accrue_interest(date(2021, 3, 1), date(2021, 3, 31))
+        accrued = await balances(session, fund_id)
+
+        with pytest.raises(HTTPException) as error:
+            await crud.accrue_interest(date(2021, 3, 15), date(2021, 4, 14))
+        assert error.value.status_code == 422
+        assert str(fund_id) in error.value.detail["metadata"]["overlapping_periods"]
+        assert await balances(session, fund_id) == accrued
+
+    run_db(test)
+
+
+def test_interest_for_an_open_month_is_refused(run_db):
+    async def test(session):
+        with pytest.raises(HTTPException) as error:
+            await FundCRUD(session).accrue_interest(utc_today().replace(day=1), utc_today())
+        assert error.value.status_code == 422
+
+    run_db(test)
+
+
+def test_snapshots_cover_closed_months_until_a_late_transaction(run_db):
+    async def test(session):
+        fund, = await add_funds(session, {"current_balance": Decimal("1000")})
+        fund_id, building_id = fund.id, fund.building_id
+        crud = FundCRUD(session)
+
+        def contribution(amount, when):
+            return FundTransactionCreate(
+                fund_id=fund_id, building_id=building_id, transaction_type=TransactionType.CONTRIBUTION,
+                payment_method=PaymentMethod.BANK_TRANSFER, amount=Decimal(amount), transaction_date=when
+            )
+
+        async def snapshot():
+            result = await session.execute(select(FundBalance.balance).where(
+                FundBalance.fund_id == fund_id, FundBalance.period_end == date(2024, 1, 31)
+            ))
+            return result.scalar_one_or_none()
+
+        with pytest.raises(HTTPException) as error:
+            await crud.snapshot_balances(utc_today())
+        assert error.value.status_code == 422
+
+        await crud.process_transaction(fund_id, contribution("200", datetime(2024, 2, 10)))
+        period_end, stored = await crud.snapshot_balances(date(2024, 1, 31))
+        assert period_end == date(2024, 1, 31) and stored >= 1
+        assert await snapshot() == Decimal("1000")
+        assert await crud.get_balance_at(fund_id, datetime(2024, 3, 1)) == Decimal("1200")
+
+        # A transaction dated inside the snapshotted month makes it stale
+        await crud.process_transaction(fund_id, contribution("50", datetime(2024, 1, 20)))
+        assert await snapshot() is None
+        assert await crud.get_balance_at(fund_id, datetime(2024, 2, 1)) == Decimal("1050")
+
+    run_db(test)
@@ -0,0 +1,115 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.crud.ledger import LedgerCRUD, decode_cursor, encode_cursor
+from app.crud.unit import CRUDUnit
+from app.models.building import Building
+from app.models.charge import Charge, Payment
+from app.models.floor import Floor
+from app.models.ledger import AccountBalance, LedgerAccountType
+from app.models.owner import Owner
+from app.models.unit import Unit
+
+
+def test_cursor_round_trips_the_running_balance():
+    cursor = (datetime(2024, 3, 1, 9, 30), "payment", 42, Decimal("-125.50"))
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+def test_malformed_cursor_is_refused():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not a cursor")
+    assert error.value.status_code == 422
+
+
+async def add_unit(session, name):
+    """A unit in a building of its own, with its first owner"""
+    building = Building(name=f"{name} building", total_floors=1)
+    owner = Owner(name=f"{name} owner", phone="555-0100")
+    session.add_all([building, owner])
+    await session.flush()
+    floor = Floor(building_id=building.id, number=1, name="First", total_units=1)
+    session.add(floor)
+    await session.flush()
+    unit = Unit(floor_id=floor.id, unit_number="101", owner_id=owner.id, area=80)
+    session.add(unit)
+    await session.flush()
+    return unit, floor.building_id
+
+
+def test_statement_pages_carry_the_running_balance(run_db):
+    async def test(session):
+        unit, building_id = await add_unit(session, "Statement")
+        unit_id = unit.id
+        charges = [
+            Charge(
+                title=f"Charge {amount}", description="Test charge", amount=amount, due_date=due_date,
+                unit_id=unit_id, building_id=building_id, generated_by="test"
+            )
+            for amount, due_date in [(100, datetime(2024, 1, 5)), (50, datetime(2024, 1, 20)), (30, datetime(2024, 2, 3))]
+        ]
+        session.add_all(charges)
+        await session.flush()
+        session.add(Payment(
+            charge_id=charges[0].id, amount=80, payment_date=datetime(2024, 1, 25),
+            payment_method="cash", transaction_id="PAY-1"
+        ))
+        await session.commit()
+        crud = LedgerCRUD(session)
+
+        first = await crud.get_statement(LedgerAccountType.UNIT, unit_id, limit=2)
+        second = await crud.get_statement(LedgerAccountType.UNIT, unit_id, cursor=first.next_cursor, limit=2)
+        assert [entry.balance for entry in first.entries] == [Decimal("100"), Decimal("150")]
+        assert [entry.balance for entry in second.entries] == [Decimal("70"), Decimal("100")]
+        assert second.next_cursor is None
+
+        february = await crud.get_statement(LedgerAccountType.UNIT, unit_id, start_date=date(2024, 2, 1))
+        assert february.opening_balance == Decimal("70")
+        assert [entry.balance for entry in february.entries] == [Decimal("100")]
+
+        cached = await session.execute(select(AccountBalance.balance).where(
+            AccountBalance.account_type == LedgerAccountType.UNIT,
+            AccountBalance.account_id == unit_id,
+            AccountBalance.period_end == date(2024, 1, 31)
+        ))
+        assert cached.scalar_one() == Decimal("70")
+
+    run_db(test)
+
+
+def test_owner_change_drops_both_owners_cached_balances(run_db):
+    async def test(session):
+        unit, _ = await add_unit(session, "Ownership")
+        new, bystander = Owner(name="New owner", phone="555-0101"), Owner(name="Bystander", phone="555-0102")
+        session.add_all([new, bystander])
+        await session.flush()
+        accounts = {
+            (LedgerAccountType.OWNER, unit.owner_id),
+            (LedgerAccountType.OWNER, new.id),
+            (LedgerAccountType.OWNER, bystander.id),
+            (LedgerAccountType.UNIT, unit.id),
+        }
+        session.add_all([
+            AccountBalance(
+                account_type=account_type, account_id=account_id,
+                period_end=date(2023, 12, 31), balance=Decimal("100")
+            )
+            for account_type, account_id in accounts
+        ])
+        await session.commit()
+
+        await CRUDUnit(Unit).update(session, db_obj=unit, obj_in={"owner_id": new.id})
+
+        cached = await session.execute(select(AccountBalance.account_type, AccountBalance.account_id).where(
+            AccountBalance.period_end == date(2023, 12, 31)
+        ))
+        assert set(cached.all()) & accounts == {
+            (LedgerAccountType.OWNER, bystander.id),
+            (LedgerAccountType.UNIT, unit.id),
+        }
+
+    run_db(test)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from app.crud.building import CRUDBuilding
+from app.models.building import Building
+from app.utils.helpers import utc_now
+from app.utils.numbering import format_number, next_numbers, validate_number_format
+
+
+def test_format_number_fills_every_placeholder():
+    number_format = "{prefix}/{building_id}/{year}-{month:02d}/{number:06d}"
+    assert format_number(number_format, 42, "FTX", 7, datetime(2024, 3, 5)) == "FTX/7/2024-03/000042"
+
+
+def test_format_number_defaults_to_the_utc_year():
+    assert format_number("{year}-{number}", 1, "TXN") == f"{utc_now().year}-1"
+
+
+@pytest.mark.parametrize("number_format", ["{prefix}-{year}", "{prefix}-{number}-{day}", "{number:q}", "{number"])
+def test_invalid_number_formats_are_refused(number_format):
+    with pytest.raises(ValueError):
+        validate_number_format(number_format)
+
+
+def test_valid_number_format_is_returned():
+    assert validate_number_format("{prefix}{number:08d}") == "{prefix}{number:08d}"
+
+
+def test_changed_number_format_applies_to_the_next_number(run_db):
+    async def test(session):
+        building = Building(name="Numbered building", total_floors=1, transaction_number_format="A-{number}")
+        session.add(building)
+        await session.commit()
+        building_id = building.id
+
+        first, = await next_numbers(session, building_id)
+        assert first.startswith("A-")
+
+        await CRUDBuilding(Building).update(session, db_obj=building, obj_in={"transaction_number_format": "B-{number}"})
+        second, = await next_numbers(session, building_id)
+        assert second.startswith("B-")
+        assert int(second[2:]) > int(first[2:])
+
+    run_db(test)
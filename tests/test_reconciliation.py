@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.utils.reconciliation import LedgerItem, StatementLine, match_statement
+
+DAY = datetime(2025, 3, 10)
+
+
+def line(number, amount, reference=None, memo=None, date=DAY):
+    return StatementLine(number, date, Decimal(amount), reference, memo)
+
+
+def item(id, amount, reference=None, memo=None, date=DAY):
+    return LedgerItem("payment", id, date, Decimal(amount), reference, memo)
+
+
+def match(lines, items):
+    return match_statement(lines, items, date_tolerance=timedelta(days=3))
+
+
+def test_reference_match_ignores_formatting():
+    matches, unmatched = match([line(1, "100.00", reference="inv-0042")], [item(7, "100.00", reference="INV 0042")])
+    assert [(m.item_id, m.match_type, m.score) for m in matches] == [(7, "reference", 1.0)]
+    assert unmatched == []
+
+
+def test_reference_with_another_amount_is_not_a_reference_match():
+    matches, unmatched = match(
+        [line(1, "40.00", reference="INV-1", date=DAY + timedelta(days=30))],
+        [item(7, "100.00", reference="INV-1")]
+    )
+    assert matches == []
+    assert [l.line_number for l in unmatched] == [1]
+
+
+def test_amount_and_date_within_tolerance():
+    matches, _ = match([line(1, "55.00", date=DAY + timedelta(days=1))], [item(3, "55.00"), item(4, "55.00", date=DAY + timedelta(days=10))])
+    assert [(m.item_id, m.match_type) for m in matches] == [(3, "amount_date")]
+    assert matches[0].score < 1.0
+
+
+def test_signs_must_agree():
+    matches, unmatched = match([line(1, "-20.00")], [item(3, "20.00")])
+    assert matches == []
+    assert len(unmatched) == 1
+
+
+def test_memo_similarity_matches_remaining_lines():
+    matches, _ = match(
+        [line(1, "80.00", memo="Water bill March unit 12", date=DAY + timedelta(days=20))],
+        [item(5, "80.00", memo="water bill march unit 12")]
+    )
+    assert [(m.item_id, m.match_type) for m in matches] == [(5, "memo")]
+
+
+def test_each_item_is_used_once():
+    matches, unmatched = match([line(1, "10.00"), line(2, "10.00")], [item(1, "10.00")])
+    assert len(matches) == 1
+    assert len(unmatched) == 1
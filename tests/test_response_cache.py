@@ -0,0 +1,22 @@
+from app.core.response_cache import request_tags
+
+
+def test_list_depends_on_its_table():
+    assert request_tags("/api/v1/units", "") == ("units",)
+    assert request_tags("/api/v1/units/deleted", "") == ("units",)
+
+
+def test_row_depends_on_itself_and_expanded_tables():
+    assert request_tags("/api/v1/units/5", "expand=owner") == ("owners", "units:5")
+
+
+def test_expanded_building_depends_on_its_building_tag():
+    assert request_tags("/api/v1/buildings/2", "expand=floors.units.owner") == ("building:2", "buildings:2", "owners")
+
+
+def test_uncached_requests():
+    assert request_tags("/api/v1/charges", "") is None
+    assert request_tags("/api/v1/units/5/charges", "") is None
+    assert request_tags("/api/v1/units/export", "") is None
+    assert request_tags("/api/v1/units", "expand=nothing") is None
+    assert request_tags("/static/app.js", "") is None
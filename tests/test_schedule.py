@@ -0,0 +1,29 @@
+from datetime import datetime
+from itertools import islice
+
+from app.models.charge import ChargeFrequency
+from app.utils.schedule import iter_occurrences
+
+
+def test_monthly_clamps_to_month_end_and_returns():
+    anchor = datetime(2025, 1, 31)
+    dates = [due for _, due in islice(iter_occurrences(anchor, ChargeFrequency.MONTHLY), 4)]
+    assert dates == [datetime(2025, 1, 31), datetime(2025, 2, 28), datetime(2025, 3, 31), datetime(2025, 4, 30)]
+
+
+def test_start_skips_to_first_occurrence_on_or_after_it():
+    anchor = datetime(2025, 1, 1)
+    occurrences = list(iter_occurrences(anchor, ChargeFrequency.WEEKLY, datetime(2025, 1, 9), datetime(2025, 1, 30)))
+    assert occurrences == [(2, datetime(2025, 1, 15)), (3, datetime(2025, 1, 22)), (4, datetime(2025, 1, 29))]
+
+
+def test_end_is_exclusive():
+    anchor = datetime(2025, 1, 1)
+    occurrences = list(iter_occurrences(anchor, ChargeFrequency.QUARTERLY, end=datetime(2025, 7, 1)))
+    assert occurrences == [(0, datetime(2025, 1, 1)), (1, datetime(2025, 4, 1))]
+
+
+def test_once_yields_the_anchor_inside_the_window_only():
+    anchor = datetime(2025, 5, 1)
+    assert list(iter_occurrences(anchor, ChargeFrequency.ONCE)) == [(0, anchor)]
+    assert list(iter_occurrences(anchor, ChargeFrequency.ONCE, start=datetime(2025, 6, 1))) == []